@@ -0,0 +1,42 @@
+"""
+Migration script to add prescriptions.updated_by
+Run this script once on databases created before the column existed;
+Base.metadata.create_all does not alter existing tables
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+def add_prescription_updated_by():
+    """Add the updated_by audit column to prescriptions"""
+    engine = create_engine(settings.DATABASE_URL)
+
+    print("Adding prescriptions.updated_by...")
+    with engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE prescriptions
+            ADD COLUMN IF NOT EXISTS updated_by UUID;
+        """))
+
+        conn.execute(text("""
+            COMMENT ON COLUMN prescriptions.updated_by
+            IS 'User who last updated this prescription';
+        """))
+
+        conn.commit()
+
+    print("✅ prescriptions.updated_by added successfully!")
+
+if __name__ == "__main__":
+    try:
+        add_prescription_updated_by()
+    except Exception as e:
+        print(f"❌ Error adding prescriptions.updated_by: {e}")
+        sys.exit(1)
@@ -2,12 +2,16 @@
 Authentication and Authorization Dependencies
 """
 
-from typing import Generator, Optional
+from typing import Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+# Re-exported so auth dependencies and endpoints resolve the same cached
+# dependency: one session (one pool checkout) per request
+from app.core.database import get_db, cache_manager, CacheKeys
+from app.models.doctor import Doctor
 from app.models.user import User
 from app.services.auth_service import AuthService
 
@@ -15,14 +19,9 @@ from app.services.auth_service import AuthService
 # Security scheme
 security = HTTPBearer()
 
-
-def get_db() -> Generator:
-    """Database session dependency"""
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+# Only active doctors are cached. DoctorService drops the key on update and
+# deactivation, and the short TTL bounds staleness from writes made elsewhere
+DOCTOR_ID_CACHE_TTL = 300
 
 
 def get_current_user(
@@ -48,7 +47,10 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+# The checks below only inspect the resolved user, so they are async: FastAPI
+# awaits them inline instead of dispatching each one to the threadpool.
+# get_current_user stays sync because it queries the database.
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -60,7 +62,7 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
 
 def require_permission(permission: str):
     """Dependency factory to require specific permission"""
-    def permission_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def permission_checker(current_user: User = Depends(get_current_active_user)) -> User:
         auth_service = AuthService()
         
         if not auth_service.check_permission(current_user.role, permission):
@@ -76,8 +78,10 @@ def require_permission(permission: str):
 
 def require_role(allowed_roles: list):
     """Dependency factory to require specific role(s)"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
-        if current_user.role not in allowed_roles:
+    allowed = frozenset(allowed_roles)
+    
+    async def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Role required: one of {allowed_roles}"
@@ -150,11 +154,36 @@ def get_current_user_optional(
 
 
 # Doctor-specific dependencies
-def get_current_doctor(current_user: User = Depends(require_doctor)) -> User:
+async def get_current_doctor(current_user: User = Depends(require_doctor)) -> User:
     """Get current user ensuring they are a doctor"""
     return current_user
 
 
+def get_current_doctor_id(
+    current_user: User = Depends(require_staff),
+    db: Session = Depends(get_db)
+) -> Optional[UUID]:
+    """
+    Get the ID of the doctor profile linked to the current user (None for non-doctor roles)
+    Resolved once per request, and served from cache across requests
+    """
+    if current_user.role != 'doctor':
+        return None
+    
+    cache_key = CacheKeys.DOCTOR_ID_BY_USER.format(user_id=current_user.id)
+    cached = cache_manager.get(cache_key)
+    if cached:
+        return UUID(cached)
+    
+    doctor_id = db.query(Doctor.id).filter(
+        Doctor.user_id == current_user.id,
+        Doctor.is_active == True
+    ).scalar()
+    if doctor_id:
+        cache_manager.set(cache_key, str(doctor_id), ttl=DOCTOR_ID_CACHE_TTL)
+    return doctor_id
+
+
 def require_doctor_or_admin():
     """Require doctor role or admin access"""
     return require_role(["super_admin", "admin", "doctor"])
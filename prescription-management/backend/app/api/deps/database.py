@@ -1,21 +1,12 @@
 """
 Database dependency for FastAPI endpoints
 Provides database session management
-"""
-
-from typing import Generator
-from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+Re-exports app.core.database.get_db so every endpoint and the auth
+dependencies share one cached session per request, and a single
+dependency override replaces it everywhere.
+"""
 
+from app.core.database import get_db
 
-def get_db() -> Generator[Session, None, None]:
-    """
-    Database dependency that provides a database session.
-    Automatically handles session cleanup on request completion.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+__all__ = ["get_db"]
@@ -2,6 +2,9 @@
 Dental API Endpoints
 Comprehensive REST API for dental observations and procedures
 Supports FDI notation system, tooth charting, and procedure management
+
+Service InvalidInputErrors propagate to the domain exception handler in
+app.main (400 Bad Request) instead of being re-raised per endpoint.
 """
 
 import logging
@@ -23,7 +26,7 @@ from app.schemas.dental import (
     DentalStatistics
 )
 from app.services.dental_service import get_dental_service
-from app.core.exceptions import ValidationError, BusinessRuleError
+from app.core.exceptions import BusinessRuleError
 
 logger = logging.getLogger(__name__)
 
@@ -54,14 +57,9 @@ async def create_dental_observation(
     - Tooth surface and severity tracking
     - Treatment requirement tracking
     """
-    try:
-        service = get_dental_service(db)
-        observation = service.create_observation(observation_data, current_user.id)
-        return DentalObservationResponse.model_validate(observation)
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    service = get_dental_service(db)
+    observation = service.create_observation(observation_data, current_user.id)
+    return DentalObservationResponse.model_validate(observation)
 
 
 @router.get("/observations/{observation_id}", response_model=DentalObservationResponse)
@@ -104,19 +102,16 @@ async def update_dental_observation(
     - Change severity levels
     - Update treatment dates
     """
-    try:
-        service = get_dental_service(db)
-        observation = service.update_observation(observation_id, update_data, current_user.id)
+    service = get_dental_service(db)
+    observation = service.update_observation(observation_id, update_data, current_user.id)
 
-        if not observation:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Dental observation not found"
-            )
+    if not observation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dental observation not found"
+        )
 
-        return DentalObservationResponse.model_validate(observation)
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return DentalObservationResponse.model_validate(observation)
 
 
 @router.delete("/observations/{observation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -225,17 +220,14 @@ async def get_tooth_history(
     - Chronological history
     - Treatment progression tracking
     """
-    try:
-        service = get_dental_service(db)
-        observations = service.get_tooth_history(mobile_number, first_name, tooth_number)
+    service = get_dental_service(db)
+    observations = service.get_tooth_history(mobile_number, first_name, tooth_number)
 
-        return DentalObservationListResponse(
-            observations=[DentalObservationResponse.model_validate(obs) for obs in observations],
-            total=len(observations),
-            tooth_type=None
-        )
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return DentalObservationListResponse(
+        observations=[DentalObservationResponse.model_validate(obs) for obs in observations],
+        total=len(observations),
+        tooth_type=None
+    )
 
 
 @router.post("/observations/bulk", response_model=List[DentalObservationResponse], status_code=status.HTTP_201_CREATED)
@@ -255,12 +247,9 @@ async def bulk_create_observations(
     **Limits:**
     - Maximum 32 observations per request (full permanent dentition)
     """
-    try:
-        service = get_dental_service(db)
-        observations = service.bulk_create_observations(bulk_data, current_user.id)
-        return [DentalObservationResponse.model_validate(obs) for obs in observations]
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    service = get_dental_service(db)
+    observations = service.bulk_create_observations(bulk_data, current_user.id)
+    return [DentalObservationResponse.model_validate(obs) for obs in observations]
 
 
 # ==================== Dental Procedure Endpoints ====================
@@ -285,12 +274,9 @@ async def create_dental_procedure(
     - Status management (planned, in_progress, completed, cancelled)
     - Procedure duration tracking
     """
-    try:
-        service = get_dental_service(db)
-        procedure = service.create_procedure(procedure_data, current_user.id)
-        return DentalProcedureResponse.model_validate(procedure)
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    service = get_dental_service(db)
+    procedure = service.create_procedure(procedure_data, current_user.id)
+    return DentalProcedureResponse.model_validate(procedure)
 
 
 @router.get("/procedures/{procedure_id}", response_model=DentalProcedureResponse)
@@ -330,19 +316,16 @@ async def update_dental_procedure(
     - Add notes and complications
     - Update completion dates
     """
-    try:
-        service = get_dental_service(db)
-        procedure = service.update_procedure(procedure_id, update_data, current_user.id)
+    service = get_dental_service(db)
+    procedure = service.update_procedure(procedure_id, update_data, current_user.id)
 
-        if not procedure:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Dental procedure not found"
-            )
+    if not procedure:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dental procedure not found"
+        )
 
-        return DentalProcedureResponse.model_validate(procedure)
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return DentalProcedureResponse.model_validate(procedure)
 
 
 @router.delete("/procedures/{procedure_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -400,8 +383,6 @@ async def update_procedure_status(
             )
 
         return DentalProcedureResponse.model_validate(procedure)
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except BusinessRuleError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -518,12 +499,9 @@ async def bulk_create_procedures(
     **Limits:**
     - Maximum 20 procedures per request
     """
-    try:
-        service = get_dental_service(db)
-        procedures = service.bulk_create_procedures(bulk_data, current_user.id)
-        return [DentalProcedureResponse.model_validate(proc) for proc in procedures]
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    service = get_dental_service(db)
+    procedures = service.bulk_create_procedures(bulk_data, current_user.id)
+    return [DentalProcedureResponse.model_validate(proc) for proc in procedures]
 
 
 # ==================== Dental Chart Endpoints ====================
@@ -555,17 +533,10 @@ async def get_dental_chart(
     logger.info(f"Mobile: {mobile_number}, First Name: {first_name}")
     logger.info(f"Current User: {current_user.email}, Role: {current_user.role}")
 
-    try:
-        service = get_dental_service(db)
-        chart_data = service.get_dental_chart(mobile_number, first_name)
-        logger.info(f"Chart data retrieved successfully")
-        return DentalChartResponse(**chart_data)
-    except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.error(f"Unexpected error in get_dental_chart: {str(e)}")
-        raise
+    service = get_dental_service(db)
+    chart_data = service.get_dental_chart(mobile_number, first_name)
+    logger.info(f"Chart data retrieved successfully")
+    return DentalChartResponse(**chart_data)
 
 
 # ==================== Search and Statistics Endpoints ====================
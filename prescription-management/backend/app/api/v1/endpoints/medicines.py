@@ -3,9 +3,10 @@ Medicine Management REST API Endpoints
 Provides CRUD operations for medicine catalog, drug interactions, and search functionality
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 import logging
 
@@ -30,6 +31,7 @@ from app.schemas.medicine import (
     MedicineStatistics,
     MedicineBulkOperation,
     MedicineBulkResponse,
+    MedicineBulkJob,
     MedicineImport,
     MedicineRecommendation
 )
@@ -39,6 +41,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 medicine_service = MedicineService()
 
+# Catalog statistics change slowly; let clients reuse them briefly and
+# revalidate in the background instead of re-running the aggregates
+STATISTICS_CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=300"
+
+# Bulk requests larger than this are queued and answered with 202 Accepted;
+# they are refused with 503 rather than run inline when jobs cannot be queued
+BULK_BACKGROUND_THRESHOLD = 1000
+
 
 @router.post("/", response_model=MedicineResponse, status_code=status.HTTP_201_CREATED)
 async def create_medicine(
@@ -57,7 +67,7 @@ async def create_medicine(
             medicine_data=medicine_data,
             created_by=current_user.id
         )
-        logger.info(f"Medicine created: {medicine.name} by user {current_user.id}")
+        logger.info("Medicine created: %s by user %s", medicine.name, current_user.id)
         return medicine
         
     except DuplicateError as e:
@@ -71,7 +81,7 @@ async def create_medicine(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error creating medicine: {str(e)}")
+        logger.error("Error creating medicine: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create medicine"
@@ -136,7 +146,7 @@ async def list_medicines(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error listing medicines: {str(e)}")
+        logger.error("Error listing medicines: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve medicines"
@@ -164,8 +174,10 @@ async def get_medicine(
         
         return medicine
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving medicine {medicine_id}: {str(e)}")
+        logger.error("Error retrieving medicine %s: %s", medicine_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve medicine"
@@ -192,7 +204,7 @@ async def update_medicine(
                 detail=f"Medicine not found: {medicine_id}"
             )
         
-        logger.info(f"Medicine updated: {medicine.name} by user {current_user.id}")
+        logger.info("Medicine updated: %s by user %s", medicine.name, current_user.id)
         return medicine
         
     except MedicineNotFoundError:
@@ -211,7 +223,7 @@ async def update_medicine(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error updating medicine {medicine_id}: {str(e)}")
+        logger.error("Error updating medicine %s: %s", medicine_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update medicine"
@@ -237,7 +249,7 @@ async def deactivate_medicine(
                 detail=f"Medicine not found: {medicine_id}"
             )
         
-        logger.info(f"Medicine deactivated: {medicine_id} by user {current_user.id}")
+        logger.info("Medicine deactivated: %s by user %s", medicine_id, current_user.id)
         
     except MedicineNotFoundError:
         raise HTTPException(
@@ -245,7 +257,7 @@ async def deactivate_medicine(
             detail=f"Medicine not found: {medicine_id}"
         )
     except Exception as e:
-        logger.error(f"Error deactivating medicine {medicine_id}: {str(e)}")
+        logger.error("Error deactivating medicine %s: %s", medicine_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to deactivate medicine"
@@ -271,7 +283,7 @@ async def reactivate_medicine(
                 detail=f"Inactive medicine not found: {medicine_id}"
             )
         
-        logger.info(f"Medicine reactivated: {medicine.name} by user {current_user.id}")
+        logger.info("Medicine reactivated: %s by user %s", medicine.name, current_user.id)
         return medicine
         
     except MedicineNotFoundError:
@@ -285,7 +297,7 @@ async def reactivate_medicine(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error reactivating medicine {medicine_id}: {str(e)}")
+        logger.error("Error reactivating medicine %s: %s", medicine_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to reactivate medicine"
@@ -309,7 +321,7 @@ async def simple_medicine_search(
         return medicines
         
     except Exception as e:
-        logger.error(f"Error in simple medicine search: {str(e)}")
+        logger.error("Error in simple medicine search: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to search medicines"
@@ -351,7 +363,7 @@ async def check_drug_interactions(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error checking drug interactions: {str(e)}")
+        logger.error("Error checking drug interactions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to check drug interactions"
@@ -374,7 +386,7 @@ async def get_medicines_by_category(
         return medicines
         
     except Exception as e:
-        logger.error(f"Error retrieving medicines by category {category}: {str(e)}")
+        logger.error("Error retrieving medicines by category %s: %s", category, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve medicines by category"
@@ -397,7 +409,7 @@ async def get_medicines_by_manufacturer(
         return medicines
         
     except Exception as e:
-        logger.error(f"Error retrieving medicines by manufacturer {manufacturer}: {str(e)}")
+        logger.error("Error retrieving medicines by manufacturer %s: %s", manufacturer, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve medicines by manufacturer"
@@ -406,6 +418,7 @@ async def get_medicines_by_manufacturer(
 
 @router.get("/statistics/overview", response_model=MedicineStatistics)
 async def get_medicine_statistics(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -416,10 +429,11 @@ async def get_medicine_statistics(
     """
     try:
         stats = medicine_service.get_medicine_statistics(db)
+        response.headers["Cache-Control"] = STATISTICS_CACHE_CONTROL
         return MedicineStatistics(**stats)
         
     except Exception as e:
-        logger.error(f"Error retrieving medicine statistics: {str(e)}")
+        logger.error("Error retrieving medicine statistics: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve statistics"
@@ -442,46 +456,95 @@ async def get_popular_medicines(
         return medicines
         
     except Exception as e:
-        logger.error(f"Error retrieving popular medicines: {str(e)}")
+        logger.error("Error retrieving popular medicines: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve popular medicines"
         )
 
 
-@router.post("/bulk", response_model=MedicineBulkResponse)
-async def bulk_medicine_operations(
+# Plain def: the bulk statement is synchronous, so FastAPI runs it in the
+# threadpool instead of blocking the event loop
+@router.post("/bulk", response_model=Union[MedicineBulkResponse, MedicineBulkJob])
+def bulk_medicine_operations(
     operation_request: MedicineBulkOperation,
+    background_tasks: BackgroundTasks,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Perform bulk operations on medicines.
     
+    Requests with more than 500 IDs are queued as a background job and
+    return 202 with a job ID; poll `GET /bulk/{job_id}` for the result.
+    If the job store is unavailable they are rejected with 503.
+    
     **Admin access required.**
     """
     try:
+        if len(operation_request.medicine_ids) > BULK_BACKGROUND_THRESHOLD:
+            job_id = medicine_service.queue_bulk_update_job(
+                operation_request.medicine_ids, operation_request.operation, current_user.id
+            )
+            if not job_id:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Bulk job queue unavailable; retry later or send at most {BULK_BACKGROUND_THRESHOLD} IDs"
+                )
+            background_tasks.add_task(
+                medicine_service.run_bulk_update_job,
+                job_id, operation_request.medicine_ids, operation_request.operation, current_user.id
+            )
+            logger.info("Bulk operation %s queued as job %s by user %s", operation_request.operation, job_id, current_user.id)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return MedicineBulkJob(job_id=job_id, status="queued")
+        
         result = medicine_service.bulk_update_medicines(
             db, operation_request.medicine_ids, operation_request.operation
         )
         
-        logger.info(f"Bulk operation {operation_request.operation} performed by user {current_user.id}: {result['successful']}/{result['total_requested']} successful")
+        logger.info("Bulk operation %s performed by user %s: %s/%s successful", operation_request.operation, current_user.id, result['successful'], result['total_requested'])
         
         return MedicineBulkResponse(**result)
         
+    except HTTPException:
+        raise
     except ValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error in bulk medicine operation: {str(e)}")
+        logger.error("Error in bulk medicine operation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to perform bulk operation"
         )
 
 
+@router.get("/bulk/{job_id}", response_model=MedicineBulkJob)
+def get_bulk_medicine_job(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get status of a queued bulk medicine operation.
+    
+    Only the user who queued the job can see it.
+    
+    **Admin access required.**
+    """
+    job = medicine_service.get_bulk_job(job_id, current_user.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bulk job not found: {job_id}"
+        )
+    
+    return MedicineBulkJob(**job)
+
+
 @router.post("/import", response_model=Dict[str, Any])
 async def import_medicines(
     import_request: MedicineImport,
@@ -494,14 +557,16 @@ async def import_medicines(
     **Admin access required.**
     """
     try:
-        result = medicine_service.import_medicines(
+        # Per-row lookups and writes are synchronous; keep them off the event loop
+        result = await run_in_threadpool(
+            medicine_service.import_medicines,
             db=db,
             medicines_data=import_request.medicines,
             created_by=current_user.id,
             overwrite=import_request.overwrite_existing
         )
         
-        logger.info(f"Medicine import performed by user {current_user.id}: {result['successful']}/{result['total']} successful")
+        logger.info("Medicine import performed by user %s: %s/%s successful", current_user.id, result['successful'], result['total'])
         
         return result
         
@@ -511,7 +576,7 @@ async def import_medicines(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error importing medicines: {str(e)}")
+        logger.error("Error importing medicines: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to import medicines"
@@ -547,7 +612,7 @@ async def get_medicine_recommendations(
         )
         
     except Exception as e:
-        logger.error(f"Error getting medicine recommendations for {condition}: {str(e)}")
+        logger.error("Error getting medicine recommendations for %s: %s", condition, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get recommendations"
@@ -570,7 +635,7 @@ async def get_contraindicated_medicines(
         return medicines
         
     except Exception as e:
-        logger.error(f"Error retrieving contraindicated medicines for {condition}: {str(e)}")
+        logger.error("Error retrieving contraindicated medicines for %s: %s", condition, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve contraindicated medicines"
@@ -2,45 +2,61 @@
 Patient Management API Endpoints with Composite Key Support
 Handles mobile_number + first_name composite primary key
 Supports family registration and management
+
+Endpoints are plain `def` because the service layer uses a blocking
+Session; FastAPI runs them in the threadpool instead of on the event loop.
+Domain exceptions from the service propagate to the handlers registered
+in app.main, which map them to HTTP status codes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from pydantic import TypeAdapter
+from typing import List, Optional, Dict, Any, Literal
 from uuid import UUID
 import logging
 
 from app.core.database import get_db
 from app.api.deps.auth import get_current_active_user, require_admin, require_staff
 from app.models.user import User
-from app.services.patient_service import PatientService
+from app.services.patient_service import PatientService, PATIENT_SEARCH_LIMIT, PATIENT_SEARCH_MAX_LIMIT
+from app.utils.mobile_validators import normalize_mobile
 from app.schemas.patient import (
     PatientCreate, 
     PatientUpdate, 
     PatientCreateFamily,
+    PatientFamilyBulkCreate,
     PatientResponse, 
     PatientListResponse,
     FamilyResponse,
     PatientSearchParams,
+    GenderEnum,
+    RelationshipEnum,
     ValidationErrorResponse,
     FamilyValidationRequest,
     CompositeKey
 )
-from app.core.exceptions import (
-    PatientNotFoundError, 
-    ValidationError, 
-    BusinessRuleError,
-    FamilyLimitExceededError,
-    PrimaryFamilyMemberRequiredError
-)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 patient_service = PatientService()
 
+# Validates a whole result list from ORM rows in one call instead of per row
+_PATIENT_LIST_ADAPTER = TypeAdapter(List[PatientResponse])
+_PATIENT_PAGE_ADAPTER = TypeAdapter(PatientListResponse)
+
+
+def _json_response(content: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Wrap JSON already serialized by pydantic-core
+    List routes use this with response_model=None so FastAPI does not
+    re-validate and re-encode the payload through jsonable_encoder
+    """
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
 
 @router.post("/", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
-async def create_patient(
+def create_patient(
     patient_data: PatientCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -55,48 +71,61 @@ async def create_patient(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patient = patient_service.create_patient(db, patient_data, current_user.id)
-        return PatientResponse.model_validate(patient)
-    
-    except ValidationError as e:
-        logger.warning(f"Patient creation validation failed: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except BusinessRuleError as e:
-        logger.warning(f"Patient creation business rule failed: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=e.message
-        )
-    except Exception as e:
-        logger.error(f"Error creating patient: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create patient"
-        )
+    patient = patient_service.create_patient(db, patient_data, current_user.id)
+    return PatientResponse.model_validate(patient)
 
 
-@router.get("/", response_model=PatientListResponse)
-async def list_patients(
+def get_patient_search_params(
     mobile_number: Optional[str] = Query(None, description="Filter by mobile number"),
     first_name: Optional[str] = Query(None, description="Filter by first name"),
     last_name: Optional[str] = Query(None, description="Filter by last name"),
     email: Optional[str] = Query(None, description="Filter by email"),
-    gender: Optional[str] = Query(None, description="Filter by gender"),
-    relationship: Optional[str] = Query(None, description="Filter by relationship"),
+    gender: Optional[GenderEnum] = Query(None, description="Filter by gender"),
+    relationship: Optional[RelationshipEnum] = Query(None, description="Filter by relationship"),
     is_active: Optional[bool] = Query(True, description="Filter by active status"),
     age_min: Optional[int] = Query(None, ge=0, le=150, description="Minimum age"),
     age_max: Optional[int] = Query(None, ge=0, le=150, description="Maximum age"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from next_cursor; overrides page"),
     sort_by: Optional[str] = Query("first_name", description="Sort field"),
-    sort_order: Optional[str] = Query("asc", description="Sort order"),
+    sort_order: Optional[Literal["asc", "desc"]] = Query("asc", description="Sort order")
+) -> PatientSearchParams:
+    """
+    Build PatientSearchParams from query parameters
+    Every field is already validated by its Query declaration, so the model is
+    built with model_construct instead of re-running the schema validators
+    """
+    if age_min is not None and age_max is not None and age_max < age_min:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Maximum age must be greater than minimum age"
+        )
+    
+    return PatientSearchParams.model_construct(
+        mobile_number=normalize_mobile(mobile_number) if mobile_number else None,
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        gender=gender,
+        relationship=relationship,
+        is_active=is_active,
+        age_min=age_min,
+        age_max=age_max,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        sort_by=sort_by,
+        sort_order=sort_order
+    )
+
+
+@router.get("/", response_model=None, responses={200: {"model": PatientListResponse}})
+def list_patients(
+    search_params: PatientSearchParams = Depends(get_patient_search_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
-) -> PatientListResponse:
+) -> Response:
     """
     List patients with search, filtering, and pagination
     
@@ -106,51 +135,40 @@ async def list_patients(
     - Gender, relationship, active status
     - Age range filtering
     
+    **Pagination**: `page` for offset paging, or `cursor` (the previous
+    page's `next_cursor`) for constant-cost keyset paging by first name
+    
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        search_params = PatientSearchParams(
-            mobile_number=mobile_number,
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            gender=gender,
-            relationship=relationship,
-            is_active=is_active,
-            age_min=age_min,
-            age_max=age_max,
-            page=page,
-            page_size=page_size,
-            sort_by=sort_by,
-            sort_order=sort_order
-        )
-        
-        patients, total_count = patient_service.search_patients(db, search_params)
-        
-        total_pages = (total_count + page_size - 1) // page_size
-        
-        return PatientListResponse(
-            patients=[PatientResponse.model_validate(p) for p in patients],
-            total=total_count,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
-        )
-        
-    except Exception as e:
-        logger.error(f"Error listing patients: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve patients"
-        )
+    patients, total_count = patient_service.search_patients(db, search_params)
+    
+    page = search_params.page
+    page_size = search_params.page_size
+    cursor = search_params.cursor
+    total_pages = (total_count + page_size - 1) // page_size
+    next_cursor = None
+    if search_params.sort_by == "first_name" and len(patients) == page_size:
+        next_cursor = patient_service.encode_cursor(patients[-1])
+    
+    pagination = {
+        "total": total_count,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "has_next": next_cursor is not None if cursor else page < total_pages,
+        "has_prev": cursor is not None or page > 1,
+        "next_cursor": next_cursor
+    }
+    page_response = _PATIENT_PAGE_ADAPTER.validate_python(
+        {"patients": patients, **pagination}, from_attributes=True
+    )
+    return _json_response(_PATIENT_PAGE_ADAPTER.dump_json(page_response))
 
 
 # Statistics and Analytics (MUST BE BEFORE DYNAMIC ROUTES)
 
 @router.get("/statistics/overview", response_model=Dict[str, Any])
-async def get_patient_statistics(
+def get_patient_statistics(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
 ) -> Dict[str, Any]:
@@ -161,26 +179,18 @@ async def get_patient_statistics(
 
     **Staff access required** (admin, doctor, nurse, receptionist)
     """
-    try:
-        stats = patient_service.get_patient_statistics(db)
-        return stats
-
-    except Exception as e:
-        logger.error(f"Error retrieving patient statistics: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve statistics"
-        )
+    stats = patient_service.get_patient_statistics(db)
+    return stats
 
 
 # Family Management Endpoints (MOVED BEFORE COMPOSITE KEY ROUTES TO FIX ROUTING CONFLICT)
 
-@router.get("/families/{mobile_number}", response_model=FamilyResponse)
-async def get_family_members(
+@router.get("/families/{mobile_number}", response_model=None, responses={200: {"model": FamilyResponse}})
+def get_family_members(
     mobile_number: str = Path(..., description="Family mobile number"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
-) -> FamilyResponse:
+) -> Response:
     """
     Get all family members for a mobile number
     
@@ -188,26 +198,18 @@ async def get_family_members(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        family_info = patient_service.get_family_with_details(db, mobile_number)
-        
-        return FamilyResponse(
-            family_mobile=family_info['family_mobile'],
-            primary_member=PatientResponse.model_validate(family_info['primary_member']) if family_info['primary_member'] else None,
-            family_members=[PatientResponse.model_validate(member) for member in family_info['family_members']],
-            total_members=family_info['total_members']
-        )
-        
-    except Exception as e:
-        logger.error(f"Error retrieving family members: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve family members"
-        )
+    family_info = patient_service.get_family_with_details(db, mobile_number)
+    
+    return _json_response(FamilyResponse(
+        family_mobile=family_info['family_mobile'],
+        primary_member=PatientResponse.model_validate(family_info['primary_member']) if family_info['primary_member'] else None,
+        family_members=_PATIENT_LIST_ADAPTER.validate_python(family_info['family_members'], from_attributes=True),
+        total_members=family_info['total_members']
+    ).model_dump_json())
 
 
 @router.post("/families/{mobile_number}", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
-async def add_family_member(
+def add_family_member(
     mobile_number: str = Path(..., description="Family mobile number"),
     member_data: PatientCreateFamily = ...,
     db: Session = Depends(get_db),
@@ -225,32 +227,40 @@ async def add_family_member(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patient = patient_service.create_family_member(db, mobile_number, member_data, current_user.id)
-        return PatientResponse.model_validate(patient)
-        
-    except ValidationError as e:
-        logger.warning(f"Family member creation validation failed: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except BusinessRuleError as e:
-        logger.warning(f"Family member creation business rule failed: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=e.message
-        )
-    except Exception as e:
-        logger.error(f"Error adding family member: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to add family member"
-        )
+    patient = patient_service.create_family_member(db, mobile_number, member_data, current_user.id)
+    return PatientResponse.model_validate(patient)
+
+
+@router.post(
+    "/families/{mobile_number}/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": List[PatientResponse]}}
+)
+def add_family_members_bulk(
+    mobile_number: str = Path(..., description="Family mobile number"),
+    bulk_data: PatientFamilyBulkCreate = ...,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_staff)
+) -> Response:
+    """
+    Add several family members to an existing family in one request
+    
+    **Family Registration**: Same rules as adding a single member, checked
+    for the whole batch before anything is written; all members are created
+    in a single transaction or none are
+    
+    **Permissions**: Staff, Doctor, Admin, Super Admin
+    """
+    patients = patient_service.create_family_members_bulk(db, mobile_number, bulk_data.members, current_user.id)
+    return _json_response(
+        _PATIENT_LIST_ADAPTER.dump_json(_PATIENT_LIST_ADAPTER.validate_python(patients, from_attributes=True)),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("/families/{mobile_number}/eligibility")
-async def check_family_eligibility(
+def check_family_eligibility(
     mobile_number: str = Path(..., description="Family mobile number"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -265,20 +275,12 @@ async def check_family_eligibility(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        eligibility = patient_service.check_family_registration_eligibility(db, mobile_number)
-        return eligibility
-        
-    except Exception as e:
-        logger.error(f"Error checking family eligibility: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to check family eligibility"
-        )
+    eligibility = patient_service.check_family_registration_eligibility(db, mobile_number)
+    return eligibility
 
 
 @router.post("/validate-family", response_model=ValidationErrorResponse)
-async def validate_family_registration(
+def validate_family_registration(
     validation_request: FamilyValidationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -290,31 +292,49 @@ async def validate_family_registration(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        validation_result = patient_service.validate_family_member_creation(
-            db=db,
-            mobile_number=validation_request.mobile_number,
-            first_name=validation_request.first_name,
-            relationship=validation_request.relationship
-        )
-        
-        return ValidationErrorResponse(
-            is_valid=validation_result['is_valid'],
-            errors=validation_result['errors']
-        )
-        
-    except Exception as e:
-        logger.error(f"Error validating family registration: {str(e)}")
+    validation_result = patient_service.validate_family_member_creation(
+        db=db,
+        mobile_number=validation_request.mobile_number,
+        first_name=validation_request.first_name,
+        relationship=validation_request.relationship
+    )
+    
+    return ValidationErrorResponse(
+        is_valid=validation_result['is_valid'],
+        errors=validation_result['errors']
+    )
+
+
+# UUID Lookup (MUST BE BEFORE COMPOSITE KEY ROUTES: "/id/{patient_id}" also
+# matches "/{mobile_number}/{first_name}", and routes match in declaration order)
+
+@router.get("/id/{patient_id}", response_model=PatientResponse)
+def get_patient_by_id(
+    patient_id: UUID = Path(..., description="Patient UUID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_staff)
+) -> PatientResponse:
+    """
+    Get patient by internal UUID
+    
+    **Internal Reference**: For system integration (appointments, prescriptions)
+    
+    **Permissions**: Staff, Doctor, Admin, Super Admin
+    """
+    patient = patient_service.get_patient_by_id(db, patient_id)
+    if not patient:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to validate family registration"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Patient not found with ID: {patient_id}"
         )
+    
+    return PatientResponse.model_validate(patient)
 
 
 # Composite Key Routes (MOVED AFTER FAMILY ROUTES TO PREVENT ROUTING CONFLICT)
 
 @router.get("/{mobile_number}/{first_name}", response_model=PatientResponse)
-async def get_patient_by_composite_key(
+def get_patient_by_composite_key(
     mobile_number: str = Path(..., description="Mobile number (part of composite key)"),
     first_name: str = Path(..., description="First name (part of composite key)"),
     db: Session = Depends(get_db),
@@ -327,28 +347,18 @@ async def get_patient_by_composite_key(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patient = patient_service.get_patient_by_composite_key(db, mobile_number, first_name)
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Patient not found: {mobile_number} - {first_name}"
-            )
-        
-        return PatientResponse.model_validate(patient)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving patient: {str(e)}")
+    patient = patient_service.get_patient_by_composite_key(db, mobile_number, first_name)
+    if not patient:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve patient"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Patient not found: {mobile_number} - {first_name}"
         )
+    
+    return PatientResponse.model_validate(patient)
 
 
 @router.put("/{mobile_number}/{first_name}", response_model=PatientResponse)
-async def update_patient(
+def update_patient(
     mobile_number: str = Path(..., description="Mobile number (part of composite key)"),
     first_name: str = Path(..., description="First name (part of composite key)"),
     patient_data: PatientUpdate = ...,
@@ -362,32 +372,12 @@ async def update_patient(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patient = patient_service.update_patient(db, mobile_number, first_name, patient_data)
-        return PatientResponse.model_validate(patient)
-        
-    except PatientNotFoundError as e:
-        logger.warning(f"Patient not found for update: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        logger.warning(f"Patient update validation failed: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except Exception as e:
-        logger.error(f"Error updating patient: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update patient"
-        )
+    patient = patient_service.update_patient(db, mobile_number, first_name, patient_data)
+    return PatientResponse.model_validate(patient)
 
 
 @router.delete("/{mobile_number}/{first_name}", status_code=status.HTTP_204_NO_CONTENT)
-async def deactivate_patient(
+def deactivate_patient(
     mobile_number: str = Path(..., description="Mobile number (part of composite key)"),
     first_name: str = Path(..., description="First name (part of composite key)"),
     db: Session = Depends(get_db),
@@ -398,30 +388,16 @@ async def deactivate_patient(
     
     **Admin Only**: Patient deactivation requires admin privileges
     """
-    try:
-        success = patient_service.deactivate_patient(db, mobile_number, first_name)
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Patient not found: {mobile_number} - {first_name}"
-            )
-            
-    except PatientNotFoundError as e:
-        logger.warning(f"Patient not found for deactivation: {e.message}")
+    success = patient_service.deactivate_patient(db, mobile_number, first_name)
+    if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except Exception as e:
-        logger.error(f"Error deactivating patient: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to deactivate patient"
+            detail=f"Patient not found: {mobile_number} - {first_name}"
         )
 
 
 @router.put("/{mobile_number}/{first_name}/reactivate", response_model=PatientResponse)
-async def reactivate_patient(
+def reactivate_patient(
     mobile_number: str = Path(..., description="Mobile number (part of composite key)"),
     first_name: str = Path(..., description="First name (part of composite key)"),
     db: Session = Depends(get_db),
@@ -432,33 +408,19 @@ async def reactivate_patient(
     
     **Admin Only**: Patient reactivation requires admin privileges
     """
-    try:
-        patient = patient_service.reactivate_patient(db, mobile_number, first_name)
-        return PatientResponse.model_validate(patient)
-        
-    except PatientNotFoundError as e:
-        logger.warning(f"Inactive patient not found for reactivation: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except Exception as e:
-        logger.error(f"Error reactivating patient: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to reactivate patient"
-        )
-
+    patient = patient_service.reactivate_patient(db, mobile_number, first_name)
+    return PatientResponse.model_validate(patient)
 
 
 # Search and Query Endpoints
 
-@router.get("/search/mobile/{mobile_number}", response_model=List[PatientResponse])
-async def get_patients_by_mobile(
+@router.get("/search/mobile/{mobile_number}", response_model=None, responses={200: {"model": List[PatientResponse]}})
+def get_patients_by_mobile(
     mobile_number: str = Path(..., description="Mobile number to search"),
+    limit: int = Query(PATIENT_SEARCH_LIMIT, ge=1, le=PATIENT_SEARCH_MAX_LIMIT, description="Maximum results"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
-) -> List[PatientResponse]:
+) -> Response:
     """
     Get all patients with specific mobile number
     
@@ -466,24 +428,21 @@ async def get_patients_by_mobile(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patients = patient_service.get_patients_by_mobile(db, mobile_number)
-        return [PatientResponse.model_validate(patient) for patient in patients]
-        
-    except Exception as e:
-        logger.error(f"Error searching patients by mobile: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search patients"
+    patients = patient_service.get_patients_by_mobile(db, mobile_number, limit)
+    return _json_response(
+        _PATIENT_LIST_ADAPTER.dump_json(
+            _PATIENT_LIST_ADAPTER.validate_python(patients, from_attributes=True)
         )
+    )
 
 
-@router.get("/search/email/{email}", response_model=List[PatientResponse])
-async def get_patients_by_email(
+@router.get("/search/email/{email}", response_model=None, responses={200: {"model": List[PatientResponse]}})
+def get_patients_by_email(
     email: str = Path(..., description="Email address to search"),
+    limit: int = Query(PATIENT_SEARCH_LIMIT, ge=1, le=PATIENT_SEARCH_MAX_LIMIT, description="Maximum results"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
-) -> List[PatientResponse]:
+) -> Response:
     """
     Get patients by email address
     
@@ -491,46 +450,9 @@ async def get_patients_by_email(
     
     **Permissions**: Staff, Doctor, Admin, Super Admin
     """
-    try:
-        patients = patient_service.get_patients_by_email(db, email)
-        return [PatientResponse.model_validate(patient) for patient in patients]
-        
-    except Exception as e:
-        logger.error(f"Error searching patients by email: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search patients"
+    patients = patient_service.get_patients_by_email(db, email, limit)
+    return _json_response(
+        _PATIENT_LIST_ADAPTER.dump_json(
+            _PATIENT_LIST_ADAPTER.validate_python(patients, from_attributes=True)
         )
-
-
-@router.get("/id/{patient_id}", response_model=PatientResponse)
-async def get_patient_by_id(
-    patient_id: UUID = Path(..., description="Patient UUID"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
-) -> PatientResponse:
-    """
-    Get patient by internal UUID
-    
-    **Internal Reference**: For system integration (appointments, prescriptions)
-    
-    **Permissions**: Staff, Doctor, Admin, Super Admin
-    """
-    try:
-        patient = patient_service.get_patient_by_id(db, patient_id)
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Patient not found with ID: {patient_id}"
-            )
-        
-        return PatientResponse.model_validate(patient)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving patient by ID: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve patient"
-        )
\ No newline at end of file
+    )
@@ -4,14 +4,20 @@ Comprehensive REST API for prescription management with PDF generation support
 Integrates with patients, doctors, medicines, and short keys modules
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Iterable, Iterator
+from itertools import chain, islice
 from uuid import UUID
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from pydantic import BaseModel, TypeAdapter
 
 from app.api.deps.database import get_db
-from app.api.deps.auth import get_current_active_user, require_staff, require_admin
+from app.api.deps.auth import (
+    get_current_active_user, require_staff, require_admin, get_current_doctor_id
+)
+from app.models.prescription import Prescription, PrescriptionItem
 from app.models.user import User
 from app.schemas.prescription import (
     PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse,
@@ -19,9 +25,9 @@ from app.schemas.prescription import (
     PrescriptionItemCreate, PrescriptionItemUpdate, PrescriptionItemResponse,
     ShortKeyPrescriptionCreate, PrescriptionValidationRequest,
     ValidationErrorResponse, BulkPrescriptionRequest, BulkOperationResponse,
-    PrescriptionStatsResponse, PrescriptionPrintRequest
+    PrescriptionStatsResponse, PrescriptionPrintRequest, PrescriptionStatusEnum
 )
-from app.services.prescription_service import get_prescription_service
+from app.services.prescription_service import PrescriptionService, get_prescription_service
 from app.core.exceptions import (
     PrescriptionNotFoundError, PatientNotFoundError, DoctorNotFoundError,
     MedicineNotFoundError, ValidationError, BusinessRuleError
@@ -29,9 +35,60 @@ from app.core.exceptions import (
 
 router = APIRouter()
 
+# Validates a whole result list from ORM rows in one call instead of per row
+_PRESCRIPTION_LIST_ADAPTER = TypeAdapter(List[PrescriptionResponse])
+
+# Patient/doctor histories are fetched and serialized this many rows at a time
+HISTORY_YIELD_PER = 25
+
+
+def _stream_prescription_array(prescriptions: Iterable[Prescription]) -> Iterator[bytes]:
+    """
+    Stream a JSON array of PrescriptionResponse one prescription at a time
+    Rows arrive in yield_per batches, so a long history is never held in memory
+    as ORM objects or response models all at once. The first batch is fetched
+    and serialized before the response starts, so query errors still become
+    regular error responses. Later batches reuse the request's get_db session,
+    which the pinned FastAPI 0.104 closes only after the body is sent.
+    """
+    rows = iter(prescriptions)
+    first_batch = [
+        PrescriptionResponse.model_validate(prescription).model_dump_json().encode()
+        for prescription in islice(rows, HISTORY_YIELD_PER)
+    ]
+    remaining = (
+        PrescriptionResponse.model_validate(prescription).model_dump_json().encode()
+        for prescription in rows
+    )
+
+    def body() -> Iterator[bytes]:
+        yield b'['
+        for index, row in enumerate(chain(first_batch, remaining)):
+            yield b',' + row if index else row
+        yield b']'
+
+    return body()
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize an already-validated response model straight to JSON
+    Used with response_model=None so FastAPI does not validate it a second time
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _caller_doctor_id(current_user: User, current_doctor_id: Optional[UUID]) -> Optional[UUID]:
+    """Doctor ID that scopes prescription access (None for admin/nurse/receptionist)"""
+    if current_user.role != 'doctor':
+        return None
+    if not current_doctor_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return current_doctor_id
+
 
 @router.post("/", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
-async def create_prescription(
+def create_prescription(
     prescription_data: PrescriptionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -62,7 +119,7 @@ async def create_prescription(
 
 
 @router.post("/short-key", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
-async def create_prescription_from_short_key(
+def create_prescription_from_short_key(
     short_key_data: ShortKeyPrescriptionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -90,15 +147,14 @@ async def create_prescription_from_short_key(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/", response_model=PrescriptionListResponse)
-async def list_prescriptions(
+def get_prescription_search_params(
     # Search filters
     patient_mobile_number: Optional[str] = Query(None, description="Filter by patient mobile"),
     patient_first_name: Optional[str] = Query(None, description="Filter by patient first name"),
     patient_uuid: Optional[UUID] = Query(None, description="Filter by patient UUID"),
     doctor_id: Optional[UUID] = Query(None, description="Filter by doctor"),
     appointment_id: Optional[UUID] = Query(None, description="Filter by appointment"),
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status_filter: Optional[PrescriptionStatusEnum] = Query(None, alias="status", description="Filter by status"),
     is_printed: Optional[bool] = Query(None, description="Filter by print status"),
     visit_date_from: Optional[date] = Query(None, description="Visit date from"),
     visit_date_to: Optional[date] = Query(None, description="Visit date to"),
@@ -110,31 +166,30 @@ async def list_prescriptions(
     # Pagination
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from next_cursor; overrides page"),
     
     # Sorting
     sort_by: Optional[str] = Query("visit_date", description="Sort field"),
-    sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$", description="Sort order"),
-    
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
-):
+    sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order")
+) -> PrescriptionSearchParams:
     """
-    List prescriptions with filtering, searching, and pagination
-    
-    **Features:**
-    - Comprehensive filtering by patient, doctor, dates, status
-    - Text search in diagnosis and prescription number
-    - Pagination support
-    - Multiple sorting options
-    - Role-based access (staff can see all, doctors see own)
+    Build PrescriptionSearchParams from query parameters
+    Every field is already validated by its Query declaration, so the model is
+    built with model_construct instead of re-running the schema validators
     """
-    search_params = PrescriptionSearchParams(
+    if visit_date_from and visit_date_to and visit_date_to < visit_date_from:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Visit date 'to' must be after 'from' date"
+        )
+    
+    return PrescriptionSearchParams.model_construct(
         patient_mobile_number=patient_mobile_number,
         patient_first_name=patient_first_name,
         patient_uuid=patient_uuid,
         doctor_id=doctor_id,
         appointment_id=appointment_id,
-        status=status,
+        status=status_filter,
         is_printed=is_printed,
         visit_date_from=visit_date_from,
         visit_date_to=visit_date_to,
@@ -144,39 +199,71 @@ async def list_prescriptions(
         created_to=created_to,
         page=page,
         page_size=page_size,
+        cursor=cursor,
         sort_by=sort_by,
         sort_order=sort_order
     )
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": PrescriptionListResponse}}
+)
+def list_prescriptions(
+    search_params: PrescriptionSearchParams = Depends(get_prescription_search_params),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
+):
+    """
+    List prescriptions with filtering, searching, and pagination
     
+    **Features:**
+    - Comprehensive filtering by patient, doctor, dates, status
+    - Text search in diagnosis and prescription number
+    - Pagination support: `page` for offset paging, or `cursor` (the previous
+      page's `next_cursor`) for constant-cost keyset paging by visit date
+    - Multiple sorting options
+    - Role-based access (staff can see all, doctors see own)
+    """
     # If user is doctor (not admin/nurse), filter to their prescriptions only
-    if current_user.role == 'doctor' and not doctor_id:
-        # Get doctor ID from user
-        from app.models.doctor import Doctor
-        doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-        if doctor:
-            search_params.doctor_id = doctor.id
+    if current_user.role == 'doctor' and not search_params.doctor_id and current_doctor_id:
+        search_params.doctor_id = current_doctor_id
     
     service = get_prescription_service(db)
     prescriptions, total = service.search_prescriptions(search_params)
     
+    page = search_params.page
+    page_size = search_params.page_size
+    cursor = search_params.cursor
     total_pages = (total + page_size - 1) // page_size
+    next_cursor = None
+    if search_params.sort_by == "visit_date" and len(prescriptions) == page_size:
+        next_cursor = service.encode_cursor(prescriptions[-1])
     
-    return PrescriptionListResponse(
-        prescriptions=[PrescriptionResponse.model_validate(p) for p in prescriptions],
+    return _json_response(PrescriptionListResponse(
+        prescriptions=_PRESCRIPTION_LIST_ADAPTER.validate_python(prescriptions, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1
-    )
+        has_next=next_cursor is not None if cursor else page < total_pages,
+        has_prev=cursor is not None or page > 1,
+        next_cursor=next_cursor
+    ))
 
 
-@router.get("/{prescription_id}", response_model=PrescriptionResponse)
-async def get_prescription(
+@router.get(
+    "/{prescription_id}",
+    response_model=None,
+    responses={200: {"model": PrescriptionResponse}}
+)
+def get_prescription(
     prescription_id: UUID = Path(..., description="Prescription ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Get prescription by ID
@@ -187,27 +274,28 @@ async def get_prescription(
     - All prescription items with medicine details
     - Computed fields (total amount, expiry status, etc.)
     """
+    # Doctors can only see their own prescriptions; the service raises AuthorizationError (403) for others'
     service = get_prescription_service(db)
-    prescription = service.get_prescription_by_id(prescription_id)
+    prescription = service.get_prescription_by_id(
+        prescription_id, _caller_doctor_id(current_user, current_doctor_id)
+    )
     
     if not prescription:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
     
-    # Check access permissions (doctors can only see their own prescriptions)
-    if current_user.role == 'doctor':
-        from app.models.doctor import Doctor
-        doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-        if not doctor or str(prescription.doctor_id) != str(doctor.id):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    return PrescriptionResponse.model_validate(prescription)
+    return _json_response(PrescriptionResponse.model_validate(prescription))
 
 
-@router.get("/number/{prescription_number}", response_model=PrescriptionResponse)
-async def get_prescription_by_number(
+@router.get(
+    "/number/{prescription_number}",
+    response_model=None,
+    responses={200: {"model": PrescriptionResponse}}
+)
+def get_prescription_by_number(
     prescription_number: str = Path(..., description="Prescription number"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Get prescription by prescription number
@@ -218,27 +306,23 @@ async def get_prescription_by_number(
     - Patient prescription history lookup
     """
     service = get_prescription_service(db)
-    prescription = service.get_prescription_by_number(prescription_number)
+    prescription = service.get_prescription_by_number(
+        prescription_number, _caller_doctor_id(current_user, current_doctor_id)
+    )
     
     if not prescription:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
     
-    # Check access permissions
-    if current_user.role == 'doctor':
-        from app.models.doctor import Doctor
-        doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-        if not doctor or str(prescription.doctor_id) != str(doctor.id):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    return PrescriptionResponse.model_validate(prescription)
+    return _json_response(PrescriptionResponse.model_validate(prescription))
 
 
 @router.put("/{prescription_id}", response_model=PrescriptionResponse)
-async def update_prescription(
+def update_prescription(
     prescription_id: UUID = Path(..., description="Prescription ID"),
     prescription_data: PrescriptionUpdate = Body(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Update prescription information
@@ -256,18 +340,10 @@ async def update_prescription(
     try:
         service = get_prescription_service(db)
         
-        # Check access permissions
-        prescription = service.get_prescription_by_id(prescription_id)
-        if not prescription:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
-        
-        if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        
-        updated_prescription = service.update_prescription(prescription_id, prescription_data, current_user.id)
+        caller_doctor_id = _caller_doctor_id(current_user, current_doctor_id)
+        updated_prescription = service.update_prescription(
+            prescription_id, prescription_data, current_user.id, caller_doctor_id
+        )
         return PrescriptionResponse.model_validate(updated_prescription)
     except PrescriptionNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
@@ -276,12 +352,13 @@ async def update_prescription(
 
 
 @router.put("/{prescription_id}/status", response_model=PrescriptionResponse)
-async def update_prescription_status(
+def update_prescription_status(
     prescription_id: UUID = Path(..., description="Prescription ID"),
-    status: str = Body(..., description="New status"),
+    new_status: str = Body(..., alias="status", description="New status"),
     notes: Optional[str] = Body(None, description="Status change notes"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Update prescription status
@@ -300,18 +377,10 @@ async def update_prescription_status(
     try:
         service = get_prescription_service(db)
         
-        # Check access permissions
-        prescription = service.get_prescription_by_id(prescription_id)
-        if not prescription:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
-        
-        if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        
-        updated_prescription = service.update_prescription_status(prescription_id, status, current_user.id, notes)
+        caller_doctor_id = _caller_doctor_id(current_user, current_doctor_id)
+        updated_prescription = service.update_prescription_status(
+            prescription_id, new_status, current_user.id, notes, caller_doctor_id
+        )
         return PrescriptionResponse.model_validate(updated_prescription)
     except PrescriptionNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
@@ -320,11 +389,12 @@ async def update_prescription_status(
 
 
 @router.post("/{prescription_id}/items", response_model=PrescriptionItemResponse, status_code=status.HTTP_201_CREATED)
-async def add_prescription_item(
+def add_prescription_item(
     prescription_id: UUID = Path(..., description="Prescription ID"),
     item_data: PrescriptionItemCreate = Body(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Add item to existing prescription
@@ -337,18 +407,8 @@ async def add_prescription_item(
     try:
         service = get_prescription_service(db)
         
-        # Check access permissions
-        prescription = service.get_prescription_by_id(prescription_id)
-        if not prescription:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
-        
-        if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        
-        item = service.add_prescription_item(prescription_id, item_data, current_user.id)
+        caller_doctor_id = _caller_doctor_id(current_user, current_doctor_id)
+        item = service.add_prescription_item(prescription_id, item_data, current_user.id, caller_doctor_id)
         return PrescriptionItemResponse.model_validate(item)
     except PrescriptionNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
@@ -359,11 +419,12 @@ async def add_prescription_item(
 
 
 @router.put("/items/{item_id}", response_model=PrescriptionItemResponse)
-async def update_prescription_item(
+def update_prescription_item(
     item_id: UUID = Path(..., description="Prescription item ID"),
     item_data: PrescriptionItemUpdate = Body(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Update prescription item
@@ -382,7 +443,6 @@ async def update_prescription_item(
         service = get_prescription_service(db)
 
         # Get the item first to check prescription ownership
-        from app.models.prescription import PrescriptionItem
         item = db.query(PrescriptionItem).filter(
             PrescriptionItem.id == item_id,
             PrescriptionItem.is_active == True
@@ -393,12 +453,9 @@ async def update_prescription_item(
 
         # Check doctor ownership for doctor role
         if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-
             # Get prescription to check ownership
             prescription = service.get_prescription_by_id(item.prescription_id)
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
+            if not current_doctor_id or prescription.doctor_id != current_doctor_id:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied: You can only update items in your own prescriptions")
 
         # Proceed with update
@@ -411,10 +468,11 @@ async def update_prescription_item(
 
 
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_prescription_item(
+def remove_prescription_item(
     item_id: UUID = Path(..., description="Prescription item ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Remove prescription item (soft delete)
@@ -431,7 +489,6 @@ async def remove_prescription_item(
         service = get_prescription_service(db)
 
         # Get the item first to check prescription ownership
-        from app.models.prescription import PrescriptionItem
         item = db.query(PrescriptionItem).filter(
             PrescriptionItem.id == item_id,
             PrescriptionItem.is_active == True
@@ -442,12 +499,9 @@ async def remove_prescription_item(
 
         # Check doctor ownership for doctor role
         if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-
             # Get prescription to check ownership
             prescription = service.get_prescription_by_id(item.prescription_id)
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
+            if not current_doctor_id or prescription.doctor_id != current_doctor_id:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied: You can only delete items in your own prescriptions")
 
         # Proceed with delete
@@ -458,8 +512,12 @@ async def remove_prescription_item(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/patient/{mobile_number}/{first_name}", response_model=List[PrescriptionResponse])
-async def get_patient_prescriptions(
+@router.get(
+    "/patient/{mobile_number}/{first_name}",
+    response_model=None,
+    responses={200: {"model": List[PrescriptionResponse]}}
+)
+def get_patient_prescriptions(
     mobile_number: str = Path(..., description="Patient mobile number"),
     first_name: str = Path(..., description="Patient first name"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of prescriptions"),
@@ -480,19 +538,27 @@ async def get_patient_prescriptions(
     - Medication history for new prescriptions
     """
     service = get_prescription_service(db)
-    prescriptions = service.get_patient_prescriptions(mobile_number, first_name, limit)
-    
-    return [PrescriptionResponse.model_validate(p) for p in prescriptions]
+    return StreamingResponse(
+        _stream_prescription_array(service.get_patient_prescriptions(
+            mobile_number, first_name, limit, yield_per=HISTORY_YIELD_PER
+        )),
+        media_type="application/json"
+    )
 
 
-@router.get("/doctor/{doctor_id}", response_model=List[PrescriptionResponse])
-async def get_doctor_prescriptions(
+@router.get(
+    "/doctor/{doctor_id}",
+    response_model=None,
+    responses={200: {"model": List[PrescriptionResponse]}}
+)
+def get_doctor_prescriptions(
     doctor_id: UUID = Path(..., description="Doctor ID"),
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
     limit: int = Query(100, ge=1, le=200, description="Maximum number of prescriptions"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Get prescriptions created by a doctor
@@ -507,19 +573,20 @@ async def get_doctor_prescriptions(
     """
     # Check access permissions
     if current_user.role == 'doctor':
-        from app.models.doctor import Doctor
-        doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-        if not doctor or str(doctor_id) != str(doctor.id):
+        if not current_doctor_id or doctor_id != current_doctor_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
     service = get_prescription_service(db)
-    prescriptions = service.get_doctor_prescriptions(doctor_id, start_date, end_date, limit)
-    
-    return [PrescriptionResponse.model_validate(p) for p in prescriptions]
+    return StreamingResponse(
+        _stream_prescription_array(service.get_doctor_prescriptions(
+            doctor_id, start_date, end_date, limit, yield_per=HISTORY_YIELD_PER
+        )),
+        media_type="application/json"
+    )
 
 
 @router.post("/{prescription_id}/print", response_model=PrescriptionResponse)
-async def print_prescription(
+def print_prescription(
     prescription_id: UUID = Path(..., description="Prescription ID"),
     print_request: PrescriptionPrintRequest = Body(...),
     db: Session = Depends(get_db),
@@ -550,7 +617,7 @@ async def print_prescription(
 
 
 @router.post("/validate", response_model=ValidationErrorResponse)
-async def validate_prescription(
+def validate_prescription(
     validation_request: PrescriptionValidationRequest = Body(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_staff)
@@ -577,7 +644,7 @@ async def validate_prescription(
 
 
 @router.post("/bulk", response_model=BulkOperationResponse)
-async def bulk_prescription_operations(
+def bulk_prescription_operations(
     bulk_request: BulkPrescriptionRequest = Body(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)  # Admin only for bulk operations
@@ -602,10 +669,11 @@ async def bulk_prescription_operations(
 
 
 @router.get("/statistics/overview", response_model=PrescriptionStatsResponse)
-async def get_prescription_statistics(
+def get_prescription_statistics(
     doctor_id: Optional[UUID] = Query(None, description="Filter by doctor (optional)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Get prescription statistics and analytics
@@ -622,11 +690,8 @@ async def get_prescription_statistics(
     - Admin/nurses see system-wide or filtered stats
     """
     # If user is doctor, force filter to their prescriptions
-    if current_user.role == 'doctor':
-        from app.models.doctor import Doctor
-        doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-        if doctor:
-            doctor_id = doctor.id
+    if current_user.role == 'doctor' and current_doctor_id:
+        doctor_id = current_doctor_id
     
     service = get_prescription_service(db)
     stats = service.get_prescription_statistics(doctor_id)
@@ -635,11 +700,12 @@ async def get_prescription_statistics(
 
 
 @router.delete("/{prescription_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def cancel_prescription(
+def cancel_prescription(
     prescription_id: UUID = Path(..., description="Prescription ID"),
     reason: Optional[str] = Body(None, description="Cancellation reason"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff)
+    current_user: User = Depends(require_staff),
+    current_doctor_id: Optional[UUID] = Depends(get_current_doctor_id)
 ):
     """
     Cancel prescription (soft delete)
@@ -656,18 +722,10 @@ async def cancel_prescription(
     try:
         service = get_prescription_service(db)
         
-        # Check access permissions
-        prescription = service.get_prescription_by_id(prescription_id)
-        if not prescription:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
-        
-        if current_user.role == 'doctor':
-            from app.models.doctor import Doctor
-            doctor = db.query(Doctor).filter(Doctor.user_id == current_user.id).first()
-            if not doctor or str(prescription.doctor_id) != str(doctor.id):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        
-        service.update_prescription_status(prescription_id, "cancelled", current_user.id, reason)
+        caller_doctor_id = _caller_doctor_id(current_user, current_doctor_id)
+        service.update_prescription_status(
+            prescription_id, "cancelled", current_user.id, reason, caller_doctor_id
+        )
     except PrescriptionNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prescription not found")
     except BusinessRuleError as e:
@@ -43,6 +43,17 @@ class Settings(BaseSettings):
         
         return f"postgresql://{user}:{password}@{host}:{port}/{database}"
     
+    # Connection pool (sized for concurrent sync endpoints; see DEPLOYMENT_GUIDE.md)
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 40
+    DATABASE_POOL_TIMEOUT: int = 10  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DATABASE_POOL_PRE_PING: bool = True
+    
+    # Worker threads for sync endpoints/dependencies (anyio default is 40).
+    # Kept at pool_size + max_overflow so threads do not queue on the pool.
+    THREADPOOL_MAX_WORKERS: int = 60
+    
     # Redis Configuration
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
@@ -83,6 +94,11 @@ class Settings(BaseSettings):
     ALLOWED_METHODS: List[str] = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     ALLOWED_HEADERS: List[str] = ["*"]
     
+    # Response compression (level 1 gives most of the size win on JSON lists
+    # at a fraction of the CPU cost of the default level 9)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 1
+    
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 100
@@ -171,10 +187,12 @@ settings = Settings()
 DATABASE_CONFIG = {
     "url": str(settings.DATABASE_URL),
     "echo": settings.DEBUG,
-    "pool_size": 20,
-    "max_overflow": 30,
-    "pool_timeout": 30,
-    "pool_recycle": 3600,
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    "query_cache_size": 1200,  # compiled SQL cache (lambda_stmt search queries)
 }
 
 # Redis configuration
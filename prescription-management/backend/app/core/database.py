@@ -7,7 +7,7 @@ from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from typing import Generator
+from typing import Generator, Optional
 import redis
 from contextlib import contextmanager
 
@@ -21,6 +21,8 @@ engine = create_engine(
     max_overflow=DATABASE_CONFIG["max_overflow"],
     pool_timeout=DATABASE_CONFIG["pool_timeout"],
     pool_recycle=DATABASE_CONFIG["pool_recycle"],
+    pool_pre_ping=DATABASE_CONFIG["pool_pre_ping"],
+    query_cache_size=DATABASE_CONFIG["query_cache_size"],
     poolclass=QueuePool,
 )
 
@@ -173,19 +175,30 @@ class CacheKeys:
     # Patient cache keys (using composite key pattern)
     PATIENT_BY_COMPOSITE = "patient:mobile:{mobile}:name:{first_name}"
     PATIENT_FAMILY = "patient:family:{mobile_number}"
+    PATIENT_FAMILY_ELIGIBILITY = "patient:family:{mobile_number}:eligibility"
     PATIENT_HISTORY = "patient:history:{mobile}:{first_name}"
+    PATIENT_STATISTICS = "patient:statistics"
     
     # Medicine cache keys
     MEDICINE_SEARCH = "medicine:search:{query}"
     MEDICINE_BY_ID = "medicine:id:{medicine_id}"
+    MEDICINE_BULK_JOB = "medicine:bulk_job:{job_id}"
     SHORT_KEYS = "short_keys:doctor:{doctor_id}"
+    # Popular/statistics keys carry the current generation; bumping it on a
+    # write orphans every user's entries without scanning for them
+    SHORT_KEY_CACHE_GENERATION = "short_keys:generation"
+    SHORT_KEYS_POPULAR = "short_keys:popular:{generation}:{user_id}:{limit}"
+    SHORT_KEY_STATISTICS = "short_keys:statistics:{generation}:{user_id}"
+    SHORT_KEY_BY_CODE = "short_keys:code:{code}"
     
     # Prescription cache keys
     PRESCRIPTION_BY_ID = "prescription:{prescription_id}"
     PRESCRIPTIONS_BY_PATIENT = "prescriptions:patient:{mobile}:{first_name}"
+    PRESCRIPTION_STATISTICS = "prescription:statistics:{doctor_id}"
     
     # Doctor cache keys
     DOCTOR_BY_ID = "doctor:{doctor_id}"
+    DOCTOR_ID_BY_USER = "doctor:user:{user_id}"
     DOCTOR_SCHEDULE = "doctor:schedule:{doctor_id}:{date}"
     
     # Appointment cache keys
@@ -220,13 +233,20 @@ class CacheManager:
         except Exception:
             return False
     
-    def delete(self, key: str) -> bool:
-        """Delete key from cache"""
+    def delete(self, *keys: str) -> bool:
+        """Delete one or more keys from cache"""
         try:
-            return self.redis.delete(key)
+            return self.redis.delete(*keys)
         except Exception:
             return False
     
+    def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer counter"""
+        try:
+            return self.redis.incr(key)
+        except Exception:
+            return None
+    
     def delete_pattern(self, pattern: str) -> int:
         """Delete keys matching pattern"""
         try:
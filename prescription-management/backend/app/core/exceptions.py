@@ -20,6 +20,11 @@ class ValidationError(PrescriptionManagementError):
     pass
 
 
+class InvalidInputError(ValidationError):
+    """Raised when request input is invalid; answered with 400 rather than 422"""
+    pass
+
+
 class BusinessRuleError(PrescriptionManagementError):
     """Raised when business rule validation fails"""
     pass
@@ -7,10 +7,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import anyio.to_thread
 import time
 import logging
 
 from app.core.config import settings
+from app.core.exceptions import (
+    PrescriptionManagementError,
+    NotFoundError,
+    DuplicateError,
+    ConflictError,
+    ValidationError,
+    InvalidInputError,
+    BusinessRuleError,
+    AuthenticationError,
+    AuthorizationError
+)
 from app.core.database import init_db, check_db_connection, check_redis_connection
 from app.api.v1 import api_router
 
@@ -32,6 +44,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Prescription Management System...")
     
+    # Size the threadpool that runs sync endpoints and blocking DB calls
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_MAX_WORKERS
+    
     # Initialize database
     try:
         init_db()
@@ -84,7 +99,11 @@ app.add_middleware(
 )
 
 # Compression middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
 
 
 # Request/Response middleware for logging and audit
@@ -123,6 +142,38 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# HTTP status for domain errors that endpoints let propagate.
+# Looked up along the exception's MRO, so subclasses (e.g. PatientNotFoundError,
+# FamilyLimitExceededError) inherit their base class mapping.
+DOMAIN_ERROR_STATUS_CODES = {
+    NotFoundError: 404,
+    DuplicateError: 409,
+    ConflictError: 409,
+    InvalidInputError: 400,
+    ValidationError: 422,
+    BusinessRuleError: 422,
+    AuthenticationError: 401,
+    AuthorizationError: 403,
+}
+
+@app.exception_handler(PrescriptionManagementError)
+async def domain_exception_handler(request: Request, exc: PrescriptionManagementError):
+    """
+    Translate service-layer exceptions into HTTP error responses
+    """
+    status_code = next(
+        (DOMAIN_ERROR_STATUS_CODES[cls] for cls in type(exc).__mro__ if cls in DOMAIN_ERROR_STATUS_CODES),
+        500
+    )
+    
+    if status_code == 500:
+        logger.error("Unmapped domain error on %s %s: %s", request.method, request.url.path, exc.message)
+    else:
+        logger.warning("%s on %s %s: %s", type(exc).__name__, request.method, request.url.path, exc.message)
+    
+    return JSONResponse(status_code=status_code, content={"detail": exc.message})
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
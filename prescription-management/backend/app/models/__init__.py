@@ -20,6 +20,8 @@ from app.models.patient import (
     get_family_members,
     check_family_limit,
     find_primary_family_member,
+    patient_exists,
+    has_primary_family_member,
     validate_family_registration
 )
 
@@ -84,6 +86,8 @@ __all__ = [
     "get_family_members",
     "check_family_limit",
     "find_primary_family_member",
+    "patient_exists",
+    "has_primary_family_member",
     "validate_family_registration",
     "search_medicines",
     "find_medicine_by_name", 
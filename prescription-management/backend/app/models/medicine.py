@@ -3,7 +3,7 @@ Medicine model following ERD specifications
 Supports medicine catalog and drug interaction checking
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Numeric, Index, ARRAY, or_
+from sqlalchemy import Column, String, Text, Boolean, Numeric, Index, ARRAY, or_, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, validates
 from typing import Dict, Any, List
@@ -125,7 +125,12 @@ class Medicine(BaseModel):
         Index('idx_medicines_generic_name', 'generic_name'),
         Index('idx_medicines_category', 'drug_category'),
         Index('idx_medicines_manufacturer', 'manufacturer'),
-        Index('idx_medicines_active', 'is_active'),
+        # Partial indexes for the default is_active = true read path. Most rows
+        # are active, so a plain is_active index is unselective; these stay small
+        # and hot. Inactive lookups (reactivate) go through the primary key.
+        Index('idx_medicines_active_name', 'name', postgresql_where=text('is_active = true')),
+        Index('idx_medicines_active_category', 'drug_category', postgresql_where=text('is_active = true')),
+        Index('idx_medicines_active_manufacturer', 'manufacturer', postgresql_where=text('is_active = true')),
         Index('idx_medicines_prescription_required', 'requires_prescription'),
         Index('idx_medicines_atc_code', 'atc_code'),
         # Full-text search index (commented out for basic setup)
@@ -4,7 +4,7 @@ Primary Key: (mobile_number, first_name)
 Supports family registration with same mobile number
 """
 
-from sqlalchemy import Column, String, Date, Text, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, Date, Text, Boolean, ForeignKey, Index, text, exists
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.orm import relationship, validates
 from datetime import date
@@ -14,6 +14,7 @@ import re
 
 from app.models.base import Base, TimestampMixin, CompositeKeyMixin, AuditMixin
 from app.core.config import settings
+from app.utils.mobile_validators import normalize_mobile, MOBILE_NUMBER_PATTERN
 
 
 # Enums for patient data (as per ERD)
@@ -139,14 +140,20 @@ class Patient(Base, TimestampMixin, CompositeKeyMixin, AuditMixin):
     # )
     
     # Indexes for performance (as per ERD indexing strategy)
+    # Composite-key lookups (mobile_number, first_name) and mobile_number-only
+    # family lookups are served by the primary key B-tree, and id lookups by
+    # its unique constraint, so no separate indexes are declared for them.
     __table_args__ = (
-        Index('idx_patients_mobile_number', 'mobile_number'),
-        Index('idx_patients_id', 'id'),
         Index('idx_patients_primary_contact', 'primary_contact_mobile'),
         Index('idx_patients_family', 'mobile_number', 'relationship_to_primary'),
-        Index('idx_patients_active', 'is_active'),
+        # The patient list defaults to is_active = true and sorts by
+        # (first_name, id) for keyset cursors; a partial index on exactly that
+        # stays dense, unlike a two-valued is_active B-tree.
+        Index('idx_patients_active_name', 'first_name', 'id', postgresql_where=text('is_active = true')),
         Index('idx_patients_name_search', 'first_name', 'last_name'),
-        Index('idx_patients_email', 'email'),
+        # Emails are stored lower-cased (validate_email), so a plain B-tree
+        # serves case-insensitive lookups; most patients have none, so skip NULLs
+        Index('idx_patients_email', 'email', postgresql_where=text('email IS NOT NULL')),
     )
     
     @classmethod
@@ -161,11 +168,11 @@ class Patient(Base, TimestampMixin, CompositeKeyMixin, AuditMixin):
             raise ValueError("Mobile number is required")
         
         # Clean mobile number (remove spaces, dashes, etc.)
-        cleaned = re.sub(r'[^\d+]', '', mobile_number)
+        cleaned = normalize_mobile(mobile_number)
         
         # Validate Indian mobile format (as per ERD business rules)
         if not settings.ALLOW_INTERNATIONAL_MOBILE:
-            if not re.match(settings.MOBILE_NUMBER_REGEX, cleaned):
+            if not MOBILE_NUMBER_PATTERN.match(cleaned):
                 raise ValueError("Invalid mobile number format. Must be 10 digits starting with 6-9")
         
         return cleaned
@@ -310,26 +317,45 @@ def find_primary_family_member(db, mobile_number: str) -> Patient:
     ).first()
 
 
+def patient_exists(db, mobile_number: str, first_name: str) -> bool:
+    """
+    Check if an active patient exists for the composite key
+    Uses EXISTS, so no row is fetched or hydrated
+    """
+    return db.query(exists().where(
+        Patient.mobile_number == mobile_number,
+        Patient.first_name == first_name,
+        Patient.is_active == True
+    )).scalar()
+
+
+def has_primary_family_member(db, mobile_number: str) -> bool:
+    """
+    Check if the family has an active primary member (relationship = 'self')
+    """
+    return db.query(exists().where(
+        Patient.mobile_number == mobile_number,
+        Patient.relationship_to_primary == 'self',
+        Patient.is_active == True
+    )).scalar()
+
+
 def validate_family_registration(
     db, 
     mobile_number: str, 
     first_name: str, 
-    relationship: str
+    relationship: str,
+    primary_exists: bool = False
 ) -> Dict[str, Any]:
     """
     Validate family registration constraints
     Returns validation result with any errors
+    primary_exists=True (caller already checked) skips the primary lookup
     """
     errors = []
     
     # Check if patient already exists
-    existing = db.query(Patient).filter(
-        Patient.mobile_number == mobile_number,
-        Patient.first_name == first_name,
-        Patient.is_active == True
-    ).first()
-    
-    if existing:
+    if patient_exists(db, mobile_number, first_name):
         errors.append("Patient with this mobile number and name already exists")
     
     # Check family size limit
@@ -338,8 +364,7 @@ def validate_family_registration(
     
     # If not primary member, check if primary exists
     if relationship != 'self':
-        primary = find_primary_family_member(db, mobile_number)
-        if not primary:
+        if not (primary_exists or has_primary_family_member(db, mobile_number)):
             errors.append("Primary family member (self) must be registered first")
     
     return {
@@ -3,14 +3,15 @@ Prescription models following ERD specifications
 Supports composite key patient references and prescription items
 """
 
-from sqlalchemy import Column, String, Text, Date, Boolean, Integer, Numeric, ForeignKey, Index, DateTime
+from sqlalchemy import Column, String, Text, Date, Boolean, Integer, Numeric, ForeignKey, Index, DateTime, text
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship, validates
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, List
 import uuid
 
 from app.models.base import BaseModel
+from app.core.config import settings
 
 
 # Prescription status enum as per ERD
@@ -138,6 +139,13 @@ class Prescription(BaseModel):
         comment="Template used for printing"
     )
     
+    # Updates and status changes are attributed to the user who made them
+    updated_by = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="User who last updated this prescription"
+    )
+    
     # Relationships (as per ERD)
     patient = relationship(
         "Patient",
@@ -192,6 +200,24 @@ class Prescription(BaseModel):
         Index('idx_prescriptions_status', 'status'),
         Index('idx_prescriptions_number', 'prescription_number'),
         Index('idx_prescriptions_patient_uuid', 'patient_uuid'),
+        # Newest-first history lookups: filter column(s) then visit_date DESC, id DESC
+        # so Postgres reads the first rows in index order with no sort step
+        Index(
+            'idx_prescriptions_doctor_visit',
+            'doctor_id', text('visit_date DESC'), text('id DESC')
+        ),
+        Index(
+            'idx_prescriptions_patient_visit',
+            'patient_mobile_number', 'patient_first_name',
+            text('visit_date DESC'), text('id DESC')
+        ),
+        # Diagnosis search matches words, so it can probe a GIN index instead
+        # of an ILIKE '%...%' sequential scan; expression must match search_prescriptions
+        Index(
+            'idx_prescriptions_diagnosis_fts',
+            text("to_tsvector('english', diagnosis)"),
+            postgresql_using='gin'
+        ),
     )
     
     @validates('prescription_number')
@@ -304,9 +330,6 @@ class Prescription(BaseModel):
             return True
         
         # Check if prescription is older than validity period
-        from datetime import timedelta
-        from app.core.config import settings
-        
         validity_days = getattr(settings, 'PRESCRIPTION_VALIDITY_DAYS', 30)
         expiry_date = self.visit_date + timedelta(days=validity_days)
         
@@ -3,11 +3,12 @@ ShortKey models following ERD specifications
 Enables quick prescription creation with predefined medicine groups
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Index, or_
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Index, or_, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, validates
 from typing import Dict, Any, List
 import uuid
+import re
 
 from app.models.base import BaseModel
 
@@ -86,6 +87,9 @@ class ShortKey(BaseModel):
         Index('idx_short_keys_created_by', 'created_by'),
         Index('idx_short_keys_global', 'is_global'),
         Index('idx_short_keys_active', 'is_active'),
+        # Listing shapes: a user's own keys by code, and global keys by popularity
+        Index('idx_short_keys_creator_active_code', 'created_by', 'is_active', 'code'),
+        Index('idx_short_keys_global_active_usage', 'is_global', 'is_active', text('usage_count DESC')),
     )
     
     @validates('code')
@@ -97,7 +101,6 @@ class ShortKey(BaseModel):
         code = code.strip().upper()
         
         # Validate format: alphanumeric, 2-20 characters
-        import re
         if not re.match(r'^[A-Z0-9]{2,20}$', code):
             raise ValueError("Code must be 2-20 alphanumeric characters")
         
@@ -8,6 +8,7 @@ from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship, validates
 from typing import List, Dict, Any
 import uuid
+import re
 
 from app.models.base import BaseModel
 from app.core.config import settings
@@ -109,7 +110,6 @@ class User(BaseModel):
             raise ValueError("Email is required")
         
         email = email.strip().lower()
-        import re
         if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
             raise ValueError("Invalid email format")
         
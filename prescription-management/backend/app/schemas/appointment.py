@@ -7,7 +7,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, validator, model_validator, computed_field
 from typing import Optional, Dict, Any, List, Literal
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from uuid import UUID
 import re
 
@@ -208,7 +208,6 @@ class AppointmentResponse(BaseModel):
     @property
     def end_datetime(self) -> datetime:
         """Get appointment end datetime"""
-        from datetime import timedelta
         return self.appointment_datetime + timedelta(minutes=self.duration_minutes)
     
     @computed_field
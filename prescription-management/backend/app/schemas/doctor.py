@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
+import re
 
 
 class OfficeLocation(BaseModel):
@@ -82,7 +83,6 @@ class DoctorCreate(DoctorBase):
                     raise ValueError(f'Time values must be strings')
                 
                 # Simple time format check (HH:MM)
-                import re
                 time_pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
                 if not re.match(time_pattern, start_time) or not re.match(time_pattern, end_time):
                     raise ValueError(f'Time format must be HH:MM (24-hour format)')
@@ -289,7 +289,6 @@ class DoctorScheduleUpdate(BaseModel):
                     raise ValueError(f'Time values must be strings')
                 
                 # Simple time format check (HH:MM)
-                import re
                 time_pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
                 if not re.match(time_pattern, start_time) or not re.match(time_pattern, end_time):
                     raise ValueError(f'Time format must be HH:MM (24-hour format)')
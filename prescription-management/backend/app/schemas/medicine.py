@@ -315,7 +315,7 @@ class MedicineStatistics(BaseModel):
 
 class MedicineBulkOperation(BaseModel):
     """Schema for bulk medicine operations"""
-    medicine_ids: List[UUID] = Field(..., min_items=1, max_items=100, description="Medicine IDs")
+    medicine_ids: List[UUID] = Field(..., min_items=1, max_items=5000, description="Medicine IDs")
     operation: Literal["activate", "deactivate", "delete"] = Field(..., description="Bulk operation type")
     
     @validator('medicine_ids')
@@ -336,6 +336,14 @@ class MedicineBulkResponse(BaseModel):
     processed_ids: List[UUID] = Field(default=[])
 
 
+class MedicineBulkJob(BaseModel):
+    """Schema for a bulk operation queued as a background job"""
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    result: Optional[MedicineBulkResponse] = None
+    error: Optional[str] = None
+
+
 class MedicineImport(BaseModel):
     """Schema for medicine import from external sources"""
     source: Literal["csv", "api", "manual"] = Field(..., description="Import source")
@@ -18,6 +18,7 @@ from app.utils.date_validators import (
     parse_date_string,
     DateValidationError
 )
+from app.utils.mobile_validators import normalize_mobile, MOBILE_NUMBER_PATTERN, CONTACT_PHONE_PATTERN
 
 
 # Enums for patient data
@@ -34,8 +35,8 @@ class EmergencyContact(BaseModel):
     @validator('phone')
     def validate_phone(cls, v):
         """Validate emergency contact phone format"""
-        cleaned = re.sub(r'[^\d+]', '', v)
-        if not re.match(r'^\+?[6-9]\d{9}$', cleaned):
+        cleaned = normalize_mobile(v)
+        if not CONTACT_PHONE_PATTERN.match(cleaned):
             raise ValueError("Invalid phone number format")
         return cleaned
 
@@ -100,8 +101,8 @@ class PatientBase(BaseModel):
     def validate_primary_contact_mobile(cls, v):
         """Validate primary contact mobile format"""
         if v:
-            cleaned = re.sub(r'[^\d+]', '', v)
-            if not re.match(r'^\+?[6-9]\d{9}$', cleaned):
+            cleaned = normalize_mobile(v)
+            if not CONTACT_PHONE_PATTERN.match(cleaned):
                 raise ValueError("Invalid primary contact mobile format")
             return cleaned
         return v
@@ -139,11 +140,11 @@ class PatientCreate(PatientBase):
             raise ValueError("Mobile number is required")
         
         # Clean mobile number
-        cleaned = re.sub(r'[^\d+]', '', v)
+        cleaned = normalize_mobile(v)
         
         # Validate Indian mobile format
         if not settings.ALLOW_INTERNATIONAL_MOBILE:
-            if not re.match(settings.MOBILE_NUMBER_REGEX, cleaned):
+            if not MOBILE_NUMBER_PATTERN.match(cleaned):
                 raise ValueError("Invalid mobile number format. Must be 10 digits starting with 6-9")
         
         return cleaned
@@ -202,6 +203,24 @@ class PatientCreateFamily(PatientBase):
     }
 
 
+class PatientFamilyBulkCreate(BaseModel):
+    """Schema for registering several family members in one request"""
+    members: List[PatientCreateFamily] = Field(
+        ...,
+        min_items=1,
+        max_items=settings.MAX_FAMILY_MEMBERS_PER_MOBILE,
+        description="Family members to register"
+    )
+    
+    @validator('members')
+    def validate_unique_first_names(cls, v):
+        """Ensure first names are unique within the batch (composite key)"""
+        names = [member.first_name for member in v]
+        if len(names) != len(set(names)):
+            raise ValueError("Family member first names must be unique")
+        return v
+
+
 class PatientUpdate(BaseModel):
     """Schema for updating patient information"""
     last_name: Optional[str] = Field(None, min_length=2, max_length=100)
@@ -251,8 +270,8 @@ class CompositeKey(BaseModel):
     @validator('mobile_number')
     def validate_mobile_number(cls, v):
         """Validate mobile number format"""
-        cleaned = re.sub(r'[^\d+]', '', v)
-        if not re.match(r'^\+?[6-9]\d{9}$', cleaned):
+        cleaned = normalize_mobile(v)
+        if not CONTACT_PHONE_PATTERN.match(cleaned):
             raise ValueError("Invalid mobile number format")
         return cleaned
 
@@ -305,8 +324,7 @@ class PatientResponse(BaseModel):
     @property
     def age(self) -> int:
         """Calculate patient's age"""
-        from datetime import date as date_module
-        today = date_module.today()
+        today = date.today()
         return today.year - self.date_of_birth.year - (
             (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
         )
@@ -358,6 +376,7 @@ class PatientSearchParams(BaseModel):
     # Pagination
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Page size")
+    cursor: Optional[str] = Field(None, description="Keyset cursor (next_cursor of the previous page); overrides page")
     
     # Sorting
     sort_by: Optional[str] = Field("first_name", description="Sort field")
@@ -381,6 +400,7 @@ class PatientListResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (first_name sort only)")
 
     model_config = {
         "json_encoders": {
@@ -406,8 +426,8 @@ class FamilyValidationRequest(BaseModel):
     @validator('mobile_number')
     def validate_mobile_number(cls, v):
         """Validate mobile number format"""
-        cleaned = re.sub(r'[^\d+]', '', v)
-        if not re.match(r'^\+?[6-9]\d{9}$', cleaned):
+        cleaned = normalize_mobile(v)
+        if not CONTACT_PHONE_PATTERN.match(cleaned):
             raise ValueError("Invalid mobile number format")
         return cleaned
 
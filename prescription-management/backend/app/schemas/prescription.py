@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, validator, model_validator, computed_field
 from typing import Optional, Dict, Any, List, Literal
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 from uuid import UUID
 from decimal import Decimal
 import re
@@ -372,7 +372,6 @@ class PrescriptionResponse(BaseModel):
             return True
         
         # Check if prescription is older than validity period
-        from datetime import timedelta
         validity_days = getattr(settings, 'PRESCRIPTION_VALIDITY_DAYS', 30)
         expiry_date = self.visit_date + timedelta(days=validity_days)
         
@@ -382,7 +381,6 @@ class PrescriptionResponse(BaseModel):
     @property
     def days_until_expiry(self) -> int:
         """Get days until prescription expires"""
-        from datetime import timedelta
         validity_days = getattr(settings, 'PRESCRIPTION_VALIDITY_DAYS', 30)
         expiry_date = self.visit_date + timedelta(days=validity_days)
         
@@ -409,6 +407,7 @@ class PrescriptionListResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (visit_date sort only)")
 
     model_config = {
         "json_encoders": {
@@ -451,6 +450,7 @@ class PrescriptionSearchParams(BaseModel):
     # Pagination
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Page size")
+    cursor: Optional[str] = Field(None, description="Keyset cursor (next_cursor of the previous page); overrides page")
     
     # Sorting
     sort_by: Optional[str] = Field("visit_date", description="Sort field")
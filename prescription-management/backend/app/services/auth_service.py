@@ -5,6 +5,9 @@ Handles JWT tokens, password verification, and role-based permissions
 
 import jwt
 import bcrypt
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from uuid import UUID
@@ -18,6 +21,53 @@ from app.schemas.user import UserResponse
 from app.services.user_service import UserService
 
 
+# Permissions granted to each role. Built once at import rather than on
+# every permission check; check_permission uses the frozenset view.
+ROLE_PERMISSIONS: Dict[str, List[str]] = {
+    "super_admin": [
+        "admin:all", "read:all", "write:all", "delete:all"
+    ],
+    "admin": [
+        "read:users", "write:users", "read:doctors", "write:doctors",
+        "read:patients", "write:patients", "read:appointments", "write:appointments",
+        "read:prescriptions", "write:prescriptions", "read:medicines", "write:medicines",
+        "read:reports", "admin:system"
+    ],
+    "doctor": [
+        "read:patients", "write:patients", "read:appointments", "write:appointments",
+        "read:prescriptions", "write:prescriptions", "read:medicines",
+        "read:short_keys", "write:short_keys", "read:medical_history",
+        "write:medical_history", "read:own_profile", "write:own_profile"
+    ],
+    "nurse": [
+        "read:patients", "read:appointments", "write:appointments",
+        "read:prescriptions", "read:medicines", "read:medical_history"
+    ],
+    "receptionist": [
+        "read:patients", "write:patients", "read:appointments", "write:appointments",
+        "read:doctors", "read:medicines"
+    ],
+    "patient": [
+        "read:own_data", "read:family_data", "write:own_appointments",
+        "read:own_prescriptions", "read:own_medical_history"
+    ]
+}
+
+_ROLE_PERMISSION_SETS: Dict[str, frozenset] = {
+    role: frozenset(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+# Verified token claims, keyed by a SHA-256 digest of the token (raw tokens are
+# never stored). Every authenticated request decodes the bearer token, so a
+# short TTL lets bursts of requests skip signature verification. Entries never
+# outlive the token's own exp.
+TOKEN_CACHE_TTL = 5
+TOKEN_CACHE_MAX_SIZE = 10000
+
+_token_cache: Dict[bytes, tuple] = {}
+_token_cache_lock = threading.Lock()
+
+
 class AuthService:
     """Authentication service with JWT and role management"""
     
@@ -77,13 +127,31 @@ class AuthService:
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify JWT token and return payload"""
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        now = time.time()
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        if cached and cached[0] > now:
+            return dict(cached[1])
+
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except (jwt.PyJWTError, jwt.InvalidTokenError):
             return None
+
+        expires_at = now + TOKEN_CACHE_TTL
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        with _token_cache_lock:
+            if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                for stale in [k for k, v in _token_cache.items() if v[0] <= now]:
+                    del _token_cache[stale]
+                if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                    _token_cache.clear()
+            _token_cache[key] = (expires_at, payload)
+        return dict(payload)
     
     def refresh_access_token(self, refresh_token: str, db: Session) -> Optional[TokenResponse]:
         """Create new access token from refresh token"""
@@ -109,41 +177,11 @@ class AuthService:
     # Role-Based Permissions
     def get_role_permissions(self, role: str) -> List[str]:
         """Get permissions for a specific role"""
-        role_permissions = {
-            "super_admin": [
-                "admin:all", "read:all", "write:all", "delete:all"
-            ],
-            "admin": [
-                "read:users", "write:users", "read:doctors", "write:doctors",
-                "read:patients", "write:patients", "read:appointments", "write:appointments",
-                "read:prescriptions", "write:prescriptions", "read:medicines", "write:medicines",
-                "read:reports", "admin:system"
-            ],
-            "doctor": [
-                "read:patients", "write:patients", "read:appointments", "write:appointments",
-                "read:prescriptions", "write:prescriptions", "read:medicines",
-                "read:short_keys", "write:short_keys", "read:medical_history",
-                "write:medical_history", "read:own_profile", "write:own_profile"
-            ],
-            "nurse": [
-                "read:patients", "read:appointments", "write:appointments",
-                "read:prescriptions", "read:medicines", "read:medical_history"
-            ],
-            "receptionist": [
-                "read:patients", "write:patients", "read:appointments", "write:appointments",
-                "read:doctors", "read:medicines"
-            ],
-            "patient": [
-                "read:own_data", "read:family_data", "write:own_appointments",
-                "read:own_prescriptions", "read:own_medical_history"
-            ]
-        }
-        
-        return role_permissions.get(role, [])
+        return list(ROLE_PERMISSIONS.get(role, ()))
     
     def check_permission(self, user_role: str, required_permission: str) -> bool:
         """Check if user role has required permission"""
-        user_permissions = self.get_role_permissions(user_role)
+        user_permissions = _ROLE_PERMISSION_SETS.get(user_role, frozenset())
         
         # Super admin has all permissions
         if "admin:all" in user_permissions:
@@ -25,7 +25,7 @@ from app.schemas.dental import (
     BulkDentalProcedureCreate
 )
 from app.core.exceptions import (
-    ValidationError, BusinessRuleError, ConflictError
+    InvalidInputError, BusinessRuleError, ConflictError
 )
 
 
@@ -50,25 +50,25 @@ class DentalService:
             observation_data.patient_first_name
         )
         if not patient:
-            raise ValidationError("Patient not found")
+            raise InvalidInputError("Patient not found")
 
         # Validate tooth number using FDI notation
         if not is_valid_tooth_number(observation_data.tooth_number):
-            raise ValidationError(
+            raise InvalidInputError(
                 f"Invalid tooth number '{observation_data.tooth_number}'. "
                 "Must be valid FDI notation (Permanent: 11-48, Primary: 51-85)"
             )
 
         # Validate tooth surface if provided
         if observation_data.tooth_surface and observation_data.tooth_surface not in TOOTH_SURFACES:
-            raise ValidationError(
+            raise InvalidInputError(
                 f"Invalid tooth surface '{observation_data.tooth_surface}'. "
                 f"Must be one of: {', '.join(TOOTH_SURFACES)}"
             )
 
         # Validate condition type
         if observation_data.condition_type not in DENTAL_CONDITION_TYPES:
-            raise ValidationError(
+            raise InvalidInputError(
                 f"Invalid condition type '{observation_data.condition_type}'. "
                 f"Must be one of: {', '.join(DENTAL_CONDITION_TYPES)}"
             )
@@ -77,23 +77,23 @@ class DentalService:
         if observation_data.prescription_id:
             prescription = self._get_prescription_by_id(observation_data.prescription_id)
             if not prescription:
-                raise ValidationError("Prescription not found")
+                raise InvalidInputError("Prescription not found")
 
             # Validate prescription belongs to patient
             if (prescription.patient_mobile_number != observation_data.patient_mobile_number or
                 prescription.patient_first_name != observation_data.patient_first_name):
-                raise ValidationError("Prescription does not match patient")
+                raise InvalidInputError("Prescription does not match patient")
 
         # Validate appointment if provided
         if observation_data.appointment_id:
             appointment = self._get_appointment_by_id(observation_data.appointment_id)
             if not appointment:
-                raise ValidationError("Appointment not found")
+                raise InvalidInputError("Appointment not found")
 
             # Validate appointment belongs to patient
             if (appointment.patient_mobile_number != observation_data.patient_mobile_number or
                 appointment.patient_first_name != observation_data.patient_first_name):
-                raise ValidationError("Appointment does not match patient")
+                raise InvalidInputError("Appointment does not match patient")
 
         # Create observation
         observation = DentalObservation(
@@ -134,18 +134,18 @@ class DentalService:
         """Update dental observation"""
         observation = self.get_observation_by_id(observation_id)
         if not observation:
-            raise ValidationError("Dental observation not found")
+            raise InvalidInputError("Dental observation not found")
 
         # Update fields
         update_dict = update_data.dict(exclude_unset=True)
         for field, value in update_dict.items():
             # Validate tooth surface if being updated
             if field == 'tooth_surface' and value and value not in TOOTH_SURFACES:
-                raise ValidationError(f"Invalid tooth surface: {value}")
+                raise InvalidInputError(f"Invalid tooth surface: {value}")
 
             # Validate condition type if being updated
             if field == 'condition_type' and value and value not in DENTAL_CONDITION_TYPES:
-                raise ValidationError(f"Invalid condition type: {value}")
+                raise InvalidInputError(f"Invalid condition type: {value}")
 
             setattr(observation, field, value)
 
@@ -212,7 +212,7 @@ class DentalService:
     ) -> List[DentalObservation]:
         """Get complete history for a specific tooth"""
         if not is_valid_tooth_number(tooth_number):
-            raise ValidationError(f"Invalid tooth number: {tooth_number}")
+            raise InvalidInputError(f"Invalid tooth number: {tooth_number}")
 
         return self.db.query(DentalObservation).filter(
             DentalObservation.patient_mobile_number == mobile_number,
@@ -235,7 +235,7 @@ class DentalService:
             except Exception as e:
                 # Rollback and re-raise
                 self.db.rollback()
-                raise ValidationError(f"Failed to create observation: {str(e)}")
+                raise InvalidInputError(f"Failed to create observation: {str(e)}")
 
         return observations
 
@@ -252,26 +252,26 @@ class DentalService:
         if procedure_data.observation_id:
             observation = self.get_observation_by_id(procedure_data.observation_id)
             if not observation:
-                raise ValidationError("Observation not found")
+                raise InvalidInputError("Observation not found")
 
         # Validate prescription if provided
         if procedure_data.prescription_id:
             prescription = self._get_prescription_by_id(procedure_data.prescription_id)
             if not prescription:
-                raise ValidationError("Prescription not found")
+                raise InvalidInputError("Prescription not found")
 
         # Validate appointment if provided
         if procedure_data.appointment_id:
             appointment = self._get_appointment_by_id(procedure_data.appointment_id)
             if not appointment:
-                raise ValidationError("Appointment not found")
+                raise InvalidInputError("Appointment not found")
 
         # Validate tooth numbers if provided
         if procedure_data.tooth_numbers:
             tooth_list = [t.strip() for t in procedure_data.tooth_numbers.split(',')]
             for tooth in tooth_list:
                 if tooth and not is_valid_tooth_number(tooth):
-                    raise ValidationError(f"Invalid tooth number in list: {tooth}")
+                    raise InvalidInputError(f"Invalid tooth number in list: {tooth}")
 
         # Create procedure
         procedure = DentalProcedure(
@@ -315,7 +315,7 @@ class DentalService:
         """Update dental procedure"""
         procedure = self.get_procedure_by_id(procedure_id)
         if not procedure:
-            raise ValidationError("Dental procedure not found")
+            raise InvalidInputError("Dental procedure not found")
 
         # Update fields
         update_dict = update_data.dict(exclude_unset=True)
@@ -325,7 +325,7 @@ class DentalService:
                 tooth_list = [t.strip() for t in value.split(',')]
                 for tooth in tooth_list:
                     if tooth and not is_valid_tooth_number(tooth):
-                        raise ValidationError(f"Invalid tooth number in list: {tooth}")
+                        raise InvalidInputError(f"Invalid tooth number in list: {tooth}")
 
             setattr(procedure, field, value)
 
@@ -404,12 +404,12 @@ class DentalService:
         """Update procedure status"""
         procedure = self.get_procedure_by_id(procedure_id)
         if not procedure:
-            raise ValidationError("Procedure not found")
+            raise InvalidInputError("Procedure not found")
 
         # Validate status
         valid_statuses = ['planned', 'in_progress', 'completed', 'cancelled']
         if status not in valid_statuses:
-            raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+            raise InvalidInputError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
 
         # Validate status transitions
         valid_transitions = {
@@ -457,7 +457,7 @@ class DentalService:
             except Exception as e:
                 # Rollback and re-raise
                 self.db.rollback()
-                raise ValidationError(f"Failed to create procedure: {str(e)}")
+                raise InvalidInputError(f"Failed to create procedure: {str(e)}")
 
         return procedures
 
@@ -473,7 +473,7 @@ class DentalService:
         # Validate patient exists
         patient = self._get_patient_by_composite_key(mobile_number, first_name)
         if not patient:
-            raise ValidationError("Patient not found")
+            raise InvalidInputError("Patient not found")
 
         # Get all observations
         observations = self.get_patient_observations(mobile_number, first_name)
@@ -4,7 +4,7 @@ Handles business logic for doctor management
 Following ERD specifications and business requirements
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import and_, or_
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
@@ -14,7 +14,7 @@ import math
 from app.models.doctor import Doctor
 from app.models.user import User
 from app.schemas.doctor import DoctorCreate, DoctorUpdate, DoctorSearchQuery
-from app.core.database import get_db_context
+from app.core.database import get_db_context, cache_manager, CacheKeys
 
 
 class DoctorService:
@@ -174,6 +174,7 @@ class DoctorService:
         doctor.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(doctor)
+        self._invalidate_doctor_id_cache(doctor)
         
         return doctor
     
@@ -186,9 +187,14 @@ class DoctorService:
         doctor.is_active = False
         doctor.updated_at = datetime.utcnow()
         db.commit()
+        self._invalidate_doctor_id_cache(doctor)
         
         return True
     
+    def _invalidate_doctor_id_cache(self, doctor: Doctor) -> None:
+        """Drop the cached user-to-doctor mapping used by get_current_doctor_id"""
+        cache_manager.delete(CacheKeys.DOCTOR_ID_BY_USER.format(user_id=doctor.user_id))
+    
     def reactivate_doctor(self, db: Session, doctor_id: UUID) -> bool:
         """Reactivate doctor"""
         doctor = db.query(Doctor).filter(Doctor.id == doctor_id).first()
@@ -208,8 +214,9 @@ class DoctorService:
     ) -> Tuple[List[Doctor], int]:
         """Search doctors with filters and pagination"""
         
-        # Base query with joins
-        query = db.query(Doctor).join(Doctor.user)
+        # Base query with joins; contains_eager fills doctor.user from the
+        # join so the response mapping does not lazy-load one user per row
+        query = db.query(Doctor).join(Doctor.user).options(contains_eager(Doctor.user))
         
         # Apply filters
         if search_params.is_active is not None:
@@ -372,7 +379,7 @@ class DoctorService:
     
     def get_doctors_for_user_role(self, db: Session, user_role: str, user_id: UUID = None) -> List[Doctor]:
         """Get doctors based on user role permissions"""
-        query = db.query(Doctor).join(Doctor.user).filter(Doctor.is_active == True)
+        query = db.query(Doctor).join(Doctor.user).options(contains_eager(Doctor.user)).filter(Doctor.is_active == True)
         
         if user_role in ["patient", "receptionist"]:
             # Patients and receptionists can see all active doctors
@@ -382,7 +389,7 @@ class DoctorService:
             return query.all()
         elif user_role in ["admin", "super_admin"]:
             # Admins can see all doctors including inactive ones
-            return db.query(Doctor).join(Doctor.user).all()
+            return db.query(Doctor).join(Doctor.user).options(contains_eager(Doctor.user)).all()
         else:
             # Default: only active doctors
             return query.all()
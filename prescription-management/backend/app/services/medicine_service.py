@@ -3,14 +3,20 @@ Medicine Service for Drug Catalog Management
 Handles medicine CRUD operations, search, and drug interaction checking
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, func, desc, asc, select, lambda_stmt, update, delete, exists
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from decimal import Decimal
+from uuid import uuid4
+import json
 import logging
 
+from app.core.database import get_db_context, cache_manager, CacheKeys
 from app.models.medicine import Medicine, search_medicines, find_medicine_by_name, get_medicines_by_category, check_drug_interactions, validate_medicine_data
+from app.models.prescription import PrescriptionItem
+from app.models.short_key import ShortKeyMedicine
 from app.schemas.medicine import MedicineCreate, MedicineUpdate, MedicineSearchParams
 from app.core.exceptions import (
     MedicineNotFoundError, 
@@ -21,6 +27,9 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# How long bulk job status stays queryable after it is written
+BULK_JOB_TTL = 3600
+
 
 class MedicineService:
     """Service class for medicine management"""
@@ -70,20 +79,23 @@ class MedicineService:
             db.commit()
             db.refresh(medicine)
             
-            logger.info(f"Created medicine: {medicine.name}")
+            logger.info("Created medicine: %s", medicine.name)
             return medicine
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error creating medicine: {str(e)}")
+            logger.error("Error creating medicine: %s", e)
             raise BusinessRuleError(f"Failed to create medicine: {str(e)}")
     
     def get_medicine_by_id(self, db: Session, medicine_id: UUID) -> Optional[Medicine]:
-        """Get medicine by ID"""
-        return db.query(Medicine).filter(
-            Medicine.id == medicine_id,
-            Medicine.is_active == True
-        ).first()
+        """
+        Get active medicine by ID
+        Uses the session identity map, so repeat lookups within a request skip SQL
+        """
+        medicine = db.get(Medicine, medicine_id)
+        if medicine is None or not medicine.is_active:
+            return None
+        return medicine
     
     def get_medicine_by_name(self, db: Session, name: str, exact_match: bool = False) -> Optional[Medicine]:
         """Get medicine by name"""
@@ -120,12 +132,12 @@ class MedicineService:
             db.commit()
             db.refresh(medicine)
             
-            logger.info(f"Updated medicine: {medicine.name}")
+            logger.info("Updated medicine: %s", medicine.name)
             return medicine
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating medicine: {str(e)}")
+            logger.error("Error updating medicine: %s", e)
             raise BusinessRuleError(f"Failed to update medicine: {str(e)}")
     
     def deactivate_medicine(self, db: Session, medicine_id: UUID) -> bool:
@@ -138,12 +150,12 @@ class MedicineService:
         
         try:
             db.commit()
-            logger.info(f"Deactivated medicine: {medicine.name}")
+            logger.info("Deactivated medicine: %s", medicine.name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deactivating medicine: {str(e)}")
+            logger.error("Error deactivating medicine: %s", e)
             raise BusinessRuleError(f"Failed to deactivate medicine: {str(e)}")
     
     def reactivate_medicine(self, db: Session, medicine_id: UUID) -> Optional[Medicine]:
@@ -166,12 +178,12 @@ class MedicineService:
         try:
             db.commit()
             db.refresh(medicine)
-            logger.info(f"Reactivated medicine: {medicine.name}")
+            logger.info("Reactivated medicine: %s", medicine.name)
             return medicine
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error reactivating medicine: {str(e)}")
+            logger.error("Error reactivating medicine: %s", e)
             raise BusinessRuleError(f"Failed to reactivate medicine: {str(e)}")
     
     # Search and Query Operations
@@ -180,60 +192,86 @@ class MedicineService:
         """
         Search medicines with filtering, sorting, and pagination
         Returns (medicines, total_count)
+
+        Statements are built with lambda_stmt so the compiled SQL is cached
+        per combination of active filters; only the bound values change
+        between requests.
         """
-        query = db.query(Medicine)
+        count_stmt = self._apply_search_filters(
+            lambda_stmt(lambda: select(func.count(Medicine.id))), search_params
+        )
+        total_count = db.execute(count_stmt).scalar()
         
+        stmt = self._apply_search_filters(
+            lambda_stmt(lambda: select(Medicine)), search_params
+        )
+        
+        # Apply sorting
+        sort_column = getattr(Medicine, search_params.sort_by, Medicine.name)
+        if search_params.sort_order == "desc":
+            stmt += lambda s: s.order_by(desc(sort_column))
+        else:
+            stmt += lambda s: s.order_by(asc(sort_column))
+        
+        # Apply pagination
+        offset = (search_params.page - 1) * search_params.page_size
+        page_size = search_params.page_size
+        stmt += lambda s: s.offset(offset).limit(page_size)
+        
+        medicines = db.execute(stmt).scalars().all()
+        
+        return medicines, total_count
+    
+    def _apply_search_filters(self, stmt: StatementLambdaElement, search_params: MedicineSearchParams) -> StatementLambdaElement:
+        """
+        Append the active search filters to a lambda statement.
+        Each filter is its own lambda, so the cache key is the set of
+        filters present; filter values are extracted as bound parameters.
+        """
         # Apply active filter
         if search_params.is_active is not None:
-            query = query.filter(Medicine.is_active == search_params.is_active)
+            is_active = search_params.is_active
+            stmt += lambda s: s.where(Medicine.is_active == is_active)
         
         # Apply text search
         if search_params.query:
-            search_filter = or_(
-                Medicine.name.ilike(f"%{search_params.query}%"),
-                Medicine.generic_name.ilike(f"%{search_params.query}%"),
-                Medicine.composition.ilike(f"%{search_params.query}%")
-            )
-            query = query.filter(search_filter)
+            pattern = f"%{search_params.query}%"
+            stmt += lambda s: s.where(or_(
+                Medicine.name.ilike(pattern),
+                Medicine.generic_name.ilike(pattern),
+                Medicine.composition.ilike(pattern)
+            ))
         
         # Apply category filter
         if search_params.category:
-            query = query.filter(Medicine.drug_category.ilike(f"%{search_params.category}%"))
+            category_pattern = f"%{search_params.category}%"
+            stmt += lambda s: s.where(Medicine.drug_category.ilike(category_pattern))
         
         # Apply manufacturer filter
         if search_params.manufacturer:
-            query = query.filter(Medicine.manufacturer.ilike(f"%{search_params.manufacturer}%"))
+            manufacturer_pattern = f"%{search_params.manufacturer}%"
+            stmt += lambda s: s.where(Medicine.manufacturer.ilike(manufacturer_pattern))
         
         # Apply prescription requirement filter
         if search_params.requires_prescription is not None:
-            query = query.filter(Medicine.requires_prescription == search_params.requires_prescription)
+            requires_prescription = search_params.requires_prescription
+            stmt += lambda s: s.where(Medicine.requires_prescription == requires_prescription)
         
         # Apply dosage form filter
         if search_params.dosage_form:
-            query = query.filter(Medicine.dosage_forms.any(search_params.dosage_form.lower()))
+            dosage_form = search_params.dosage_form.lower()
+            stmt += lambda s: s.where(Medicine.dosage_forms.any(dosage_form))
         
         # Apply price filters
         if search_params.min_price is not None:
-            query = query.filter(Medicine.price >= search_params.min_price)
+            min_price = search_params.min_price
+            stmt += lambda s: s.where(Medicine.price >= min_price)
         
         if search_params.max_price is not None:
-            query = query.filter(Medicine.price <= search_params.max_price)
+            max_price = search_params.max_price
+            stmt += lambda s: s.where(Medicine.price <= max_price)
         
-        # Get total count before pagination
-        total_count = query.count()
-        
-        # Apply sorting
-        sort_column = getattr(Medicine, search_params.sort_by, Medicine.name)
-        if search_params.sort_order == "desc":
-            query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(asc(sort_column))
-        
-        # Apply pagination
-        offset = (search_params.page - 1) * search_params.page_size
-        medicines = query.offset(offset).limit(search_params.page_size).all()
-        
-        return medicines, total_count
+        return stmt
     
     def get_medicines_by_category(self, db: Session, category: str) -> List[Medicine]:
         """Get medicines by category"""
@@ -284,16 +322,35 @@ class MedicineService:
     # Statistics and Analytics
     
     def get_medicine_statistics(self, db: Session) -> Dict[str, Any]:
-        """Get medicine catalog statistics"""
-        total_medicines = db.query(Medicine).count()
-        active_medicines = db.query(Medicine).filter(Medicine.is_active == True).count()
+        """
+        Get medicine catalog statistics
+        Counts and price ranges come from a single conditional-aggregate query
+        """
+        is_active = Medicine.is_active == True
+        counts = db.query(
+            func.count(Medicine.id).label('total'),
+            func.count(Medicine.id).filter(is_active).label('active'),
+            func.count(Medicine.id).filter(
+                and_(is_active, Medicine.requires_prescription == True)
+            ).label('prescription_required'),
+            func.count(Medicine.id).filter(
+                and_(is_active, Medicine.price < 10)
+            ).label('under_10'),
+            func.count(Medicine.id).filter(
+                and_(is_active, Medicine.price >= 10, Medicine.price < 50)
+            ).label('range_10_50'),
+            func.count(Medicine.id).filter(
+                and_(is_active, Medicine.price >= 50, Medicine.price < 100)
+            ).label('range_50_100'),
+            func.count(Medicine.id).filter(
+                and_(is_active, Medicine.price >= 100)
+            ).label('over_100')
+        ).one()
+        
+        total_medicines = counts.total
+        active_medicines = counts.active
         inactive_medicines = total_medicines - active_medicines
-        
-        prescription_required = db.query(Medicine).filter(
-            Medicine.requires_prescription == True,
-            Medicine.is_active == True
-        ).count()
-        
+        prescription_required = counts.prescription_required
         over_the_counter = active_medicines - prescription_required
         
         # Category distribution
@@ -301,7 +358,7 @@ class MedicineService:
             Medicine.drug_category,
             func.count(Medicine.id).label('count')
         ).filter(
-            Medicine.is_active == True,
+            is_active,
             Medicine.drug_category.isnot(None)
         ).group_by(Medicine.drug_category).all()
         
@@ -310,32 +367,19 @@ class MedicineService:
             Medicine.manufacturer,
             func.count(Medicine.id).label('count')
         ).filter(
-            Medicine.is_active == True,
+            is_active,
             Medicine.manufacturer.isnot(None)
         ).group_by(Medicine.manufacturer).limit(10).all()
         
         # Price range distribution
         price_ranges = {
-            'under_10': db.query(Medicine).filter(
-                Medicine.price < 10,
-                Medicine.is_active == True,
-                Medicine.price.isnot(None)
-            ).count(),
-            '10_50': db.query(Medicine).filter(
-                and_(Medicine.price >= 10, Medicine.price < 50),
-                Medicine.is_active == True
-            ).count(),
-            '50_100': db.query(Medicine).filter(
-                and_(Medicine.price >= 50, Medicine.price < 100),
-                Medicine.is_active == True
-            ).count(),
-            'over_100': db.query(Medicine).filter(
-                Medicine.price >= 100,
-                Medicine.is_active == True
-            ).count()
+            'under_10': counts.under_10,
+            '10_50': counts.range_10_50,
+            '50_100': counts.range_50_100,
+            'over_100': counts.over_100
         }
         
-        # Dosage forms distribution (simplified since dosage_forms is an array)
+        # Dosage forms distribution, unnested and counted in the database
         dosage_forms = {
             'tablet': 0,
             'capsule': 0,
@@ -344,17 +388,18 @@ class MedicineService:
             'other': 0
         }
         
-        # Note: This is a simplified implementation since dosage_forms is stored as an array
-        # In a real system, you might want to use PostgreSQL array functions
-        all_medicines = db.query(Medicine).filter(Medicine.is_active == True).all()
-        for medicine in all_medicines:
-            if medicine.dosage_forms:
-                for form in medicine.dosage_forms:
-                    form_lower = form.lower()
-                    if form_lower in dosage_forms:
-                        dosage_forms[form_lower] += 1
-                    else:
-                        dosage_forms['other'] += 1
+        forms = select(
+            func.lower(func.unnest(Medicine.dosage_forms)).label('form')
+        ).where(is_active).subquery()
+        form_stats = db.query(
+            forms.c.form,
+            func.count().label('count')
+        ).group_by(forms.c.form).all()
+        for row in form_stats:
+            if row.form in dosage_forms:
+                dosage_forms[row.form] += row.count
+            else:
+                dosage_forms['other'] += row.count
         
         return {
             'total_medicines': total_medicines,
@@ -379,7 +424,12 @@ class MedicineService:
     # Bulk Operations
     
     def bulk_update_medicines(self, db: Session, medicine_ids: List[UUID], operation: str) -> Dict[str, Any]:
-        """Perform bulk operations on medicines"""
+        """
+        Perform bulk operations on medicines
+        Each operation is one set-based statement; RETURNING tells us which rows changed.
+        Rows the statement must not touch are excluded in its WHERE clause, so one
+        ineligible medicine fails on its own instead of rolling back the batch
+        """
         result = {
             'operation': operation,
             'total_requested': len(medicine_ids),
@@ -389,36 +439,122 @@ class MedicineService:
             'processed_ids': []
         }
         
-        for medicine_id in medicine_ids:
-            try:
-                if operation == 'activate':
-                    medicine = self.reactivate_medicine(db, medicine_id)
-                    if medicine:
-                        result['successful'] += 1
-                        result['processed_ids'].append(medicine_id)
-                
-                elif operation == 'deactivate':
-                    success = self.deactivate_medicine(db, medicine_id)
-                    if success:
-                        result['successful'] += 1
-                        result['processed_ids'].append(medicine_id)
-                
-                elif operation == 'delete':
-                    # Hard delete (use with caution)
-                    medicine = db.query(Medicine).filter(Medicine.id == medicine_id).first()
-                    if medicine:
-                        db.delete(medicine)
-                        db.commit()
-                        result['successful'] += 1
-                        result['processed_ids'].append(medicine_id)
-                
-            except Exception as e:
-                result['failed'] += 1
-                result['errors'].append(f"Medicine {medicine_id}: {str(e)}")
-                logger.error(f"Bulk operation failed for medicine {medicine_id}: {str(e)}")
+        if operation == 'activate':
+            # Skip rows whose name is already taken by an active medicine, and
+            # reactivate only one of several same-named medicines in the batch
+            active_duplicate = aliased(Medicine)
+            batch_duplicate = aliased(Medicine)
+            stmt = update(Medicine).where(
+                Medicine.id.in_(medicine_ids),
+                Medicine.is_active == False,
+                ~exists().where(
+                    active_duplicate.name == Medicine.name,
+                    active_duplicate.is_active == True
+                ),
+                ~exists().where(
+                    batch_duplicate.name == Medicine.name,
+                    batch_duplicate.id.in_(medicine_ids),
+                    batch_duplicate.is_active == False,
+                    batch_duplicate.id < Medicine.id
+                )
+            ).values(is_active=True)
+        elif operation == 'deactivate':
+            stmt = update(Medicine).where(
+                Medicine.id.in_(medicine_ids),
+                Medicine.is_active == True
+            ).values(is_active=False)
+        elif operation == 'delete':
+            # Hard delete (use with caution). Medicines still referenced by
+            # prescription items or short keys are skipped, not deleted.
+            stmt = delete(Medicine).where(
+                Medicine.id.in_(medicine_ids),
+                ~exists().where(PrescriptionItem.medicine_id == Medicine.id),
+                ~exists().where(ShortKeyMedicine.medicine_id == Medicine.id)
+            )
+        else:
+            raise ValidationError(f"Unsupported bulk operation: {operation}")
         
+        try:
+            processed_ids = db.execute(
+                stmt.returning(Medicine.id),
+                execution_options={"synchronize_session": False}
+            ).scalars().all()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error("Bulk %s failed: %s", operation, e)
+            raise BusinessRuleError(f"Failed to {operation} medicines: {str(e)}")
+        
+        processed = set(processed_ids)
+        result['successful'] = len(processed)
+        result['processed_ids'] = [mid for mid in medicine_ids if mid in processed]
+        
+        # Any skipped row that still exists after a delete is referenced
+        skipped = [mid for mid in medicine_ids if mid not in processed]
+        referenced = set()
+        if skipped and operation == 'delete':
+            referenced = set(db.execute(
+                select(Medicine.id).where(Medicine.id.in_(skipped))
+            ).scalars().all())
+        
+        for medicine_id in skipped:
+            result['failed'] += 1
+            if medicine_id in referenced:
+                result['errors'].append(f"Medicine {medicine_id}: referenced by prescriptions or short keys")
+            else:
+                result['errors'].append(f"Medicine {medicine_id}: not found or not eligible for {operation}")
+        
+        logger.info("Bulk %s: %s/%s medicines updated", operation, result['successful'], result['total_requested'])
         return result
     
+    def queue_bulk_update_job(self, medicine_ids: List[UUID], operation: str, requested_by: UUID) -> Optional[str]:
+        """
+        Register a bulk operation job owned by requested_by and return its ID
+        Returns None if job status cannot be stored
+        """
+        job_id = str(uuid4())
+        if not self._set_bulk_job(job_id, requested_by, {'status': 'queued'}):
+            logger.warning("Job store unavailable, bulk operation %s not queued", operation)
+            return None
+        return job_id
+    
+    def run_bulk_update_job(self, job_id: str, medicine_ids: List[UUID], operation: str, requested_by: UUID) -> None:
+        """
+        Execute a queued bulk operation in its own session
+        Intended to run as a background task after the response is sent
+        """
+        self._set_bulk_job(job_id, requested_by, {'status': 'running'})
+        try:
+            with get_db_context() as db:
+                result = self.bulk_update_medicines(db, medicine_ids, operation)
+            self._set_bulk_job(job_id, requested_by, {'status': 'completed', 'result': result})
+            logger.info("Bulk job %s completed: %s/%s successful", job_id, result['successful'], result['total_requested'])
+        except Exception as e:
+            logger.error("Bulk job %s failed: %s", job_id, e)
+            self._set_bulk_job(job_id, requested_by, {'status': 'failed', 'error': str(e)})
+    
+    def get_bulk_job(self, job_id: str, user_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Get status (and result, once finished) of a bulk operation job
+        Returns None unless the job was queued by user_id
+        """
+        data = cache_manager.get(CacheKeys.MEDICINE_BULK_JOB.format(job_id=job_id))
+        if not data:
+            return None
+        job = json.loads(data)
+        if job.get('requested_by') != str(user_id):
+            return None
+        return job
+    
+    def _set_bulk_job(self, job_id: str, requested_by: UUID, job: Dict[str, Any]) -> bool:
+        """Store bulk job status, with its owner, in the shared cache"""
+        job = {'job_id': job_id, 'requested_by': str(requested_by), **job}
+        return bool(cache_manager.set(
+            CacheKeys.MEDICINE_BULK_JOB.format(job_id=job_id),
+            json.dumps(job, default=str),
+            ttl=BULK_JOB_TTL
+        ))
+    
     # Import/Export Operations
     
     def import_medicines(self, db: Session, medicines_data: List[MedicineCreate], created_by: UUID, overwrite: bool = False) -> Dict[str, Any]:
@@ -455,7 +591,7 @@ class MedicineService:
             except Exception as e:
                 result['failed'] += 1
                 result['errors'].append(f"Medicine '{medicine_data.name}': {str(e)}")
-                logger.error(f"Import failed for medicine {medicine_data.name}: {str(e)}")
+                logger.error("Import failed for medicine %s: %s", medicine_data.name, e)
         
         return result
     
@@ -5,19 +5,36 @@ Implements business logic for (mobile_number + first_name) composite key
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, tuple_
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import date
+import base64
+import json
 import logging
 
-from app.models.patient import Patient, get_family_members, check_family_limit, find_primary_family_member, validate_family_registration
+from app.models.patient import (
+    Patient, get_family_members, check_family_limit, patient_exists,
+    has_primary_family_member, validate_family_registration
+)
 from app.schemas.patient import PatientCreate, PatientUpdate, PatientCreateFamily, PatientSearchParams, CompositeKey
 from app.core.config import settings
-from app.core.exceptions import PatientNotFoundError, ValidationError, BusinessRuleError
+from app.core.database import cache_manager, CacheKeys
+from app.core.exceptions import PatientNotFoundError, InvalidInputError, BusinessRuleError, FamilyLimitExceededError
 
 logger = logging.getLogger(__name__)
 
+# Dashboard statistics are polled often and tolerate a short staleness window
+PATIENT_STATISTICS_TTL = 60
+
+# Family eligibility counts are invalidated on every write for the family;
+# the TTL only bounds drift from writes made outside this service
+FAMILY_ELIGIBILITY_TTL = 300
+
+# Mobile/email lookups back search-as-you-type; shared with the endpoint limits
+PATIENT_SEARCH_LIMIT = 15
+PATIENT_SEARCH_MAX_LIMIT = 50
+
 
 class PatientService:
     """Service class for patient management with composite key support"""
@@ -27,7 +44,13 @@ class PatientService:
     
     # Core CRUD Operations with Composite Key
     
-    def create_patient(self, db: Session, patient_data: PatientCreate, created_by: Optional[UUID] = None) -> Patient:
+    def create_patient(
+        self, 
+        db: Session, 
+        patient_data: PatientCreate, 
+        created_by: Optional[UUID] = None,
+        primary_exists: bool = False
+    ) -> Patient:
         """
         Create a new patient with composite key validation
         Handles primary family member and family member creation
@@ -37,13 +60,31 @@ class PatientService:
             db=db,
             mobile_number=patient_data.mobile_number,
             first_name=patient_data.first_name,
-            relationship=patient_data.relationship_to_primary
+            relationship=patient_data.relationship_to_primary,
+            primary_exists=primary_exists
         )
         
         if not validation_result['is_valid']:
-            raise ValidationError(f"Validation failed: {', '.join(validation_result['errors'])}")
+            raise InvalidInputError(f"Validation failed: {', '.join(validation_result['errors'])}")
+        
+        patient = self._build_patient(patient_data, created_by)
         
-        # Create patient instance
+        try:
+            db.add(patient)
+            db.commit()
+            db.refresh(patient)
+            
+            logger.info(f"Created patient: {patient.mobile_number} - {patient.get_full_name()}")
+            self._invalidate_patient_caches(patient.mobile_number)
+            return patient
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating patient: {str(e)}")
+            raise BusinessRuleError(f"Failed to create patient: {str(e)}")
+    
+    def _build_patient(self, patient_data: PatientCreate, created_by: Optional[UUID] = None) -> Patient:
+        """Build an unsaved Patient instance from create data"""
         patient = Patient(
             mobile_number=patient_data.mobile_number,
             first_name=patient_data.first_name,
@@ -66,18 +107,7 @@ class PatientService:
                 relationship=patient_data.emergency_contact.relationship
             )
         
-        try:
-            db.add(patient)
-            db.commit()
-            db.refresh(patient)
-            
-            logger.info(f"Created patient: {patient.mobile_number} - {patient.get_full_name()}")
-            return patient
-            
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error creating patient: {str(e)}")
-            raise BusinessRuleError(f"Failed to create patient: {str(e)}")
+        return patient
     
     def create_family_member(
         self, 
@@ -91,9 +121,8 @@ class PatientService:
         Automatically sets mobile_number and validates family constraints
         """
         # Validate that primary family member exists
-        primary_member = find_primary_family_member(db, family_mobile)
-        if not primary_member:
-            raise ValidationError("Primary family member must be registered first")
+        if not has_primary_family_member(db, family_mobile):
+            raise InvalidInputError("Primary family member must be registered first")
         
         # Create full patient data
         patient_data = PatientCreate(
@@ -110,15 +139,84 @@ class PatientService:
             notes=member_data.notes
         )
         
-        return self.create_patient(db, patient_data, created_by)
+        return self.create_patient(db, patient_data, created_by, primary_exists=True)
+    
+    def create_family_members_bulk(
+        self, 
+        db: Session, 
+        family_mobile: str, 
+        members: List[PatientCreateFamily], 
+        created_by: Optional[UUID] = None
+    ) -> List[Patient]:
+        """
+        Create several family members for an existing family in one transaction
+        Validates the whole batch up front; either every member is created or none
+        """
+        if not has_primary_family_member(db, family_mobile):
+            raise InvalidInputError("Primary family member must be registered first")
+        
+        # One query for the family's active names covers both the duplicate and size checks
+        existing_names = {
+            name for (name,) in db.query(Patient.first_name).filter(
+                Patient.mobile_number == family_mobile,
+                Patient.is_active == True
+            )
+        }
+        
+        duplicates = sorted(member.first_name for member in members if member.first_name in existing_names)
+        if duplicates:
+            raise InvalidInputError(f"Patient with this mobile number and name already exists: {', '.join(duplicates)}")
+        
+        if len(existing_names) + len(members) > self.max_family_members:
+            raise FamilyLimitExceededError(f"Maximum {self.max_family_members} family members allowed per mobile number")
+        
+        patients = [
+            self._build_patient(
+                PatientCreate(
+                    mobile_number=family_mobile,
+                    first_name=member.first_name,
+                    last_name=member.last_name,
+                    date_of_birth=member.date_of_birth,
+                    gender=member.gender,
+                    email=member.email,
+                    address=member.address,
+                    relationship_to_primary=member.relationship_to_primary,
+                    primary_contact_mobile=member.primary_contact_mobile or family_mobile,
+                    emergency_contact=member.emergency_contact,
+                    notes=member.notes
+                ),
+                created_by
+            )
+            for member in members
+        ]
+        
+        try:
+            db.add_all(patients)
+            db.flush()
+            patient_ids = [patient.id for patient in patients]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating family members: {str(e)}")
+            raise BusinessRuleError(f"Failed to create family members: {str(e)}")
+        
+        # Reload the committed rows in one SELECT instead of refreshing each instance
+        db.query(Patient).filter(Patient.id.in_(patient_ids)).all()
+        
+        logger.info(f"Created {len(patients)} family members for {family_mobile}")
+        self._invalidate_patient_caches(family_mobile)
+        return patients
     
     def get_patient_by_composite_key(self, db: Session, mobile_number: str, first_name: str) -> Optional[Patient]:
-        """Get patient by composite key (mobile_number + first_name)"""
-        return db.query(Patient).filter(
-            Patient.mobile_number == mobile_number,
-            Patient.first_name == first_name,
-            Patient.is_active == True
-        ).first()
+        """
+        Get patient by composite key (mobile_number + first_name)
+        Repeat lookups within the same session resolve through the identity map
+        """
+        # (mobile_number, first_name) is the primary key, in column order
+        patient = db.get(Patient, (mobile_number, first_name))
+        if patient is None or not patient.is_active:
+            return None
+        return patient
     
     def get_patient_by_id(self, db: Session, patient_id: UUID) -> Optional[Patient]:
         """Get patient by UUID (for internal references)"""
@@ -159,6 +257,7 @@ class PatientService:
             db.refresh(patient)
             
             logger.info(f"Updated patient: {patient.mobile_number} - {patient.get_full_name()}")
+            self._invalidate_patient_caches(patient.mobile_number)
             return patient
             
         except Exception as e:
@@ -177,6 +276,7 @@ class PatientService:
         try:
             db.commit()
             logger.info(f"Deactivated patient: {patient.mobile_number} - {patient.get_full_name()}")
+            self._invalidate_patient_caches(patient.mobile_number)
             return True
             
         except Exception as e:
@@ -201,6 +301,7 @@ class PatientService:
             db.commit()
             db.refresh(patient)
             logger.info(f"Reactivated patient: {patient.mobile_number} - {patient.get_full_name()}")
+            self._invalidate_patient_caches(patient.mobile_number)
             return patient
             
         except Exception as e:
@@ -215,9 +316,15 @@ class PatientService:
         return get_family_members(db, mobile_number)
     
     def get_family_with_details(self, db: Session, mobile_number: str) -> Dict[str, Any]:
-        """Get complete family information with primary member details"""
+        """
+        Get complete family information with primary member details
+        The primary member is picked from the family query instead of a second lookup
+        """
         family_members = self.get_family_members(db, mobile_number)
-        primary_member = find_primary_family_member(db, mobile_number)
+        primary_member = next(
+            (member for member in family_members if member.relationship_to_primary == 'self'),
+            None
+        )
         
         return {
             'family_mobile': mobile_number,
@@ -235,10 +342,7 @@ class PatientService:
             'max_allowed': self.max_family_members
         }
         
-        current_count = db.query(Patient).filter(
-            Patient.mobile_number == mobile_number,
-            Patient.is_active == True
-        ).count()
+        current_count, has_primary = self._get_family_counts(db, mobile_number)
         
         validation_result['current_count'] = current_count
         
@@ -247,13 +351,35 @@ class PatientService:
             validation_result['reasons'].append(f"Maximum {self.max_family_members} family members allowed")
         
         # Check if primary member exists
-        primary_member = find_primary_family_member(db, mobile_number)
-        if not primary_member and current_count > 0:
+        if not has_primary and current_count > 0:
             validation_result['can_register'] = False
             validation_result['reasons'].append("No primary family member found")
         
         return validation_result
     
+    def _get_family_counts(self, db: Session, mobile_number: str) -> Tuple[int, bool]:
+        """
+        Active member count and primary-member presence for a family
+        Cached per mobile number; patient writes for the family invalidate it
+        """
+        cache_key = CacheKeys.PATIENT_FAMILY_ELIGIBILITY.format(mobile_number=mobile_number)
+        cached = cache_manager.get(cache_key)
+        if cached:
+            current_count, has_primary = json.loads(cached)
+            return current_count, has_primary
+        
+        current_count, primary_count = db.query(
+            func.count(Patient.id),
+            func.count(Patient.id).filter(Patient.relationship_to_primary == 'self')
+        ).filter(
+            Patient.mobile_number == mobile_number,
+            Patient.is_active == True
+        ).one()
+        
+        has_primary = primary_count > 0
+        cache_manager.set(cache_key, json.dumps([current_count, has_primary]), ttl=FAMILY_ELIGIBILITY_TTL)
+        return current_count, has_primary
+    
     # Search and Query Operations
     
     def search_patients(self, db: Session, search_params: PatientSearchParams) -> Tuple[List[Patient], int]:
@@ -261,29 +387,75 @@ class PatientService:
         Search patients with filtering, sorting, and pagination
         Returns (patients, total_count)
         """
-        query = db.query(Patient)
+        query = db.query(Patient).filter(*self._search_filters(search_params))
+        
+        # Keyset pagination: (first_name, id) seek instead of OFFSET scan.
+        # The seek predicate narrows the window, so count the full filtered set first.
+        total_count = None
+        if search_params.cursor:
+            if search_params.sort_by != "first_name":
+                raise InvalidInputError("Cursor pagination requires sort_by=first_name")
+            cursor_name, cursor_id = self.decode_cursor(search_params.cursor)
+            total_count = query.count()
+            key = tuple_(Patient.first_name, Patient.id)
+            if search_params.sort_order == "desc":
+                query = query.filter(key < tuple_(cursor_name, cursor_id))
+            else:
+                query = query.filter(key > tuple_(cursor_name, cursor_id))
+        
+        # Apply sorting
+        sort_column = getattr(Patient, search_params.sort_by, Patient.first_name)
+        order = desc if search_params.sort_order == "desc" else asc
+        query = query.order_by(order(sort_column))
+        if search_params.sort_by == "first_name":
+            # id breaks ties so the order is stable for keyset cursors
+            query = query.order_by(order(Patient.id))
+        
+        # Apply pagination
+        if search_params.cursor:
+            patients = query.limit(search_params.page_size).all()
+            return patients, total_count
+        
+        # COUNT(*) OVER () rides along with the page instead of a separate COUNT query
+        offset = (search_params.page - 1) * search_params.page_size
+        rows = query.add_columns(func.count().over().label('total')).offset(offset).limit(search_params.page_size).all()
+        patients = [row[0] for row in rows]
+        if rows:
+            total_count = rows[0].total
+        else:
+            # Page past the end returns no rows to carry the window count
+            total_count = query.count() if offset else 0
+        
+        return patients, total_count
+    
+    def _search_filters(self, search_params: PatientSearchParams) -> List[Any]:
+        """
+        Build the WHERE criteria for search_patients
+        Collected into one list so the query is filtered once instead of
+        cloned per criterion
+        """
+        filters = []
         
-        # Apply filters
         if search_params.mobile_number:
-            query = query.filter(Patient.mobile_number.ilike(f"%{search_params.mobile_number}%"))
+            filters.append(Patient.mobile_number.ilike(f"%{search_params.mobile_number}%"))
         
         if search_params.first_name:
-            query = query.filter(Patient.first_name.ilike(f"%{search_params.first_name}%"))
+            filters.append(Patient.first_name.ilike(f"%{search_params.first_name}%"))
         
         if search_params.last_name:
-            query = query.filter(Patient.last_name.ilike(f"%{search_params.last_name}%"))
+            filters.append(Patient.last_name.ilike(f"%{search_params.last_name}%"))
         
         if search_params.email:
-            query = query.filter(Patient.email.ilike(f"%{search_params.email}%"))
+            filters.append(Patient.email.ilike(f"%{search_params.email}%"))
         
         if search_params.gender:
-            query = query.filter(Patient.gender == search_params.gender)
+            filters.append(Patient.gender == search_params.gender)
         
         if search_params.relationship:
-            query = query.filter(Patient.relationship_to_primary == search_params.relationship)
+            filters.append(Patient.relationship_to_primary == search_params.relationship)
         
         if search_params.is_active is not None:
-            query = query.filter(Patient.is_active == search_params.is_active)
+            filters.append(Patient.is_active == search_params.is_active)
         
         # Age filtering (requires calculation)
         if search_params.age_min is not None or search_params.age_max is not None:
@@ -291,46 +463,61 @@ class PatientService:
             
             if search_params.age_min is not None:
                 max_birth_date = date(today.year - search_params.age_min, today.month, today.day)
-                query = query.filter(Patient.date_of_birth <= max_birth_date)
+                filters.append(Patient.date_of_birth <= max_birth_date)
             
             if search_params.age_max is not None:
                 min_birth_date = date(today.year - search_params.age_max - 1, today.month, today.day)
-                query = query.filter(Patient.date_of_birth >= min_birth_date)
-        
-        # Get total count before pagination
-        total_count = query.count()
+                filters.append(Patient.date_of_birth >= min_birth_date)
         
-        # Apply sorting
-        sort_column = getattr(Patient, search_params.sort_by, Patient.first_name)
-        if search_params.sort_order == "desc":
-            query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(asc(sort_column))
-        
-        # Apply pagination
-        offset = (search_params.page - 1) * search_params.page_size
-        patients = query.offset(offset).limit(search_params.page_size).all()
-        
-        return patients, total_count
+        return filters
+    
+    def encode_cursor(self, patient: Patient) -> str:
+        """Encode a patient's (first_name, id) sort key as an opaque cursor"""
+        raw = json.dumps([patient.first_name, str(patient.id)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
     
-    def get_patients_by_mobile(self, db: Session, mobile_number: str) -> List[Patient]:
-        """Get all patients (family members) for a mobile number"""
+    def decode_cursor(self, cursor: str) -> Tuple[str, UUID]:
+        """Decode a cursor produced by encode_cursor"""
+        try:
+            first_name, patient_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return first_name, UUID(patient_id)
+        except (ValueError, TypeError):
+            raise InvalidInputError("Invalid pagination cursor")
+    
+    def get_patients_by_mobile(self, db: Session, mobile_number: str, limit: int = PATIENT_SEARCH_LIMIT) -> List[Patient]:
+        """Get patients (family members) for a mobile number, capped at limit"""
         return db.query(Patient).filter(
             Patient.mobile_number == mobile_number,
             Patient.is_active == True
-        ).order_by(Patient.relationship_to_primary, Patient.first_name).all()
+        ).order_by(Patient.relationship_to_primary, Patient.first_name).limit(limit).all()
     
-    def get_patients_by_email(self, db: Session, email: str) -> List[Patient]:
-        """Get patients by email address"""
+    def get_patients_by_email(self, db: Session, email: str, limit: int = PATIENT_SEARCH_LIMIT) -> List[Patient]:
+        """
+        Get patients by email address, capped at limit
+        Case-insensitive: emails are stored lower-cased, so the lookup is too
+        """
         return db.query(Patient).filter(
-            Patient.email == email,
+            Patient.email == email.strip().lower(),
             Patient.is_active == True
-        ).all()
+        ).limit(limit).all()
     
     # Statistics and Analytics
     
     def get_patient_statistics(self, db: Session) -> Dict[str, Any]:
-        """Get patient statistics"""
+        """
+        Get patient statistics
+        Served from cache for PATIENT_STATISTICS_TTL seconds; patient writes invalidate it
+        """
+        cached = cache_manager.get(CacheKeys.PATIENT_STATISTICS)
+        if cached:
+            return json.loads(cached)
+        
+        stats = self._compute_patient_statistics(db)
+        cache_manager.set(CacheKeys.PATIENT_STATISTICS, json.dumps(stats), ttl=PATIENT_STATISTICS_TTL)
+        return stats
+    
+    def _compute_patient_statistics(self, db: Session) -> Dict[str, Any]:
+        """Run the statistics aggregates against the database"""
         total_patients = db.query(Patient).filter(Patient.is_active == True).count()
         total_families = db.query(Patient.mobile_number).filter(Patient.is_active == True).distinct().count()
         
@@ -373,15 +560,16 @@ class PatientService:
             'age_groups': age_groups
         }
     
+    def _invalidate_patient_caches(self, mobile_number: str) -> None:
+        """Drop cached statistics and the family's eligibility counts after a patient write"""
+        cache_manager.delete(CacheKeys.PATIENT_STATISTICS)
+        cache_manager.delete(CacheKeys.PATIENT_FAMILY_ELIGIBILITY.format(mobile_number=mobile_number))
+    
     # Validation Helpers
     
     def validate_composite_key_exists(self, db: Session, mobile_number: str, first_name: str) -> bool:
         """Check if patient exists by composite key"""
-        return db.query(Patient).filter(
-            Patient.mobile_number == mobile_number,
-            Patient.first_name == first_name,
-            Patient.is_active == True
-        ).first() is not None
+        return patient_exists(db, mobile_number, first_name)
     
     def validate_family_member_creation(
         self, 
@@ -4,11 +4,14 @@ Comprehensive business logic for prescription management with PDF generation sup
 Integrates with patients, doctors, medicines, and short keys modules
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+import base64
+import json
+import re
+from typing import List, Optional, Dict, Any, Tuple, Iterable
 from uuid import UUID, uuid4
 from datetime import date, datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, asc, func, text
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, desc, asc, func, text, tuple_, literal_column, update, case
 from decimal import Decimal
 
 from app.models.prescription import Prescription, PrescriptionItem, generate_prescription_number
@@ -26,9 +29,47 @@ from app.schemas.prescription import (
 from app.core.exceptions import (
     PrescriptionNotFoundError, PatientNotFoundError, DoctorNotFoundError,
     MedicineNotFoundError, ValidationError, BusinessRuleError,
-    InvalidPrescriptionError, ConflictError
+    InvalidPrescriptionError, ConflictError, AuthorizationError
 )
 from app.core.config import settings
+from app.core.database import cache_manager, CacheKeys
+
+# Dashboard statistics are polled often and tolerate a short staleness window
+PRESCRIPTION_STATISTICS_TTL = 60
+
+# Text search configuration of idx_prescriptions_diagnosis_fts. Inlined rather
+# than bound so the query expression matches the index expression.
+DIAGNOSIS_TS_CONFIG = literal_column("'english'")
+
+# Shorter diagnosis searches keep the ILIKE substring match
+DIAGNOSIS_FTS_MIN_LENGTH = 3
+
+_SEARCH_WORD = re.compile(r'\w+')
+
+PRESCRIPTION_STATUSES = ('draft', 'active', 'dispensed', 'completed', 'cancelled', 'expired')
+
+# Allowed status transitions; completed and cancelled are terminal
+STATUS_TRANSITIONS = {
+    'draft': ('active', 'cancelled'),
+    'active': ('dispensed', 'completed', 'cancelled', 'expired'),
+    'dispensed': ('completed',),
+    'completed': (),
+    'cancelled': (),
+    'expired': ('active',),  # Can be reactivated
+}
+
+# Statuses a prescription may be in to move to each status
+STATUS_SOURCES = {
+    target: tuple(source for source, targets in STATUS_TRANSITIONS.items() if target in targets)
+    for target in PRESCRIPTION_STATUSES
+}
+
+# Target status of each bulk operation (print does not change status)
+BULK_STATUS_OPERATIONS = {
+    'cancel': 'cancelled',
+    'complete': 'completed',
+    'activate': 'active',
+}
 
 
 class PrescriptionService:
@@ -50,7 +91,7 @@ class PrescriptionService:
             prescription_data.patient_first_name
         )
         
-        if not patient or str(patient.id) != str(prescription_data.patient_uuid):
+        if not patient or patient.id != prescription_data.patient_uuid:
             raise PatientNotFoundError("Patient not found or UUID mismatch")
         
         # Validate doctor exists
@@ -67,7 +108,7 @@ class PrescriptionService:
             # Validate appointment belongs to patient and doctor
             if (appointment.patient_mobile_number != prescription_data.patient_mobile_number or
                 appointment.patient_first_name != prescription_data.patient_first_name or
-                str(appointment.doctor_id) != str(prescription_data.doctor_id)):
+                appointment.doctor_id != prescription_data.doctor_id):
                 raise ValidationError("Appointment does not match patient and doctor")
         
         # Handle short key prescription
@@ -140,6 +181,7 @@ class PrescriptionService:
             self._track_short_key_usage(prescription_data.short_key_code, created_by)
         
         self.db.commit()
+        self._invalidate_statistics(prescription.doctor_id)
         
         # Reload with relationships
         return self._get_prescription_with_relationships(prescription.id)
@@ -169,31 +211,53 @@ class PrescriptionService:
         
         return self.create_prescription(prescription_data, created_by)
     
-    def get_prescription_by_id(self, prescription_id: UUID) -> Optional[Prescription]:
-        """Get prescription by ID with relationships"""
-        return self._get_prescription_with_relationships(prescription_id)
+    def get_prescription_by_id(
+        self,
+        prescription_id: UUID,
+        caller_doctor_id: Optional[UUID] = None
+    ) -> Optional[Prescription]:
+        """
+        Get prescription by ID with relationships
+        When caller_doctor_id is set, another doctor's prescription raises AuthorizationError
+        """
+        return self._get_prescription_with_relationships(prescription_id, caller_doctor_id)
     
-    def get_prescription_by_number(self, prescription_number: str) -> Optional[Prescription]:
-        """Get prescription by prescription number"""
-        prescription = self.db.query(Prescription).options(
+    def get_prescription_by_number(
+        self,
+        prescription_number: str,
+        caller_doctor_id: Optional[UUID] = None
+    ) -> Optional[Prescription]:
+        """
+        Get prescription by prescription number
+        When caller_doctor_id is set, another doctor's prescription raises AuthorizationError
+        """
+        query = self.db.query(Prescription).options(
             joinedload(Prescription.patient),
             joinedload(Prescription.doctor),
-            joinedload(Prescription.appointment)
+            joinedload(Prescription.appointment),
+            selectinload(Prescription.items).joinedload(PrescriptionItem.medicine)
         ).filter(
             Prescription.prescription_number == prescription_number.upper(),
             Prescription.is_active == True
-        ).first()
+        )
         
+        if caller_doctor_id:
+            query = query.filter(Prescription.doctor_id == caller_doctor_id)
+        
+        prescription = query.first()
+        if not prescription and caller_doctor_id:
+            self._deny_if_exists(Prescription.prescription_number == prescription_number.upper())
         return prescription
     
     def update_prescription(
         self, 
         prescription_id: UUID, 
         update_data: PrescriptionUpdate, 
-        updated_by: UUID
+        updated_by: UUID,
+        caller_doctor_id: Optional[UUID] = None
     ) -> Optional[Prescription]:
         """Update prescription information"""
-        prescription = self.get_prescription_by_id(prescription_id)
+        prescription = self.get_prescription_by_id(prescription_id, caller_doctor_id)
         if not prescription:
             raise PrescriptionNotFoundError("Prescription not found")
         
@@ -210,16 +274,18 @@ class PrescriptionService:
         prescription.updated_by = updated_by
         
         self.db.commit()
+        self._invalidate_statistics(prescription.doctor_id)
         return self.get_prescription_by_id(prescription_id)
     
     def add_prescription_item(
         self, 
         prescription_id: UUID, 
         item_data: PrescriptionItemCreate, 
-        created_by: UUID
+        created_by: UUID,
+        caller_doctor_id: Optional[UUID] = None
     ) -> PrescriptionItem:
         """Add item to existing prescription"""
-        prescription = self.get_prescription_by_id(prescription_id)
+        prescription = self.get_prescription_by_id(prescription_id, caller_doctor_id)
         if not prescription:
             raise PrescriptionNotFoundError("Prescription not found")
         
@@ -319,10 +385,11 @@ class PrescriptionService:
     
     def search_prescriptions(self, search_params: PrescriptionSearchParams) -> Tuple[List[Prescription], int]:
         """Search prescriptions with filtering and pagination"""
+        # Patient filters use the denormalized composite-key columns, so no join
+        # is needed. Only items are serialized per row; they are selectin-loaded
+        # in one batched query per page.
         query = self.db.query(Prescription).options(
-            joinedload(Prescription.patient),
-            joinedload(Prescription.doctor),
-            joinedload(Prescription.appointment)
+            selectinload(Prescription.items).joinedload(PrescriptionItem.medicine)
         ).filter(Prescription.is_active == True)
         
         # Apply filters
@@ -360,7 +427,7 @@ class PrescriptionService:
             query = query.filter(func.date(Prescription.created_at) <= search_params.created_to)
         
         if search_params.diagnosis:
-            query = query.filter(Prescription.diagnosis.ilike(f"%{search_params.diagnosis}%"))
+            query = query.filter(self._diagnosis_filter(search_params.diagnosis))
         
         if search_params.prescription_number:
             query = query.filter(Prescription.prescription_number.ilike(f"%{search_params.prescription_number}%"))
@@ -368,44 +435,101 @@ class PrescriptionService:
         # Get total count
         total = query.count()
         
+        # Keyset pagination: (visit_date, id) seek instead of OFFSET scan
+        if search_params.cursor:
+            if search_params.sort_by != "visit_date":
+                raise ValidationError("Cursor pagination requires sort_by=visit_date")
+            cursor_date, cursor_id = self.decode_cursor(search_params.cursor)
+            key = tuple_(Prescription.visit_date, Prescription.id)
+            if search_params.sort_order == "asc":
+                query = query.filter(key > tuple_(cursor_date, cursor_id))
+            else:
+                query = query.filter(key < tuple_(cursor_date, cursor_id))
+        
         # Apply sorting
         sort_field = getattr(Prescription, search_params.sort_by, Prescription.visit_date)
-        if search_params.sort_order == "asc":
-            query = query.order_by(asc(sort_field))
-        else:
-            query = query.order_by(desc(sort_field))
+        order = asc if search_params.sort_order == "asc" else desc
+        query = query.order_by(order(sort_field))
+        if search_params.sort_by == "visit_date":
+            # id breaks ties so the order is stable for keyset cursors
+            query = query.order_by(order(Prescription.id))
         
         # Apply pagination
-        offset = (search_params.page - 1) * search_params.page_size
-        prescriptions = query.offset(offset).limit(search_params.page_size).all()
+        if search_params.cursor:
+            prescriptions = query.limit(search_params.page_size).all()
+        else:
+            offset = (search_params.page - 1) * search_params.page_size
+            prescriptions = query.offset(offset).limit(search_params.page_size).all()
         
         return prescriptions, total
     
+    def _diagnosis_filter(self, diagnosis: str):
+        """
+        Match diagnosis text through the full-text GIN index
+        Each word is a prefix term ('fev' matches 'fever'); very short input
+        falls back to a substring ILIKE
+        """
+        words = _SEARCH_WORD.findall(diagnosis)
+        if len(diagnosis.strip()) < DIAGNOSIS_FTS_MIN_LENGTH or not words:
+            return Prescription.diagnosis.ilike(f"%{diagnosis}%")
+        
+        ts_query = " & ".join(f"{word}:*" for word in words)
+        return func.to_tsvector(DIAGNOSIS_TS_CONFIG, Prescription.diagnosis).op('@@')(
+            func.to_tsquery(DIAGNOSIS_TS_CONFIG, ts_query)
+        )
+    
+    def encode_cursor(self, prescription: Prescription) -> str:
+        """Encode a prescription's (visit_date, id) sort key as an opaque cursor"""
+        raw = json.dumps([prescription.visit_date.isoformat(), str(prescription.id)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    def decode_cursor(self, cursor: str) -> Tuple[date, UUID]:
+        """Decode a cursor produced by encode_cursor"""
+        try:
+            visit_date, prescription_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return date.fromisoformat(visit_date), UUID(prescription_id)
+        except (ValueError, TypeError):
+            raise ValidationError("Invalid pagination cursor")
+    
     def get_patient_prescriptions(
         self, 
         mobile_number: str, 
         first_name: str, 
-        limit: int = 50
-    ) -> List[Prescription]:
-        """Get prescriptions for a patient"""
-        return self.db.query(Prescription).options(
-            joinedload(Prescription.doctor)
+        limit: int = 50,
+        yield_per: Optional[int] = None
+    ) -> Iterable[Prescription]:
+        """
+        Get prescriptions for a patient
+        With yield_per, rows are streamed from the database in batches of that size
+        """
+        query = self.db.query(Prescription).options(
+            selectinload(Prescription.items).joinedload(PrescriptionItem.medicine)
         ).filter(
             Prescription.patient_mobile_number == mobile_number,
             Prescription.patient_first_name == first_name,
             Prescription.is_active == True
-        ).order_by(desc(Prescription.visit_date)).limit(limit).all()
+        ).order_by(
+            desc(Prescription.visit_date), desc(Prescription.id)
+        ).limit(limit)
+        
+        if yield_per:
+            return iter(query.yield_per(yield_per))
+        return query.all()
     
     def get_doctor_prescriptions(
         self, 
         doctor_id: UUID, 
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        limit: int = 100
-    ) -> List[Prescription]:
-        """Get prescriptions created by a doctor"""
+        limit: int = 100,
+        yield_per: Optional[int] = None
+    ) -> Iterable[Prescription]:
+        """
+        Get prescriptions created by a doctor
+        With yield_per, rows are streamed from the database in batches of that size
+        """
         query = self.db.query(Prescription).options(
-            joinedload(Prescription.patient)
+            selectinload(Prescription.items).joinedload(PrescriptionItem.medicine)
         ).filter(
             Prescription.doctor_id == doctor_id,
             Prescription.is_active == True
@@ -417,43 +541,77 @@ class PrescriptionService:
         if end_date:
             query = query.filter(Prescription.visit_date <= end_date)
         
-        return query.order_by(desc(Prescription.visit_date)).limit(limit).all()
+        query = query.order_by(
+            desc(Prescription.visit_date), desc(Prescription.id)
+        ).limit(limit)
+        if yield_per:
+            return iter(query.yield_per(yield_per))
+        return query.all()
     
     def update_prescription_status(
         self, 
         prescription_id: UUID, 
         status: str, 
         updated_by: UUID,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        caller_doctor_id: Optional[UUID] = None
     ) -> Optional[Prescription]:
-        """Update prescription status"""
-        prescription = self.get_prescription_by_id(prescription_id)
-        if not prescription:
-            raise PrescriptionNotFoundError("Prescription not found")
-        
-        # Validate status transition
-        valid_transitions = {
-            'draft': ['active', 'cancelled'],
-            'active': ['dispensed', 'completed', 'cancelled', 'expired'],
-            'dispensed': ['completed'],
-            'completed': [],  # Terminal state
-            'cancelled': [],  # Terminal state
-            'expired': ['active']  # Can be reactivated
-        }
-        
-        if status not in valid_transitions.get(prescription.status, []):
-            raise BusinessRuleError(f"Invalid status transition from {prescription.status} to {status}")
-        
-        prescription.status = status
-        prescription.updated_at = datetime.utcnow()
-        prescription.updated_by = updated_by
-        
-        if notes:
-            prescription.clinical_notes = f"{prescription.clinical_notes or ''}\n[{datetime.utcnow()}] Status changed to {status}: {notes}".strip()
+        """
+        Update prescription status
+        The transition rule and ownership are part of the UPDATE's WHERE clause,
+        so validation and the write are a single statement
+        """
+        criteria = [Prescription.id == prescription_id]
+        if caller_doctor_id:
+            criteria.append(Prescription.doctor_id == caller_doctor_id)
+        
+        row = None
+        if STATUS_SOURCES.get(status):
+            row = self.db.execute(
+                self._status_update(status, notes, *criteria, updated_by=updated_by).returning(Prescription.doctor_id),
+                execution_options={"synchronize_session": False}
+            ).first()
+        
+        if row is None:
+            current_status = self.db.query(Prescription.status).filter(
+                *criteria,
+                Prescription.is_active == True
+            ).scalar()
+            if current_status is None:
+                raise PrescriptionNotFoundError("Prescription not found")
+            raise BusinessRuleError(f"Invalid status transition from {current_status} to {status}")
         
         self.db.commit()
+        self._invalidate_statistics(row.doctor_id)
         return self.get_prescription_by_id(prescription_id)
     
+    def _status_update(
+        self,
+        new_status: str,
+        notes: Optional[str],
+        *criteria,
+        updated_by: Optional[UUID] = None
+    ):
+        """
+        UPDATE moving the active prescriptions matching criteria to new_status
+        Only rows whose current status allows the transition are changed; notes
+        are appended to clinical_notes with a timestamp
+        """
+        now = datetime.utcnow()
+        values = {"status": new_status, "updated_at": now, "updated_by": updated_by}
+        if notes:
+            entry = f"[{now}] Status changed to {new_status}: {notes}"
+            values["clinical_notes"] = case(
+                (func.coalesce(Prescription.clinical_notes, '') == '', entry),
+                else_=Prescription.clinical_notes + '\n' + entry
+            )
+        
+        return update(Prescription).where(
+            *criteria,
+            Prescription.is_active == True,
+            Prescription.status.in_(STATUS_SOURCES[new_status])
+        ).values(**values)
+    
     def mark_as_printed(
         self, 
         prescription_id: UUID, 
@@ -469,6 +627,7 @@ class PrescriptionService:
         prescription.template_used = template
         
         self.db.commit()
+        self._invalidate_statistics(prescription.doctor_id)
         return prescription
     
     def validate_prescription(self, validation_request: PrescriptionValidationRequest) -> Dict[str, Any]:
@@ -514,101 +673,128 @@ class PrescriptionService:
         bulk_request: BulkPrescriptionRequest, 
         performed_by: UUID
     ) -> Dict[str, Any]:
-        """Perform bulk operations on prescriptions"""
-        results = []
-        successful = 0
-        failed = 0
+        """
+        Perform bulk operations on prescriptions
+        Each operation is one set-based UPDATE whose WHERE clause carries the
+        status-transition rule; RETURNING tells us which rows changed
+        """
+        prescription_ids = bulk_request.prescription_ids
+        new_status = BULK_STATUS_OPERATIONS.get(bulk_request.operation)
+        
+        if new_status is None:
+            stmt = update(Prescription).where(
+                Prescription.id.in_(prescription_ids),
+                Prescription.is_active == True
+            ).values(
+                is_printed=True,
+                printed_at=datetime.utcnow(),
+                template_used=bulk_request.template or "default",
+                updated_by=performed_by
+            )
+        else:
+            stmt = self._status_update(
+                new_status, bulk_request.reason, Prescription.id.in_(prescription_ids),
+                updated_by=performed_by
+            )
         
-        for prescription_id in bulk_request.prescription_ids:
-            try:
-                if bulk_request.operation == "cancel":
-                    self.update_prescription_status(
-                        prescription_id, 
-                        "cancelled", 
-                        performed_by, 
-                        bulk_request.reason
-                    )
-                elif bulk_request.operation == "complete":
-                    self.update_prescription_status(
-                        prescription_id, 
-                        "completed", 
-                        performed_by, 
-                        bulk_request.reason
-                    )
-                elif bulk_request.operation == "print":
-                    self.mark_as_printed(
-                        prescription_id, 
-                        bulk_request.template or "default"
-                    )
-                elif bulk_request.operation == "activate":
-                    self.update_prescription_status(
-                        prescription_id, 
-                        "active", 
-                        performed_by, 
-                        bulk_request.reason
-                    )
-                
-                results.append({
-                    "prescription_id": str(prescription_id),
-                    "success": True
-                })
-                successful += 1
-                
-            except Exception as e:
-                results.append({
-                    "prescription_id": str(prescription_id),
-                    "success": False,
-                    "error": str(e)
-                })
-                failed += 1
+        try:
+            rows = self.db.execute(
+                stmt.returning(Prescription.id, Prescription.doctor_id),
+                execution_options={"synchronize_session": False}
+            ).all()
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise BusinessRuleError(f"Failed to {bulk_request.operation} prescriptions: {str(e)}")
+        
+        processed = {row.id for row in rows}
+        for doctor_id in {row.doctor_id for row in rows}:
+            self._invalidate_statistics(doctor_id)
+        
+        # One lookup explains every row a status UPDATE skipped
+        skipped = [pid for pid in prescription_ids if pid not in processed]
+        current_status = {}
+        if skipped and new_status:
+            current_status = dict(self.db.query(Prescription.id, Prescription.status).filter(
+                Prescription.id.in_(skipped),
+                Prescription.is_active == True
+            ).all())
+        
+        results = []
+        for prescription_id in prescription_ids:
+            if prescription_id in processed:
+                results.append({"prescription_id": str(prescription_id), "success": True})
+                continue
+            
+            if prescription_id in current_status:
+                error = f"Invalid status transition from {current_status[prescription_id]} to {new_status}"
+            else:
+                error = "Prescription not found"
+            results.append({"prescription_id": str(prescription_id), "success": False, "error": error})
         
+        successful = sum(1 for result in results if result["success"])
         return {
-            "total_requested": len(bulk_request.prescription_ids),
+            "total_requested": len(prescription_ids),
             "successful": successful,
-            "failed": failed,
+            "failed": len(results) - successful,
             "results": results
         }
     
     def get_prescription_statistics(self, doctor_id: Optional[UUID] = None) -> Dict[str, Any]:
-        """Get prescription statistics"""
-        base_query = self.db.query(Prescription).filter(Prescription.is_active == True)
-        
-        if doctor_id:
-            base_query = base_query.filter(Prescription.doctor_id == doctor_id)
-        
-        total = base_query.count()
-        
-        status_counts = {}
-        for status in ['draft', 'active', 'dispensed', 'completed', 'cancelled', 'expired']:
-            count = base_query.filter(Prescription.status == status).count()
-            status_counts[f"{status}_prescriptions"] = count
-        
-        printed_count = base_query.filter(Prescription.is_printed == True).count()
-        
+        """
+        Get prescription statistics
+        Served from cache for PRESCRIPTION_STATISTICS_TTL seconds; prescription writes invalidate it
+        """
+        cache_key = CacheKeys.PRESCRIPTION_STATISTICS.format(doctor_id=doctor_id or "all")
+        cached = cache_manager.get(cache_key)
+        if cached:
+            return json.loads(cached)
+        
+        stats = self._compute_prescription_statistics(doctor_id)
+        cache_manager.set(cache_key, json.dumps(stats), ttl=PRESCRIPTION_STATISTICS_TTL)
+        return stats
+    
+    def _compute_prescription_statistics(self, doctor_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """
+        Run the statistics aggregates against the database
+        Every count is a FILTER aggregate over one scan of the prescriptions table
+        """
         today = date.today()
-        prescriptions_today = base_query.filter(
-            func.date(Prescription.created_at) == today
-        ).count()
-        
         week_start = today - timedelta(days=today.weekday())
-        prescriptions_this_week = base_query.filter(
-            func.date(Prescription.created_at) >= week_start
-        ).count()
-        
         month_start = today.replace(day=1)
-        prescriptions_this_month = base_query.filter(
-            func.date(Prescription.created_at) >= month_start
-        ).count()
+        created_on = func.date(Prescription.created_at)
+        
+        filters = [Prescription.is_active == True]
+        if doctor_id:
+            filters.append(Prescription.doctor_id == doctor_id)
+        
+        row = self.db.query(
+            func.count().label('total'),
+            func.count().filter(Prescription.is_printed == True).label('printed'),
+            func.count().filter(created_on == today).label('today'),
+            func.count().filter(created_on >= week_start).label('this_week'),
+            func.count().filter(created_on >= month_start).label('this_month'),
+            *[
+                func.count().filter(Prescription.status == status).label(status)
+                for status in PRESCRIPTION_STATUSES
+            ]
+        ).filter(*filters).one()
         
         return {
-            "total_prescriptions": total,
-            "printed_prescriptions": printed_count,
-            "prescriptions_today": prescriptions_today,
-            "prescriptions_this_week": prescriptions_this_week,
-            "prescriptions_this_month": prescriptions_this_month,
-            **status_counts
+            "total_prescriptions": row.total,
+            "printed_prescriptions": row.printed,
+            "prescriptions_today": row.today,
+            "prescriptions_this_week": row.this_week,
+            "prescriptions_this_month": row.this_month,
+            **{f"{status}_prescriptions": row._mapping[status] for status in PRESCRIPTION_STATUSES}
         }
     
+    def _invalidate_statistics(self, doctor_id: Optional[UUID]) -> None:
+        """Drop the system-wide and the doctor's cached statistics after a prescription write"""
+        cache_manager.delete(CacheKeys.PRESCRIPTION_STATISTICS.format(doctor_id="all"))
+        if doctor_id:
+            cache_manager.delete(CacheKeys.PRESCRIPTION_STATISTICS.format(doctor_id=doctor_id))
+    
     # Private helper methods
     
     def _get_patient_by_composite_key(self, mobile_number: str, first_name: str) -> Optional[Patient]:
@@ -652,16 +838,38 @@ class PrescriptionService:
             Appointment.is_active == True
         ).first()
     
-    def _get_prescription_with_relationships(self, prescription_id: UUID) -> Optional[Prescription]:
+    def _deny_if_exists(self, *criteria) -> None:
+        """Raise AuthorizationError when an active prescription matches criteria"""
+        exists = self.db.query(Prescription.id).filter(
+            *criteria,
+            Prescription.is_active == True
+        ).first()
+        if exists:
+            raise AuthorizationError("Access denied")
+    
+    def _get_prescription_with_relationships(
+        self,
+        prescription_id: UUID,
+        caller_doctor_id: Optional[UUID] = None
+    ) -> Optional[Prescription]:
         """Get prescription with all relationships loaded"""
-        prescription = self.db.query(Prescription).options(
+        query = self.db.query(Prescription).options(
             joinedload(Prescription.patient),
             joinedload(Prescription.doctor),
-            joinedload(Prescription.appointment)
+            joinedload(Prescription.appointment),
+            selectinload(Prescription.items).joinedload(PrescriptionItem.medicine)
         ).filter(
             Prescription.id == prescription_id,
             Prescription.is_active == True
-        ).first()
+        )
+
+        # Ownership is part of the lookup; only a miss pays for the existence check
+        if caller_doctor_id:
+            query = query.filter(Prescription.doctor_id == caller_doctor_id)
+
+        prescription = query.first()
+        if not prescription and caller_doctor_id:
+            self._deny_if_exists(Prescription.id == prescription_id)
 
         # Compute clinic_address, clinic_name and doctor details
         if prescription:
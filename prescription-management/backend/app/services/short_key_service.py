@@ -3,15 +3,18 @@ Short Key Service for Quick Prescription Creation
 Handles short key CRUD operations and medicine group management
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, func, desc, asc, update, select
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
+from pydantic import TypeAdapter
+import json
 import logging
 
 from app.models.short_key import ShortKey, ShortKeyMedicine, find_short_key_by_code, get_short_keys_for_user, search_short_keys, validate_short_key_code_uniqueness
 from app.models.medicine import Medicine
-from app.schemas.short_key import ShortKeyCreate, ShortKeyUpdate, ShortKeySearchParams, ShortKeyMedicineCreate, ShortKeyMedicineUpdate
+from app.schemas.short_key import ShortKeyCreate, ShortKeyUpdate, ShortKeySearchParams, ShortKeyMedicineCreate, ShortKeyMedicineUpdate, ShortKeyResponse
+from app.core.database import cache_manager, CacheKeys
 from app.core.exceptions import (
     NotFoundError, 
     ValidationError, 
@@ -21,6 +24,34 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Popular lists and statistics are cached per user for this many seconds.
+# Short key writes bump the cache generation, which retires them; usage
+# counts only refresh when the TTL expires.
+SHORT_KEY_CACHE_TTL = 60
+
+# Code lookups back UI autocomplete. Codes are unique, so entries are keyed by
+# code alone (access is checked on read) and writes delete the exact key.
+SHORT_KEY_CODE_CACHE_TTL = 300
+
+_SHORT_KEY_LIST_ADAPTER = TypeAdapter(List[ShortKeyResponse])
+
+# Appended to a taken code to suggest alternatives; codes are at most 20 characters
+CODE_SUGGESTION_SUFFIXES = ("1", "2", "V2")
+SHORT_KEY_CODE_MAX_LENGTH = 20
+
+# Bulk operation -> (is_active state the row must be in, or None for any; values to set)
+BULK_SHORT_KEY_UPDATES = {
+    'activate': (False, {'is_active': True}),
+    'deactivate': (True, {'is_active': False}),
+    'make_global': (None, {'is_global': True}),
+    'make_personal': (None, {'is_global': False}),
+}
+
+
+def _short_key_columns(short_key: ShortKey) -> Dict[str, Any]:
+    """Column values of a short key; ShortKey.to_dict also walks its medicines"""
+    return {column.key: getattr(short_key, column.key) for column in ShortKey.__table__.columns}
+
 
 class ShortKeyService:
     """Service class for short key management"""
@@ -75,14 +106,15 @@ class ShortKeyService:
                     db.add(short_key_medicine)
             
             db.commit()
+            self._invalidate_short_key_cache()
             db.refresh(short_key)
             
-            logger.info(f"Created short key: {short_key.code} - {short_key.name}")
+            logger.info("Created short key: %s - %s", short_key.code, short_key.name)
             return short_key
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error creating short key: {str(e)}")
+            logger.error("Error creating short key: %s", e)
             raise BusinessRuleError(f"Failed to create short key: {str(e)}")
     
     def get_short_key_by_id(self, db: Session, short_key_id: UUID, user_id: Optional[UUID] = None) -> Optional[ShortKey]:
@@ -107,6 +139,28 @@ class ShortKeyService:
         """Get short key by code with permission check"""
         return find_short_key_by_code(db, code, user_id)
     
+    def get_short_key_by_code_json(self, db: Session, code: str, user_id: UUID) -> Optional[str]:
+        """
+        Get short key by code as serialized ShortKeyResponse (None if not accessible)
+        Served from cache for SHORT_KEY_CODE_CACHE_TTL seconds
+        """
+        cache_key = CacheKeys.SHORT_KEY_BY_CODE.format(code=code.upper())
+        payload = cache_manager.get(cache_key)
+        if not payload:
+            short_key = self.get_short_key_by_code(db, code)
+            if not short_key:
+                return None
+            
+            medicines = self._load_medicines(db, short_key.id)
+            payload = self.short_key_response(_short_key_columns(short_key), medicines).model_dump_json()
+            cache_manager.set(cache_key, payload, ttl=SHORT_KEY_CODE_CACHE_TTL)
+        
+        # Users can access global short keys or their own
+        access = json.loads(payload)
+        if not access["is_global"] and access["created_by"] != str(user_id):
+            return None
+        return payload
+    
     def update_short_key(self, db: Session, short_key_id: UUID, short_key_data: ShortKeyUpdate, user_id: UUID) -> Optional[ShortKey]:
         """
         Update short key information
@@ -125,6 +179,7 @@ class ShortKeyService:
             raise ValidationError("Only the creator can update this short key")
         
         update_data = short_key_data.dict(exclude_unset=True)
+        previous_code = short_key.code
         
         # Update fields
         for field, value in update_data.items():
@@ -133,14 +188,15 @@ class ShortKeyService:
         
         try:
             db.commit()
+            self._invalidate_short_key_cache(previous_code, short_key.code)
             db.refresh(short_key)
             
-            logger.info(f"Updated short key: {short_key.code}")
+            logger.info("Updated short key: %s", short_key.code)
             return short_key
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating short key: {str(e)}")
+            logger.error("Error updating short key: %s", e)
             raise BusinessRuleError(f"Failed to update short key: {str(e)}")
     
     def deactivate_short_key(self, db: Session, short_key_id: UUID, user_id: UUID) -> bool:
@@ -161,12 +217,13 @@ class ShortKeyService:
         
         try:
             db.commit()
-            logger.info(f"Deactivated short key: {short_key.code}")
+            self._invalidate_short_key_cache(short_key.code)
+            logger.info("Deactivated short key: %s", short_key.code)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deactivating short key: {str(e)}")
+            logger.error("Error deactivating short key: %s", e)
             raise BusinessRuleError(f"Failed to deactivate short key: {str(e)}")
     
     def reactivate_short_key(self, db: Session, short_key_id: UUID, user_id: UUID) -> Optional[ShortKey]:
@@ -191,13 +248,14 @@ class ShortKeyService:
         
         try:
             db.commit()
+            self._invalidate_short_key_cache(short_key.code)
             db.refresh(short_key)
-            logger.info(f"Reactivated short key: {short_key.code}")
+            logger.info("Reactivated short key: %s", short_key.code)
             return short_key
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error reactivating short key: {str(e)}")
+            logger.error("Error reactivating short key: %s", e)
             raise BusinessRuleError(f"Failed to reactivate short key: {str(e)}")
     
     # Medicine Management within Short Keys
@@ -256,14 +314,15 @@ class ShortKeyService:
         try:
             db.add(short_key_medicine)
             db.commit()
+            self._invalidate_short_key_cache(short_key.code)
             db.refresh(short_key_medicine)
             
-            logger.info(f"Added medicine to short key {short_key.code}: {medicine.name}")
+            logger.info("Added medicine to short key %s: %s", short_key.code, medicine.name)
             return short_key_medicine
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error adding medicine to short key: {str(e)}")
+            logger.error("Error adding medicine to short key: %s", e)
             raise BusinessRuleError(f"Failed to add medicine to short key: {str(e)}")
     
     def update_short_key_medicine(self, db: Session, short_key_id: UUID, medicine_id: UUID, medicine_data: ShortKeyMedicineUpdate, user_id: UUID) -> Optional[ShortKeyMedicine]:
@@ -304,14 +363,15 @@ class ShortKeyService:
         
         try:
             db.commit()
+            self._invalidate_short_key_cache(short_key.code)
             db.refresh(short_key_medicine)
             
-            logger.info(f"Updated medicine in short key {short_key.code}")
+            logger.info("Updated medicine in short key %s", short_key.code)
             return short_key_medicine
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating short key medicine: {str(e)}")
+            logger.error("Error updating short key medicine: %s", e)
             raise BusinessRuleError(f"Failed to update medicine in short key: {str(e)}")
     
     def remove_medicine_from_short_key(self, db: Session, short_key_id: UUID, medicine_id: UUID, user_id: UUID) -> bool:
@@ -335,13 +395,14 @@ class ShortKeyService:
         try:
             db.delete(short_key_medicine)
             db.commit()
+            self._invalidate_short_key_cache(short_key.code)
             
-            logger.info(f"Removed medicine from short key {short_key.code}")
+            logger.info("Removed medicine from short key %s", short_key.code)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error removing medicine from short key: {str(e)}")
+            logger.error("Error removing medicine from short key: %s", e)
             raise BusinessRuleError(f"Failed to remove medicine from short key: {str(e)}")
     
     # Search and Query Operations
@@ -390,9 +451,6 @@ class ShortKeyService:
             )
             query = query.filter(search_filter)
         
-        # Get total count before pagination
-        total_count = query.count()
-        
         # Apply sorting
         sort_column = getattr(ShortKey, search_params.sort_by, ShortKey.code)
         if search_params.sort_order == "desc":
@@ -400,9 +458,16 @@ class ShortKeyService:
         else:
             query = query.order_by(asc(sort_column))
         
-        # Apply pagination
+        # Apply pagination; COUNT(*) OVER () rides along with the page instead
+        # of a separate COUNT query
         offset = (search_params.page - 1) * search_params.page_size
-        short_keys = query.offset(offset).limit(search_params.page_size).all()
+        rows = query.add_columns(func.count().over().label('total')).offset(offset).limit(search_params.page_size).all()
+        short_keys = [row[0] for row in rows]
+        if rows:
+            total_count = rows[0].total
+        else:
+            # Page past the end returns no rows to carry the window count
+            total_count = query.count() if offset else 0
         
         return short_keys, total_count
     
@@ -424,41 +489,119 @@ class ShortKeyService:
         
         return query.order_by(desc(ShortKey.usage_count)).limit(limit).all()
     
+    def get_popular_short_keys_json(self, db: Session, user_id: UUID, limit: int = 10) -> str:
+        """
+        Get most popular short keys as a serialized ShortKeyResponse list
+        Served from cache for SHORT_KEY_CACHE_TTL seconds; short key writes invalidate it
+        """
+        cache_key = CacheKeys.SHORT_KEYS_POPULAR.format(
+            generation=self._cache_generation(), user_id=user_id, limit=limit
+        )
+        cached = cache_manager.get(cache_key)
+        if cached:
+            return cached
+        
+        short_keys = self.get_popular_short_keys(db, user_id, limit)
+        payload = _SHORT_KEY_LIST_ADAPTER.dump_json(
+            _SHORT_KEY_LIST_ADAPTER.validate_python(short_keys, from_attributes=True)
+        ).decode()
+        cache_manager.set(cache_key, payload, ttl=SHORT_KEY_CACHE_TTL)
+        return payload
+    
     # Usage Tracking
     
-    def use_short_key(self, db: Session, short_key_id: UUID, user_id: UUID) -> Optional[ShortKey]:
-        """Track short key usage and return the short key with medicines"""
-        short_key = self.get_short_key_by_id(db, short_key_id, user_id)
-        if not short_key:
+    def use_short_key(self, db: Session, short_key_id: UUID, user_id: UUID) -> Tuple[Dict[str, Any], List[ShortKeyMedicine]]:
+        """Track short key usage and return the short key's columns with its medicines"""
+        usage = self._record_usage(db, user_id, ShortKey.id == short_key_id)
+        if not usage:
             raise NotFoundError(f"Short key not found: {short_key_id}")
         
-        # Increment usage count
-        short_key.increment_usage()
+        return usage
+    
+    def _record_usage(self, db: Session, user_id: UUID, *criteria) -> Optional[Tuple[Dict[str, Any], List[ShortKeyMedicine]]]:
+        """
+        Increment usage of the accessible active short key matching criteria
+        One UPDATE ... RETURNING finds and bumps the row, so there is no separate
+        lookup and concurrent uses cannot overwrite each other's increment
+        """
+        stmt = update(ShortKey).where(
+            *criteria,
+            ShortKey.is_active == True,
+            or_(
+                ShortKey.is_global == True,
+                ShortKey.created_by == user_id
+            )
+        ).values(
+            usage_count=func.coalesce(ShortKey.usage_count, 0) + 1
+        ).returning(*ShortKey.__table__.columns)
         
         try:
+            # Copy the RETURNING row before commit; a returned entity would be
+            # expired by the commit and refreshed with another SELECT
+            row = db.execute(
+                stmt, execution_options={"synchronize_session": False}
+            ).mappings().first()
+            short_key = dict(row) if row else None
             db.commit()
-            db.refresh(short_key)
-            
-            logger.info(f"Used short key: {short_key.code} (usage: {short_key.usage_count})")
-            return short_key
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error tracking short key usage: {str(e)}")
+            logger.error("Error tracking short key usage: %s", e)
             raise BusinessRuleError(f"Failed to track usage: {str(e)}")
+        
+        if not short_key:
+            return None
+        
+        # The cached lookup carries usage_count; popular lists and statistics
+        # pick up new counts when their TTL expires
+        self._drop_code_lookups(short_key["code"])
+        logger.info("Used short key: %s (usage: %s)", short_key["code"], short_key["usage_count"])
+        return short_key, self._load_medicines(db, short_key["id"])
+    
+    def _load_medicines(self, db: Session, short_key_id: UUID) -> List[ShortKeyMedicine]:
+        """
+        Load a short key's medicines together with their Medicine rows in one query
+        ShortKey.medicines is a dynamic relationship that queries again on every
+        access, so callers build responses from the returned list instead
+        """
+        return db.query(ShortKeyMedicine).options(
+            joinedload(ShortKeyMedicine.medicine)
+        ).filter(
+            ShortKeyMedicine.short_key_id == short_key_id
+        ).order_by(ShortKeyMedicine.sequence_order).all()
+    
+    def short_key_response(self, short_key: Dict[str, Any], medicines: List[ShortKeyMedicine]) -> ShortKeyResponse:
+        """Build a ShortKeyResponse from short key columns and its already loaded medicines"""
+        return ShortKeyResponse.model_validate({**short_key, "medicines": medicines})
     
-    def use_short_key_by_code(self, db: Session, code: str, user_id: UUID) -> Optional[ShortKey]:
+    def use_short_key_by_code(self, db: Session, code: str, user_id: UUID) -> Tuple[Dict[str, Any], List[ShortKeyMedicine]]:
         """Track short key usage by code"""
-        short_key = self.get_short_key_by_code(db, code, user_id)
-        if not short_key:
+        usage = self._record_usage(db, user_id, ShortKey.code == code.upper())
+        if not usage:
             raise NotFoundError(f"Short key not found: {code}")
         
-        return self.use_short_key(db, short_key.id, user_id)
+        return usage
     
     # Statistics and Analytics
     
     def get_short_key_statistics(self, db: Session, user_id: Optional[UUID] = None) -> Dict[str, Any]:
-        """Get short key statistics"""
+        """
+        Get short key statistics
+        Served from cache for SHORT_KEY_CACHE_TTL seconds; short key writes invalidate it
+        """
+        cache_key = CacheKeys.SHORT_KEY_STATISTICS.format(
+            generation=self._cache_generation(), user_id=user_id or "all"
+        )
+        cached = cache_manager.get(cache_key)
+        if cached:
+            return json.loads(cached)
+        
+        stats = self._compute_short_key_statistics(db, user_id)
+        cache_manager.set(cache_key, json.dumps(stats), ttl=SHORT_KEY_CACHE_TTL)
+        return stats
+    
+    def _compute_short_key_statistics(self, db: Session, user_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """Run the statistics queries against the database"""
         base_query = db.query(ShortKey).filter(ShortKey.is_active == True)
         
         if user_id:
@@ -511,16 +654,55 @@ class ShortKeyService:
                 'recent_activity': []  # Not implemented yet
             }
     
+    def _cache_generation(self) -> str:
+        """Current generation of the popular/statistics cache keys"""
+        return cache_manager.get(CacheKeys.SHORT_KEY_CACHE_GENERATION) or "0"
+    
+    def _invalidate_short_key_cache(self, *codes: str) -> None:
+        """
+        Drop cached popular lists, statistics and the given codes' lookups after a short key write
+        Global short keys appear in every user's entries, so the generation shared by
+        all users is bumped; orphaned entries expire with their TTL
+        """
+        cache_manager.incr(CacheKeys.SHORT_KEY_CACHE_GENERATION)
+        self._drop_code_lookups(*codes)
+    
+    def _drop_code_lookups(self, *codes: str) -> None:
+        """Delete the cached by-code lookups of the given codes by exact key"""
+        if codes:
+            cache_manager.delete(*{CacheKeys.SHORT_KEY_BY_CODE.format(code=code.upper()) for code in codes})
+    
     # Validation Helpers
     
     def validate_code_unique(self, db: Session, code: str, exclude_id: Optional[UUID] = None) -> bool:
         """Validate that short key code is unique"""
         return validate_short_key_code_uniqueness(db, code, exclude_id)
     
+    def suggest_available_codes(self, db: Session, code: str) -> List[str]:
+        """
+        Suggest alternatives for a taken code, checked against every existing code in one query
+        Inactive short keys still hold their code (the column is UNIQUE), so they count as taken
+        """
+        candidates = [
+            f"{code}{suffix}" for suffix in CODE_SUGGESTION_SUFFIXES
+            if len(code) + len(suffix) <= SHORT_KEY_CODE_MAX_LENGTH
+        ]
+        if not candidates:
+            return []
+        
+        taken = set(db.execute(
+            select(ShortKey.code).where(ShortKey.code.in_(candidates))
+        ).scalars().all())
+        return [candidate for candidate in candidates if candidate not in taken]
+    
     # Bulk Operations
     
     def bulk_update_short_keys(self, db: Session, short_key_ids: List[UUID], operation: str, user_id: UUID) -> Dict[str, Any]:
-        """Perform bulk operations on short keys"""
+        """
+        Perform bulk operations on short keys
+        Each operation is one set-based UPDATE scoped to the caller's short keys;
+        RETURNING tells us which rows changed
+        """
         result = {
             'operation': operation,
             'total_requested': len(short_key_ids),
@@ -530,45 +712,53 @@ class ShortKeyService:
             'processed_ids': []
         }
         
+        if operation not in BULK_SHORT_KEY_UPDATES:
+            return result
+        
+        required_active, values = BULK_SHORT_KEY_UPDATES[operation]
+        stmt = update(ShortKey).where(
+            ShortKey.id.in_(short_key_ids),
+            ShortKey.created_by == user_id
+        ).values(**values)
+        if required_active is not None:
+            stmt = stmt.where(ShortKey.is_active == required_active)
+        
+        try:
+            rows = db.execute(
+                stmt.returning(ShortKey.id, ShortKey.code),
+                execution_options={"synchronize_session": False}
+            ).all()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error("Bulk operation %s failed: %s", operation, e)
+            raise BusinessRuleError(f"Failed to perform bulk operation: {str(e)}")
+        
+        processed = {row.id for row in rows}
+        if rows:
+            self._invalidate_short_key_cache(*(row.code for row in rows))
+        
+        # One lookup explains every row the UPDATE skipped
+        skipped = [short_key_id for short_key_id in short_key_ids if short_key_id not in processed]
+        owners = {}
+        if skipped:
+            owners = dict(db.query(ShortKey.id, ShortKey.created_by).filter(
+                ShortKey.id.in_(skipped)
+            ).all())
+        
         for short_key_id in short_key_ids:
-            try:
-                if operation == 'activate':
-                    short_key = self.reactivate_short_key(db, short_key_id, user_id)
-                    if short_key:
-                        result['successful'] += 1
-                        result['processed_ids'].append(short_key_id)
-                
-                elif operation == 'deactivate':
-                    success = self.deactivate_short_key(db, short_key_id, user_id)
-                    if success:
-                        result['successful'] += 1
-                        result['processed_ids'].append(short_key_id)
-                
-                elif operation == 'make_global':
-                    short_key = db.query(ShortKey).filter(
-                        ShortKey.id == short_key_id,
-                        ShortKey.created_by == user_id
-                    ).first()
-                    if short_key:
-                        short_key.is_global = True
-                        db.commit()
-                        result['successful'] += 1
-                        result['processed_ids'].append(short_key_id)
-                
-                elif operation == 'make_personal':
-                    short_key = db.query(ShortKey).filter(
-                        ShortKey.id == short_key_id,
-                        ShortKey.created_by == user_id
-                    ).first()
-                    if short_key:
-                        short_key.is_global = False
-                        db.commit()
-                        result['successful'] += 1
-                        result['processed_ids'].append(short_key_id)
-                
-            except Exception as e:
-                result['failed'] += 1
-                result['errors'].append(f"Short key {short_key_id}: {str(e)}")
-                logger.error(f"Bulk operation failed for short key {short_key_id}: {str(e)}")
+            if short_key_id in processed:
+                result['successful'] += 1
+                result['processed_ids'].append(short_key_id)
+                continue
+            
+            if short_key_id in owners and owners[short_key_id] != user_id:
+                error = "Only the creator can modify this short key"
+            elif required_active is False:
+                error = f"Inactive short key not found: {short_key_id}"
+            else:
+                error = f"Short key not found: {short_key_id}"
+            result['failed'] += 1
+            result['errors'].append(f"Short key {short_key_id}: {error}")
         
         return result
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Centralized Mobile Number Validation Utilities
+Shared normalization for patient mobile numbers (composite key) and contact phones
+"""
+
+import re
+
+from app.core.config import settings
+
+# Compiled once at import; mobile numbers are normalized on every patient
+# request (composite key validation, search filters)
+_NON_DIAL_CHARS = re.compile(r'[^\d+]')
+
+# Indian mobile number, as configured for the composite key
+MOBILE_NUMBER_PATTERN = re.compile(settings.MOBILE_NUMBER_REGEX)
+
+# Contact phones accept an optional leading '+'
+CONTACT_PHONE_PATTERN = re.compile(r'^\+?[6-9]\d{9}$')
+
+
+def normalize_mobile(value: str) -> str:
+    """
+    Strip formatting (spaces, dashes, brackets) from a mobile number
+    Keeps digits and '+'; plain ASCII digit strings are returned as-is
+    """
+    if value.isascii() and value.isdigit():
+        return value
+    return _NON_DIAL_CHARS.sub('', value)
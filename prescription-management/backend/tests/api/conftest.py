@@ -0,0 +1,40 @@
+"""
+Shared fixtures for API endpoint tests
+Endpoint tests that stub the service layer run against api_client
+"""
+
+import pytest
+from typing import Generator
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.deps.auth import get_current_user
+from app.core.database import get_db
+from app.models.user import User
+
+
+@pytest.fixture
+def api_user() -> User:
+    """Admin user that api_client requests are authenticated as"""
+    return User(
+        id=uuid4(),
+        email="admin@example.com",
+        hashed_password="hashed_admin_password",
+        first_name="Admin",
+        last_name="User",
+        role="admin",
+        is_active=True
+    )
+
+
+@pytest.fixture
+def api_client(api_user: User) -> Generator[TestClient, None, None]:
+    """
+    Test client for endpoint tests that stub the service layer
+    Requests authenticate as api_user and no database session is opened
+    """
+    app.dependency_overrides[get_current_user] = lambda: api_user
+    app.dependency_overrides[get_db] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
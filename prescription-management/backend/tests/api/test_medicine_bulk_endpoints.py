@@ -0,0 +1,101 @@
+"""
+Test cases for bulk medicine operations
+Covers inline execution, the 202 background job flow and job ownership
+Module: Medicine API
+"""
+
+import pytest
+from contextlib import contextmanager
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import medicines as medicine_endpoints
+from app.api.v1.endpoints.medicines import BULK_BACKGROUND_THRESHOLD
+from app.services import medicine_service as medicine_service_module
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def bulk_calls(monkeypatch):
+    """Record bulk_update_medicines calls instead of touching the database"""
+    calls = []
+
+    def bulk_update_medicines(db, medicine_ids, operation):
+        calls.append((medicine_ids, operation))
+        return {
+            'operation': operation,
+            'total_requested': len(medicine_ids),
+            'successful': len(medicine_ids),
+            'failed': 0,
+            'errors': [],
+            'processed_ids': medicine_ids
+        }
+
+    @contextmanager
+    def get_db_context():
+        yield None
+
+    monkeypatch.setattr(medicine_endpoints.medicine_service, "bulk_update_medicines", bulk_update_medicines)
+    monkeypatch.setattr(medicine_service_module, "get_db_context", get_db_context)
+    return calls
+
+
+def _medicine_ids(count: int) -> list:
+    return [str(uuid4()) for _ in range(count)]
+
+
+class TestBulkMedicineOperations:
+    """Test class for POST /medicines/bulk and GET /medicines/bulk/{job_id}"""
+
+    def test_small_batch_runs_inline(self, api_client: TestClient, fake_cache, bulk_calls):
+        """Batches up to the threshold are processed in the request"""
+        response = api_client.post(
+            "/api/v1/medicines/bulk",
+            json={"medicine_ids": _medicine_ids(3), "operation": "deactivate"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["successful"] == 3
+        assert len(bulk_calls) == 1
+
+    def test_large_batch_is_queued_and_pollable(self, api_client: TestClient, fake_cache, bulk_calls):
+        """Batches over the threshold return 202 and complete in the background"""
+        response = api_client.post(
+            "/api/v1/medicines/bulk",
+            json={"medicine_ids": _medicine_ids(BULK_BACKGROUND_THRESHOLD + 1), "operation": "deactivate"}
+        )
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        response = api_client.get(f"/api/v1/medicines/bulk/{job['job_id']}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["result"]["successful"] == BULK_BACKGROUND_THRESHOLD + 1
+
+    def test_job_is_hidden_from_other_users(self, api_client: TestClient, api_user, fake_cache, bulk_calls):
+        """Only the user who queued a job can poll it"""
+        response = api_client.post(
+            "/api/v1/medicines/bulk",
+            json={"medicine_ids": _medicine_ids(BULK_BACKGROUND_THRESHOLD + 1), "operation": "activate"}
+        )
+        job_id = response.json()["job_id"]
+
+        api_user.id = uuid4()
+        response = api_client.get(f"/api/v1/medicines/bulk/{job_id}")
+        assert response.status_code == 404
+
+    def test_large_batch_rejected_without_job_store(self, api_client: TestClient, fake_cache, bulk_calls):
+        """Large batches are refused with 503, not run inline, when jobs cannot be stored"""
+        fake_cache.available = False
+
+        response = api_client.post(
+            "/api/v1/medicines/bulk",
+            json={"medicine_ids": _medicine_ids(BULK_BACKGROUND_THRESHOLD + 1), "operation": "delete"}
+        )
+
+        assert response.status_code == 503
+        assert bulk_calls == []
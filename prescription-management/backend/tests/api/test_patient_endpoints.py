@@ -0,0 +1,112 @@
+"""
+Test cases for Patient API endpoints
+Covers the bulk family registration endpoint and patient list paging
+Module: Patient API
+"""
+
+import pytest
+from datetime import date, datetime
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import patients as patient_endpoints
+from app.core.database import get_db
+from app.core.exceptions import InvalidInputError, FamilyLimitExceededError
+from app.main import app
+from app.models.patient import Patient
+
+pytestmark = pytest.mark.stub_db
+
+
+def _member(first_name: str) -> dict:
+    return {
+        "first_name": first_name,
+        "last_name": "Doe",
+        "date_of_birth": "1992-05-20",
+        "gender": "female",
+        "relationship_to_primary": "spouse",
+        "primary_contact_mobile": "9876543210"
+    }
+
+
+class TestFamilyBulkCreate:
+    """Test class for POST /patients/families/{mobile_number}/bulk"""
+
+    def test_duplicate_names_in_batch_rejected(self, api_client: TestClient):
+        """First names must be unique within one batch"""
+        response = api_client.post(
+            "/api/v1/patients/families/9876543210/bulk",
+            json={"members": [_member("Jane"), _member("Jane")]}
+        )
+        assert response.status_code == 422
+
+    def test_members_passed_to_service_in_one_call(self, api_client: TestClient, api_user, monkeypatch):
+        """The whole batch is handed to the service at once"""
+        calls = []
+
+        def create_family_members_bulk(db, mobile_number, members, created_by):
+            calls.append((mobile_number, [member.first_name for member in members], created_by))
+            return []
+
+        monkeypatch.setattr(patient_endpoints.patient_service, "create_family_members_bulk", create_family_members_bulk)
+
+        response = api_client.post(
+            "/api/v1/patients/families/9876543210/bulk",
+            json={"members": [_member("Jane"), _member("Jack")]}
+        )
+
+        assert response.status_code == 201
+        assert response.json() == []
+        assert calls == [("9876543210", ["Jane", "Jack"], api_user.id)]
+
+    @pytest.mark.parametrize("error, status_code", [
+        (InvalidInputError("Primary family member must be registered first"), 400),
+        (FamilyLimitExceededError("Maximum 10 family members allowed per mobile number"), 422),
+    ])
+    def test_service_errors(self, api_client: TestClient, monkeypatch, error, status_code):
+        """Patient endpoints keep 400 for validation errors and 422 for business rules"""
+        def create_family_members_bulk(db, mobile_number, members, created_by):
+            raise error
+
+        monkeypatch.setattr(patient_endpoints.patient_service, "create_family_members_bulk", create_family_members_bulk)
+
+        response = api_client.post(
+            "/api/v1/patients/families/9876543210/bulk",
+            json={"members": [_member("Jane")]}
+        )
+        assert response.status_code == status_code
+        assert response.json()["detail"] == error.message
+
+
+class TestKeysetCursor:
+    """Cursor paging on GET /patients/"""
+
+    def test_invalid_cursor_rejected(self, api_client: TestClient):
+        """A cursor not produced by next_cursor is a 400, not a server error"""
+        # Unbound session: the query is built but must not run before the cursor is decoded
+        app.dependency_overrides[get_db] = lambda: Session()
+
+        response = api_client.get("/api/v1/patients/?cursor=not-a-cursor")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
+    def test_page_serialized_with_next_cursor(self, api_client: TestClient, monkeypatch):
+        """A full first_name page is returned as PatientListResponse JSON with a cursor"""
+        patient = Patient(
+            id=uuid4(), mobile_number="9876543210", first_name="Jane", last_name="Doe",
+            date_of_birth=date(1992, 5, 20), gender="female", relationship_to_primary="self",
+            is_active=True, created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1)
+        )
+        monkeypatch.setattr(
+            patient_endpoints.patient_service, "search_patients", lambda db, params: ([patient], 3)
+        )
+
+        response = api_client.get("/api/v1/patients/?page_size=1&sort_by=first_name")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [row["id"] for row in body["patients"]] == [str(patient.id)]
+        assert body["patients"][0]["full_name"] == "Jane Doe"
+        assert body["total"] == 3 and body["total_pages"] == 3
+        assert body["next_cursor"] == patient_endpoints.patient_service.encode_cursor(patient)
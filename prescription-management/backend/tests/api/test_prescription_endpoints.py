@@ -0,0 +1,50 @@
+"""
+Test cases for Prescription API history endpoints
+Covers streaming from the request session and errors raised before streaming
+Module: Prescription API
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db
+from app.core.exceptions import PatientNotFoundError
+from app.main import app
+from app.services.prescription_service import PrescriptionService
+
+pytestmark = pytest.mark.stub_db
+
+
+class TestPatientHistoryStream:
+    """GET /prescriptions/patient/{mobile_number}/{first_name}"""
+
+    def test_stream_uses_request_session(self, api_client: TestClient, monkeypatch):
+        """History rows are read through the get_db session, not a second one"""
+        request_session = object()
+        app.dependency_overrides[get_db] = lambda: request_session
+        sessions = []
+
+        def get_patient_prescriptions(service, *args, **kwargs):
+            sessions.append(service.db)
+            return iter([])
+
+        monkeypatch.setattr(PrescriptionService, "get_patient_prescriptions", get_patient_prescriptions)
+
+        response = api_client.get("/api/v1/prescriptions/patient/9876543210/Jane")
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert sessions == [request_session]
+
+    def test_query_error_before_streaming(self, api_client: TestClient, monkeypatch):
+        """A failing first batch is an error response, not a truncated 200 body"""
+        def get_patient_prescriptions(service, *args, **kwargs):
+            raise PatientNotFoundError("Patient not found")
+            yield
+
+        monkeypatch.setattr(PrescriptionService, "get_patient_prescriptions", get_patient_prescriptions)
+
+        response = api_client.get("/api/v1/prescriptions/patient/9876543210/Jane")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Patient not found"
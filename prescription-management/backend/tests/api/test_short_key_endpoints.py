@@ -0,0 +1,111 @@
+"""
+Test cases for Short Key API endpoints
+Covers ETag/304 handling, query validation and domain error status codes
+Module: Short Key API
+"""
+
+import json
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import short_keys as short_key_endpoints
+from app.core.database import get_db
+from app.core.exceptions import ValidationError, NotFoundError, BusinessRuleError
+from app.main import app
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def short_key_service():
+    """The endpoint module's service instance; tests stub it with monkeypatch"""
+    return short_key_endpoints.short_key_service
+
+
+class TestShortKeyETags:
+    """Conditional GET support on short key reads"""
+
+    def test_get_by_id_returns_etag_then_304(self, api_client: TestClient, short_key_service, make_short_key, monkeypatch):
+        """A matching If-None-Match is answered with 304 and no body"""
+        short_key = make_short_key()
+        monkeypatch.setattr(short_key_service, "get_short_key_by_id", lambda db, short_key_id, user_id: short_key)
+
+        response = api_client.get(f"/api/v1/short-keys/{short_key.id}")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert response.json()["code"] == "FLU"
+
+        response = api_client.get(f"/api/v1/short-keys/{short_key.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_get_by_code_etag_changes_with_content(self, api_client: TestClient, short_key_service, monkeypatch):
+        """A stale ETag gets the new body, not a 304"""
+        payload = {"code": "FLU", "usage_count": 1}
+        monkeypatch.setattr(
+            short_key_service, "get_short_key_by_code_json",
+            lambda db, code, user_id: json.dumps(payload)
+        )
+
+        etag = api_client.get("/api/v1/short-keys/code/FLU").headers["ETag"]
+        payload["usage_count"] = 2
+
+        response = api_client.get("/api/v1/short-keys/code/FLU", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["usage_count"] == 2
+
+
+class TestShortKeyListValidation:
+    """Query parameter validation on GET /short-keys/"""
+
+    @pytest.mark.parametrize("query", ["sort_order=up", "sort_by=medicines"])
+    def test_invalid_sort_is_rejected(self, api_client: TestClient, query: str):
+        """Only asc/desc and real sortable columns are accepted"""
+        response = api_client.get(f"/api/v1/short-keys/?{query}")
+        assert response.status_code == 422
+
+
+class TestDomainErrorMapping:
+    """Service exceptions propagate to the shared handler in app.main"""
+
+    @pytest.mark.parametrize("error, status_code", [
+        (ValidationError("Only the creator can deactivate this short key"), 422),
+        (BusinessRuleError("Failed to deactivate short key"), 422),
+        (NotFoundError("Short key not found"), 404),
+    ])
+    def test_short_key_errors(self, api_client: TestClient, short_key_service, monkeypatch, error, status_code):
+        """Short key endpoints keep their original status codes"""
+        def deactivate_short_key(db, short_key_id, user_id):
+            raise error
+
+        monkeypatch.setattr(short_key_service, "deactivate_short_key", deactivate_short_key)
+
+        response = api_client.delete(f"/api/v1/short-keys/{uuid4()}")
+        assert response.status_code == status_code
+        assert response.json()["detail"] == error.message
+
+
+class TestUseShortKey:
+    """Test class for POST /short-keys/use/{code}"""
+
+    def test_use_is_two_round_trips(
+        self, api_client: TestClient, fake_cache, short_key_db, seeded_short_key, executed_sql
+    ):
+        """One UPDATE ... RETURNING, then one joined SELECT for the medicines"""
+        app.dependency_overrides[get_db] = lambda: short_key_db
+        executed_sql.clear()
+
+        response = api_client.post("/api/v1/short-keys/use/flu")
+
+        assert response.status_code == 200
+        data = response.json()
+        names = ["Paracetamol", "Cetirizine", "Vitamin C"]
+        assert [item["medicine_name"] for item in data["prescription_items"]] == names
+        assert [medicine["medicine"]["name"] for medicine in data["short_key"]["medicines"]] == names
+        assert data["short_key"]["usage_count"] == 1
+
+        update_sql, medicines_sql = executed_sql
+        assert update_sql.startswith("UPDATE short_keys") and "RETURNING" in update_sql
+        assert "FROM short_key_medicines LEFT OUTER JOIN medicines" in medicines_sql
@@ -5,18 +5,38 @@ Provides common test setup and utilities
 
 import pytest
 import asyncio
-from typing import Generator, Dict, Any
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Generator, Dict, Any, List
+from uuid import uuid4
+from sqlalchemy import ARRAY, MetaData, create_engine, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.core.database import Base, get_db
+from app.models.medicine import Medicine
+from app.models.short_key import ShortKey, ShortKeyMedicine
+from app.models.user import User
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 
 # Import all models to ensure they are registered with Base.metadata
-import app.models  # This imports all models
+from app import models  # noqa: F401  This imports all models
+
+
+# SQLite has no native UUID or ARRAY column types
+@compiles(UUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(ARRAY, "sqlite")
+def compile_array_for_sqlite(type_, compiler, **kw):
+    return "JSON"
 
 
 # Test database configuration
@@ -156,9 +176,149 @@ def event_loop():
     loop.close()
 
 
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line("markers", "stub_db: the test stubs the database layer and needs no test database")
+
+
 # Test data cleanup helper
 @pytest.fixture(autouse=True)
-def cleanup_test_data(db_session):
+def cleanup_test_data(request):
     """Automatically clean up test data after each test"""
+    if request.node.get_closest_marker("stub_db") is None:
+        request.getfixturevalue("db_session")
     yield
-    # Cleanup logic can be added here if needed
\ No newline at end of file
+    # Cleanup logic can be added here if needed
+
+
+class FakeCache:
+    """In-memory stand-in for the Redis CacheManager"""
+    
+    def __init__(self):
+        self.store: Dict[str, Any] = {}
+        self.available = True
+    
+    def get(self, key: str) -> Any:
+        return self.store.get(key) if self.available else None
+    
+    def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        if not self.available:
+            return False
+        self.store[key] = value
+        return True
+    
+    def delete(self, *keys: str) -> bool:
+        for key in keys:
+            self.store.pop(key, None)
+        return True
+    
+    def incr(self, key: str) -> int:
+        self.store[key] = str(int(self.store.get(key, "0")) + 1)
+        return int(self.store[key])
+    
+    def delete_pattern(self, pattern: str) -> int:
+        raise AssertionError(f"delete_pattern scans the keyspace: {pattern}")
+
+
+@pytest.fixture
+def fake_cache(monkeypatch) -> FakeCache:
+    """Route service caches to an in-memory FakeCache"""
+    cache = FakeCache()
+    for module in (
+        "app.services.short_key_service", "app.services.medicine_service",
+        "app.services.doctor_service", "app.api.deps.auth"
+    ):
+        monkeypatch.setattr(f"{module}.cache_manager", cache)
+    return cache
+
+
+@pytest.fixture
+def make_short_key():
+    """Factory for short key stand-ins with the attributes ShortKeyResponse reads"""
+    def build(**overrides) -> SimpleNamespace:
+        now = datetime.utcnow()
+        values = dict(
+            id=uuid4(), code="FLU", name="Flu", description=None, created_by=uuid4(),
+            is_global=True, usage_count=0, is_active=True, created_at=now, updated_at=now, medicines=[]
+        )
+        values.update(overrides)
+        return SimpleNamespace(**values)
+    return build
+
+
+@pytest.fixture
+def short_key_engine():
+    """
+    In-memory SQLite engine holding the tables short key queries touch
+    Postgres server defaults are left out of the DDL; the ORM supplies the values
+    """
+    memory_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    metadata = MetaData()
+    for table in (User.__table__, Medicine.__table__, ShortKey.__table__, ShortKeyMedicine.__table__):
+        for column in table.to_metadata(metadata).columns:
+            column.server_default = None
+    metadata.create_all(memory_engine)
+    yield memory_engine
+    memory_engine.dispose()
+
+
+@pytest.fixture
+def short_key_db(short_key_engine) -> Generator[Session, None, None]:
+    """Session on the in-memory short key tables"""
+    session = Session(short_key_engine)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def executed_sql(short_key_engine) -> List[str]:
+    """SQL statements sent to short_key_engine, in order; clear it after seeding"""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(short_key_engine, "before_cursor_execute", record)
+    return statements
+
+
+@pytest.fixture
+def seeded_short_key(short_key_db: Session) -> ShortKey:
+    """Global short key FLU with three medicines, committed to short_key_db"""
+    creator = User(
+        email="test.doctor@example.com",
+        hashed_password="hashed_password_here",
+        first_name="Test",
+        last_name="Doctor",
+        role="doctor",
+        is_active=True
+    )
+    short_key_db.add(creator)
+    short_key_db.flush()
+    
+    short_key = ShortKey(code="FLU", name="Flu season", created_by=creator.id, is_global=True, usage_count=0)
+    short_key_db.add(short_key)
+    short_key_db.flush()
+    
+    for order, name in enumerate(("Paracetamol", "Cetirizine", "Vitamin C"), start=1):
+        medicine = Medicine(name=name, composition=f"{name} 500mg", requires_prescription=False)
+        short_key_db.add(medicine)
+        short_key_db.flush()
+        short_key_db.add(ShortKeyMedicine(
+            short_key_id=short_key.id,
+            medicine_id=medicine.id,
+            default_dosage="1 tablet",
+            default_frequency="Twice daily",
+            default_duration="3 days",
+            sequence_order=order
+        ))
+    
+    short_key_db.commit()
+    short_key_db.refresh(short_key)
+    # Start tests with an empty identity map so nothing is served from it
+    short_key_db.expunge_all()
+    return short_key
@@ -0,0 +1,84 @@
+"""
+Shared fixtures for service tests
+Service tests that stub the database run against FakeSession
+"""
+
+import pytest
+from typing import Any, List, Optional
+from sqlalchemy.dialects import postgresql
+
+
+class FakeResult:
+    """Result stand-in for executed statements"""
+
+    def __init__(self, rows: List[Any]):
+        self.rows = rows
+
+    def first(self) -> Any:
+        return self.rows[0] if self.rows else None
+
+    def all(self) -> List[Any]:
+        return self.rows
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+
+class FakeQuery:
+    """Query stand-in that records filter criteria and returns a fixed row"""
+
+    def __init__(self, row: Any):
+        self.row = row
+        self.criteria = []
+
+    def options(self, *options) -> "FakeQuery":
+        return self
+
+    def filter(self, *criteria) -> "FakeQuery":
+        self.criteria.extend(criteria)
+        return self
+
+    def first(self) -> Any:
+        return self.row
+
+    def scalar(self) -> Any:
+        return self.row
+
+
+class FakeSession:
+    """
+    Session stand-in for services that build statements
+    Queries return row, or the given rows in order; executed statements are
+    compiled for PostgreSQL and answered with the given results in order
+    """
+
+    def __init__(self, *results: List[Any], row: Any = None, rows: Optional[List[Any]] = None):
+        self.results = list(results)
+        self.row = row
+        self.rows = list(rows) if rows is not None else None
+        self.queries = []
+        self.statements = []
+
+    def query(self, *entities) -> FakeQuery:
+        query = FakeQuery(self.rows.pop(0) if self.rows else self.row)
+        self.queries.append(query)
+        return query
+
+    def execute(self, statement, *args, **kwargs) -> FakeResult:
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return FakeResult(self.results.pop(0) if self.results else [])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def refresh(self, instance):
+        pass
+
+
+@pytest.fixture
+def fake_session():
+    """Factory for FakeSession stand-ins"""
+    return FakeSession
@@ -0,0 +1,54 @@
+"""
+Test cases for the verified JWT claims cache
+Module: Authentication Service
+"""
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services import auth_service as auth_service_module
+from app.services.auth_service import AuthService
+
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start each test with an empty token cache"""
+    auth_service_module._token_cache.clear()
+    yield
+    auth_service_module._token_cache.clear()
+
+
+@pytest.fixture
+def token(auth_service: AuthService) -> str:
+    user = SimpleNamespace(
+        id=uuid4(), email="test.doctor@example.com", role="doctor", first_name="Test", last_name="Doctor"
+    )
+    return auth_service.create_access_token(user)
+
+
+class TestTokenCache:
+    """verify_token caches claims keyed by a token digest"""
+
+    def test_repeat_verification_skips_decode(self, auth_service: AuthService, token: str, monkeypatch):
+        payload = auth_service.verify_token(token)
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("token was decoded again")
+
+        monkeypatch.setattr(auth_service_module.jwt, "decode", fail_decode)
+        assert auth_service.verify_token(token) == payload
+
+    def test_cache_stores_digest_and_returns_copies(self, auth_service: AuthService, token: str):
+        payload = auth_service.verify_token(token)
+        payload["user_id"] = "tampered"
+
+        assert token.encode() not in auth_service_module._token_cache
+        assert auth_service.verify_token(token)["user_id"] != "tampered"
+
+    def test_invalid_token_not_cached(self, auth_service: AuthService):
+        assert auth_service.verify_token("not-a-token") is None
+        assert auth_service_module._token_cache == {}
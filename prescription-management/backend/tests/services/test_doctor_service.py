@@ -0,0 +1,48 @@
+"""
+Test cases for the cached user-to-doctor mapping
+Covers active-only resolution and invalidation on doctor writes
+Module: Doctor Service
+"""
+
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.api.deps.auth import get_current_doctor_id
+from app.core.database import CacheKeys
+from app.schemas.doctor import DoctorUpdate
+from app.services.doctor_service import DoctorService
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def doctor() -> SimpleNamespace:
+    return SimpleNamespace(id=uuid4(), user_id=uuid4(), is_active=True, updated_at=datetime.utcnow())
+
+
+class TestDoctorIdCache:
+    """get_current_doctor_id caches active doctors; DoctorService drops the key"""
+
+    def test_lookup_filters_active_and_caches(self, fake_session, fake_cache, doctor):
+        db = fake_session(row=doctor.id)
+        user = SimpleNamespace(id=doctor.user_id, role="doctor")
+
+        assert get_current_doctor_id(user, db) == doctor.id
+        assert "doctors.is_active" in str(db.queries[0].criteria[1])
+        assert fake_cache.store[CacheKeys.DOCTOR_ID_BY_USER.format(user_id=doctor.user_id)] == str(doctor.id)
+
+    def test_deactivate_drops_cached_doctor_id(self, fake_session, fake_cache, doctor):
+        key = CacheKeys.DOCTOR_ID_BY_USER.format(user_id=doctor.user_id)
+        fake_cache.store[key] = str(doctor.id)
+
+        assert DoctorService().deactivate_doctor(fake_session(row=doctor), doctor.id) is True
+        assert key not in fake_cache.store
+
+    def test_update_drops_cached_doctor_id(self, fake_session, fake_cache, doctor):
+        key = CacheKeys.DOCTOR_ID_BY_USER.format(user_id=doctor.user_id)
+        fake_cache.store[key] = str(doctor.id)
+
+        assert DoctorService().update_doctor(fake_session(row=doctor), doctor.id, DoctorUpdate()) is doctor
+        assert key not in fake_cache.store
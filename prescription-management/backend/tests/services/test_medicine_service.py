@@ -0,0 +1,45 @@
+"""
+Test cases for Medicine Service bulk operations
+Covers per-row failure reporting for set-based bulk statements
+Module: Medicine Service
+"""
+
+import pytest
+from uuid import uuid4
+
+from app.services.medicine_service import MedicineService
+
+pytestmark = pytest.mark.stub_db
+
+
+class TestBulkUpdateMedicines:
+    """bulk_update_medicines keeps per-row success/failure results"""
+
+    def test_delete_skips_and_reports_referenced_medicines(self, fake_session):
+        """Referenced medicines fail on their own instead of aborting the batch"""
+        deleted, referenced, missing = uuid4(), uuid4(), uuid4()
+        # DELETE ... RETURNING, then the lookup of skipped rows that still exist
+        db = fake_session([deleted], [referenced])
+
+        result = MedicineService().bulk_update_medicines(db, [deleted, referenced, missing], "delete")
+
+        assert "NOT (EXISTS (SELECT * \nFROM prescription_items" in str(db.statements[0])
+        assert "NOT (EXISTS (SELECT * \nFROM short_key_medicines" in str(db.statements[0])
+        assert result["successful"] == 1
+        assert result["processed_ids"] == [deleted]
+        assert result["failed"] == 2
+        assert result["errors"] == [
+            f"Medicine {referenced}: referenced by prescriptions or short keys",
+            f"Medicine {missing}: not found or not eligible for delete",
+        ]
+
+    def test_activate_guards_duplicate_names_within_batch(self, fake_session):
+        """Only one of several same-named medicines in a batch is reactivated"""
+        first, second = uuid4(), uuid4()
+        db = fake_session([first])
+
+        result = MedicineService().bulk_update_medicines(db, [first, second], "activate")
+
+        assert "medicines_2.id < medicines.id" in str(db.statements[0])
+        assert result["successful"] == 1
+        assert result["errors"] == [f"Medicine {second}: not found or not eligible for activate"]
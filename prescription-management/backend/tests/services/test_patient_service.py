@@ -0,0 +1,67 @@
+"""
+Test cases for Patient Service lookups
+Covers composite-key and UUID lookups and keyset cursor encoding
+Module: Patient Service
+"""
+
+import pytest
+from datetime import date
+from uuid import uuid4
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.exceptions import ValidationError
+from app.models.patient import Patient
+from app.services.patient_service import PatientService
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def patient() -> Patient:
+    return Patient(
+        mobile_number="9876543210",
+        first_name="Jane",
+        last_name="Doe",
+        date_of_birth=date(1992, 5, 20),
+        gender="female",
+        relationship_to_primary="self",
+        id=uuid4(),
+        is_active=True
+    )
+
+
+class TestPatientLookups:
+    """Lookups by composite key and by UUID"""
+
+    def test_composite_key_resolves_from_identity_map(self, patient: Patient):
+        """A patient already in the session is returned without a query"""
+        # Unbound session: any SQL would raise UnboundExecutionError
+        db = Session()
+        make_transient_to_detached(patient)
+        db.add(patient)
+
+        assert PatientService().get_patient_by_composite_key(db, "9876543210", "Jane") is patient
+
+    def test_get_by_id_filters_on_uuid_column(self, fake_session):
+        """Patient.id is not the primary key, so the lookup is a filtered query"""
+        db = fake_session()
+        patient_id = uuid4()
+
+        assert PatientService().get_patient_by_id(db, patient_id) is None
+
+        compiled = db.queries[0].criteria[0].compile(dialect=postgresql.dialect())
+        assert str(compiled) == "patients.id = %(id_1)s::UUID"
+        assert compiled.params["id_1"] == patient_id
+
+
+class TestKeysetCursor:
+    """Opaque cursors for first-name keyset paging"""
+
+    def test_cursor_round_trip(self, patient: Patient):
+        service = PatientService()
+        assert service.decode_cursor(service.encode_cursor(patient)) == ("Jane", patient.id)
+
+    def test_invalid_cursor_rejected(self):
+        with pytest.raises(ValidationError):
+            PatientService().decode_cursor("not-a-cursor")
@@ -0,0 +1,81 @@
+"""
+Test cases for Prescription Service status updates
+Covers audit attribution on status changes and doctor ownership checks
+Module: Prescription Service
+"""
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.exceptions import AuthorizationError
+from app.schemas.prescription import BulkPrescriptionRequest
+from app.services.prescription_service import PrescriptionService
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def service(fake_session, monkeypatch):
+    def build(rows):
+        service = PrescriptionService(fake_session(rows))
+        monkeypatch.setattr(service, "_invalidate_statistics", lambda doctor_id: None)
+        monkeypatch.setattr(service, "get_prescription_by_id", lambda prescription_id: None)
+        return service
+    return build
+
+
+class TestStatusUpdateAttribution:
+    """Status changes record who made them"""
+
+    def test_single_status_update_writes_updated_by(self, service):
+        """update_prescription_status sets updated_by in its UPDATE"""
+        user_id = uuid4()
+        prescription_service = service([SimpleNamespace(doctor_id=uuid4())])
+
+        prescription_service.update_prescription_status(uuid4(), "cancelled", user_id)
+
+        compiled = prescription_service.db.statements[0]
+        assert "updated_by" in str(compiled)
+        assert compiled.params["updated_by"] == user_id
+
+    @pytest.mark.parametrize("operation", ["cancel", "complete", "print"])
+    def test_bulk_operation_writes_performed_by(self, service, operation):
+        """bulk_operation attributes every updated row to performed_by"""
+        performed_by = uuid4()
+        prescription_id = uuid4()
+        prescription_service = service([SimpleNamespace(id=prescription_id, doctor_id=uuid4())])
+
+        result = prescription_service.bulk_operation(
+            BulkPrescriptionRequest(prescription_ids=[prescription_id], operation=operation),
+            performed_by
+        )
+
+        compiled = prescription_service.db.statements[0]
+        assert compiled.params["updated_by"] == performed_by
+        assert result["successful"] == 1
+
+
+class TestDoctorOwnership:
+    """Doctors get 403 for another doctor's prescription and 404 for a missing one"""
+
+    def test_other_doctors_prescription_denied(self, fake_session):
+        """A scoped miss on an existing prescription raises AuthorizationError"""
+        db = fake_session(rows=[None, SimpleNamespace(id=uuid4())])
+
+        with pytest.raises(AuthorizationError):
+            PrescriptionService(db).get_prescription_by_id(uuid4(), caller_doctor_id=uuid4())
+
+        assert len(db.queries) == 2
+
+    def test_missing_prescription_not_found(self, fake_session):
+        db = fake_session(rows=[None, None])
+
+        assert PrescriptionService(db).get_prescription_by_id(uuid4(), caller_doctor_id=uuid4()) is None
+
+    def test_unscoped_miss_skips_existence_check(self, fake_session):
+        """Staff lookups are not scoped, so a miss is a single query"""
+        db = fake_session()
+
+        assert PrescriptionService(db).get_prescription_by_id(uuid4()) is None
+        assert len(db.queries) == 1
@@ -0,0 +1,90 @@
+"""
+Test cases for Short Key Service caching
+Covers the by-code lookup cache and popular/statistics cache invalidation
+Module: Short Key Service
+"""
+
+import json
+import pytest
+from uuid import uuid4
+from sqlalchemy import update
+
+from app.core.database import CacheKeys
+from app.models.short_key import ShortKey
+from app.schemas.short_key import ShortKeyUpdate
+from app.services.short_key_service import ShortKeyService
+
+pytestmark = pytest.mark.stub_db
+
+
+@pytest.fixture
+def service() -> ShortKeyService:
+    return ShortKeyService()
+
+
+class TestShortKeyCodeCache:
+    """get_short_key_by_code_json caching and invalidation"""
+
+    def test_lookup_cached_by_code_and_access_checked(
+        self, service, fake_cache, short_key_db, seeded_short_key, executed_sql
+    ):
+        """One database hit serves every user; private keys stay private"""
+        short_key_db.execute(update(ShortKey).values(is_global=False))
+        short_key_db.commit()
+        executed_sql.clear()
+
+        payload = service.get_short_key_by_code_json(short_key_db, "flu", seeded_short_key.created_by)
+        medicines = json.loads(payload)["medicines"]
+        assert [medicine["medicine"]["name"] for medicine in medicines] == ["Paracetamol", "Cetirizine", "Vitamin C"]
+        # The short key, then its medicines joined to their Medicine rows
+        assert len(executed_sql) == 2
+
+        assert service.get_short_key_by_code_json(short_key_db, "FLU", seeded_short_key.created_by) == payload
+        assert service.get_short_key_by_code_json(short_key_db, "FLU", uuid4()) is None
+        assert len(executed_sql) == 2
+
+    def test_update_drops_code_lookup(self, service, fake_cache, fake_session, make_short_key):
+        """Updating a short key deletes its code entry by exact key"""
+        short_key = make_short_key(is_global=False)
+        fake_cache.store[CacheKeys.SHORT_KEY_BY_CODE.format(code="FLU")] = "{}"
+        fake_cache.store[CacheKeys.SHORT_KEY_BY_CODE.format(code="COLD")] = "{}"
+
+        service.update_short_key(
+            fake_session(row=short_key), short_key.id, ShortKeyUpdate(name="Flu season"), short_key.created_by
+        )
+
+        assert CacheKeys.SHORT_KEY_BY_CODE.format(code="FLU") not in fake_cache.store
+        assert CacheKeys.SHORT_KEY_BY_CODE.format(code="COLD") in fake_cache.store
+
+    def test_use_drops_code_lookup(self, service, fake_cache, short_key_db, seeded_short_key):
+        """Recording usage deletes the cached lookup, which carries usage_count"""
+        stale = service.get_short_key_by_code_json(short_key_db, "FLU", seeded_short_key.created_by)
+        assert json.loads(stale)["usage_count"] == 0
+
+        service.use_short_key_by_code(short_key_db, "flu", seeded_short_key.created_by)
+
+        fresh = service.get_short_key_by_code_json(short_key_db, "FLU", seeded_short_key.created_by)
+        assert json.loads(fresh)["usage_count"] == 1
+
+
+class TestShortKeyStatisticsCache:
+    """Popular/statistics caches are retired by bumping the generation"""
+
+    def test_write_retires_cached_statistics(self, service, fake_cache, monkeypatch):
+        """Statistics are recomputed after a write without scanning keys"""
+        computed = []
+
+        def compute(db, user_id=None):
+            computed.append(user_id)
+            return {"total_short_keys": len(computed)}
+
+        monkeypatch.setattr(service, "_compute_short_key_statistics", compute)
+        user_id = uuid4()
+
+        assert service.get_short_key_statistics(None, user_id) == {"total_short_keys": 1}
+        assert service.get_short_key_statistics(None, user_id) == {"total_short_keys": 1}
+
+        # FakeCache.delete_pattern fails the test if invalidation scans keys
+        service._invalidate_short_key_cache("FLU")
+
+        assert service.get_short_key_statistics(None, user_id) == {"total_short_keys": 2}